@@ -0,0 +1,27 @@
+# coding: utf-8
+
+'''
+Measure the cost of Buffer.push at different capacities.
+Run from the repository root:
+    python -m benchmarks.buffer_push
+'''
+
+import time
+import numpy as np
+from dynplot.buffer import Buffer
+
+
+def bench_push(capacity, num_channels=64, chunk_size=4, repeat=2000):
+    # Time repeat pushes of chunk_size samples, return us per push.
+    buffer = Buffer(capacity=capacity, num_channels=num_channels)
+    chunk = np.random.randn(chunk_size, num_channels)
+    begin = time.perf_counter()
+    for _ in range(repeat):
+        buffer.push(chunk)
+    return (time.perf_counter() - begin) / repeat * 1e6
+
+
+if __name__ == '__main__':
+    for capacity in [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]:
+        print('capacity %8d x 64: %8.2f us / push' %
+              (capacity, bench_push(capacity)))
@@ -0,0 +1,83 @@
+# coding: utf-8
+
+'''
+Stress the producer/consumer handoff of Buffer.
+A producer thread pushes numbered chunks as fast as it can,
+a consumer thread reads through a cursor and checks
+that every sample arrives exactly once, or is counted as overrun.
+tests/test_buffer.py asserts the same invariants on a small ring,
+this runs them at full rate for the throughput.
+Run from the repository root:
+    python -m benchmarks.buffer_stress
+'''
+
+import sys
+import time
+import threading
+import numpy as np
+from dynplot.buffer import Buffer
+
+
+def stress(rate=100000, num_chunks=500000, chunk_size=2,
+           capacity=65536, num_channels=4):
+    # Push num_chunks chunks at rate chunks per second.
+    # Return a report dict, report['ok'] tells if nothing is lost or doubled.
+    buffer = Buffer(capacity=capacity, num_channels=num_channels)
+    cursor = buffer.cursor('stress')
+    # Samples carry their absolute index in every channel.
+    chunks = [np.repeat(np.arange(j, j + chunk_size, dtype=float)[:, None],
+                        num_channels, axis=1)
+              for j in range(0, chunk_size * num_chunks, chunk_size)]
+    report = dict(received=0, batches=0, errors=0)
+    done = threading.Event()
+
+    def produce():
+        begin = time.monotonic()
+        for j, chunk in enumerate(chunks):
+            buffer.push(chunk)
+            # Keep pace against the clock every 100 chunks.
+            if j % 100 == 99:
+                ahead = begin + (j + 1) / rate - time.monotonic()
+                if ahead > 0:
+                    time.sleep(ahead)
+        done.set()
+
+    def consume():
+        while True:
+            finished = done.is_set()
+            expected = cursor.position
+            batch = buffer.read_since(cursor)
+            if len(batch):
+                # First sample after any overrun, then strictly consecutive.
+                first = cursor.position - len(batch)
+                if not (np.array_equal(batch[:, 0],
+                                       np.arange(first, cursor.position))
+                        and (batch == batch[:, :1]).all()
+                        and first >= expected):
+                    report['errors'] += 1
+                report['received'] += len(batch)
+                report['batches'] += 1
+            if finished:
+                break
+
+    threads = [threading.Thread(target=produce),
+               threading.Thread(target=consume)]
+    begin = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    passed = time.perf_counter() - begin
+
+    report['pushed'] = buffer.total
+    report['overrun'] = cursor.overrun
+    report['chunks_per_second'] = num_chunks / passed
+    report['ok'] = (report['errors'] == 0 and cursor.overrun == 0 and
+                    report['received'] == buffer.total)
+    return report
+
+
+if __name__ == '__main__':
+    report = stress()
+    print(report)
+    sys.exit(0 if report['ok'] else 1)
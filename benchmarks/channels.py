@@ -0,0 +1,85 @@
+# coding: utf-8
+
+'''
+Cost of a frame with 16 of 256 channels shown, at 10 kHz and 30 fps,
+through a band-pass and a decimation by 10, drawn by LinesRenderer on Agg.
+hidden reads, filters and writes every channel and only hides lines,
+as the display did before, pushed reads, filters and writes the
+shown channels only, all shows every channel.
+read is the read, filters and write into the sweep,
+draw is the update and draw of the renderer.
+backfill is the time to show 16 more channels again,
+their window read again from the buffer and filtered.
+Run from the repository root:
+    python -m benchmarks.channels
+'''
+
+import time
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from dynplot.buffer import Buffer
+from dynplot.filters import SOSFilter, FIRDecimator, Chain, bandpass
+from dynplot.displayer import Sweep
+from dynplot.renderers import RENDERERS
+
+
+def setup(sample_rate, num_channels, mode):
+    # Return buffer, cursor, sweep, renderer and figure.
+    buffer = Buffer(sample_rate * 2, num_channels)
+    chain = Chain(SOSFilter(bandpass(0.5, 300, sample_rate), num_channels),
+                  FIRDecimator(10, num_channels))
+    cursor = buffer.cursor('display', chain)
+    sweep = Sweep(sample_rate // chain.factor, num_channels)
+    fig, axe = plt.subplots(1, 1, figsize=(5, 4), dpi=100)
+    renderer = RENDERERS[mode](axe, sweep)
+    axe.set_xlim([-1, sweep.info['max_length']])
+    axe.set_ylim([-1, 2 * num_channels])
+    fig.canvas.draw()
+    return buffer, cursor, sweep, renderer, fig
+
+
+def bench(strategy, shown=16, sample_rate=10000, num_channels=256,
+          frame_rate=30, frames=60, mode='lines'):
+    # Return ms per frame of read, filter and write,
+    # ms per frame of update and draw, and ms of a backfill.
+    buffer, cursor, sweep, renderer, fig = setup(sample_rate, num_channels,
+                                                 mode)
+    channels = np.arange(0, num_channels, num_channels // shown)
+    if strategy != 'all':
+        renderer.set_channels(channels)
+    if strategy == 'pushed':
+        cursor.channels = channels
+    chunk = np.random.randn(sample_rate // frame_rate, num_channels)
+    # Fill the buffer, so that backfill reads a whole window.
+    buffer.push(np.random.randn(sample_rate * 2, num_channels))
+    cursor.position = buffer.total
+    read = draw = 0
+    for _ in range(frames):
+        buffer.push(chunk)
+        begin = time.perf_counter()
+        sweep.write(buffer.read_since(cursor), cursor.channels)
+        middle = time.perf_counter()
+        renderer.update()
+        for artist in renderer.artists:
+            fig.axes[0].draw_artist(artist)
+        read += middle - begin
+        draw += time.perf_counter() - middle
+    # Show 16 more channels again.
+    added = channels + 1
+    begin = time.perf_counter()
+    sweep.backfill(buffer.backfill(cursor, added, sweep.info['max_length']
+                                   * cursor.chain.factor), added)
+    backfill = time.perf_counter() - begin
+    plt.close(fig)
+    return read / frames * 1e3, draw / frames * 1e3, backfill * 1e3
+
+
+if __name__ == '__main__':
+    for strategy in ['all', 'hidden', 'pushed']:
+        read, draw, backfill = bench(strategy)
+        print('%6s: read %6.2f, draw %6.2f ms per frame' % (
+            strategy, read, draw) +
+              (', backfill %.2f ms' % backfill if strategy == 'pushed'
+               else ''))
@@ -0,0 +1,51 @@
+# coding: utf-8
+
+'''
+Write throughput and compression ratio of ChunkedRecorder
+on the random-walk test signal, 64 channels,
+for every codec with and without filters,
+and the time of a short random read.
+Run from the repository root:
+    python -m benchmarks.chunked
+'''
+
+import os
+import time
+import tempfile
+import numpy as np
+from dynplot.sinks import CODECS, ChunkedRecorder, ChunkedReader
+
+
+def random_walk(length=2 ** 15, num_channels=64):
+    # Random walk, as the signal of the demos.
+    return np.cumsum(np.random.randn(length, num_channels), axis=0)
+
+
+def bench(data, codec, filters, chunk_size=4096, reads=50):
+    # Return MB/s of write, compression ratio and ms per short read.
+    path = os.path.join(tempfile.mkdtemp(), 'bench.dpc')
+    recorder = ChunkedRecorder(path, data.shape[1], chunk_size=chunk_size,
+                               codec=codec, shuffle=filters, delta=filters)
+    begin = time.perf_counter()
+    for j in range(0, len(data), 1000):
+        recorder.write(data[j:j + 1000])
+    recorder.close()
+    passed = time.perf_counter() - begin
+    ratio = recorder.info['raw_bytes'] / recorder.info['compressed_bytes']
+
+    reader = ChunkedReader(path)
+    begin = time.perf_counter()
+    for _ in range(reads):
+        start = np.random.randint(0, len(data) - 1000)
+        assert np.array_equal(reader.fetch(start, start + 1000),
+                              data[start:start + 1000])
+    read_ms = (time.perf_counter() - begin) / reads * 1e3
+    return data.nbytes / passed / 1e6, ratio, read_ms
+
+
+if __name__ == '__main__':
+    data = random_walk()
+    for codec in CODECS:
+        for filters in [False, True]:
+            print('%-5s filters=%-5s: %8.1f MB/s, ratio %5.2f, read %6.2f ms'
+                  % ((codec, filters) + bench(data, codec, filters)))
@@ -0,0 +1,49 @@
+# coding: utf-8
+
+'''
+Compare a raw Sweep with an EnvelopeSweep for long display windows,
+10 to 60 s at 10 kHz, drawn by the collection renderer on Agg.
+Run from the repository root:
+    python -m benchmarks.decimation
+'''
+
+import time
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from dynplot.displayer import Sweep
+from dynplot.decimation import EnvelopeSweep
+from dynplot.renderers import CollectionRenderer
+
+
+def bench(envelope, max_length, num_channels=16, sample_rate=10000,
+          frame_rate=30, frames=10):
+    # Return ms per frame of write, update and draw.
+    fig, axe = plt.subplots(1, 1, figsize=(5, 4), dpi=100)
+    if envelope:
+        sweep = EnvelopeSweep(max_length, num_channels,
+                              pixels=int(axe.bbox.width))
+    else:
+        sweep = Sweep(max_length, num_channels)
+    renderer = CollectionRenderer(axe, sweep)
+    axe.set_xlim([-1, max_length])
+    axe.set_ylim([-1, 2 * num_channels])
+    fig.canvas.draw()
+    chunk = np.random.randn(sample_rate // frame_rate, num_channels)
+    begin = time.perf_counter()
+    for _ in range(frames):
+        sweep.write(chunk)
+        renderer.update()
+        for artist in renderer.artists:
+            axe.draw_artist(artist)
+    passed = (time.perf_counter() - begin) / frames * 1e3
+    plt.close(fig)
+    return passed
+
+
+if __name__ == '__main__':
+    for seconds in [10, 30, 60]:
+        max_length = seconds * 10000
+        print('%2d s window: raw %8.2f ms, envelope %6.2f ms' % (
+            seconds, bench(False, max_length), bench(True, max_length)))
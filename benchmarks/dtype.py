@@ -0,0 +1,61 @@
+# coding: utf-8
+
+'''
+Memory and throughput of a Buffer of 10^6 x 64 samples,
+stored as float64, float32 and int16.
+Every pass pushes the whole capacity in chunks of 1000 samples,
+reads it back through a cursor, converts it to values with to_float
+and writes it into a display Sweep, which converts raw samples itself.
+Throughputs are in millions of samples per second,
+a sample is a row of 64 channels.
+Run from the repository root:
+    python -m benchmarks.dtype
+'''
+
+import time
+import numpy as np
+from dynplot.buffer import Buffer
+from dynplot.displayer import Sweep
+
+
+def bench(dtype, capacity=10 ** 6, num_channels=64, chunk_size=1000):
+    # Return a dict of MB of the ring and throughputs.
+    buffer = Buffer(capacity, num_channels, dtype=dtype,
+                    scale=np.full(num_channels, 1 / 3276.7))
+    rng = np.random.default_rng(0)
+    chunks = [(rng.standard_normal((chunk_size, num_channels)) * 3000)
+              .astype(dtype) for _ in range(16)]
+    cursor = buffer.cursor('bench')
+    sweep = Sweep(chunk_size * 10, num_channels)
+    sweep.set_gain(buffer.scale, -buffer.offset / buffer.scale)
+    passes = capacity // chunk_size
+    out = dict(dtype=np.dtype(dtype).name,
+               ring_mb=buffer._ring.nbytes / 2 ** 20)
+    # Push the whole capacity.
+    begin = time.perf_counter()
+    for k in range(passes):
+        buffer.push(chunks[k % len(chunks)])
+    out['push'] = capacity / (time.perf_counter() - begin) / 1e6
+    # Read it back in one batch.
+    cursor.position = buffer.total - capacity
+    begin = time.perf_counter()
+    raw = buffer.read_since(cursor)
+    out['read'] = capacity / (time.perf_counter() - begin) / 1e6
+    # Values, when filters need them.
+    begin = time.perf_counter()
+    for k in range(passes):
+        buffer.to_float(raw[k * chunk_size:(k + 1) * chunk_size])
+    out['to_float'] = capacity / (time.perf_counter() - begin) / 1e6
+    # Display, raw samples converted while written.
+    begin = time.perf_counter()
+    for k in range(passes):
+        sweep.write(raw[k * chunk_size:(k + 1) * chunk_size])
+    out['sweep'] = capacity / (time.perf_counter() - begin) / 1e6
+    return out
+
+
+if __name__ == '__main__':
+    for dtype in ['float64', 'float32', 'int16']:
+        print('%(dtype)8s: ring %(ring_mb)6.1f MB, push %(push)6.1f, '
+              'read %(read)6.1f, to_float %(to_float)6.1f, '
+              'sweep %(sweep)6.1f Msamples/s' % bench(dtype))
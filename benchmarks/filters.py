@@ -0,0 +1,52 @@
+# coding: utf-8
+
+'''
+Filter 64 channels at 10 kHz through a display chain,
+band-pass 0.5 to 300 Hz, 50 Hz notch with 2 harmonics and
+a decimation by 10, read from a Buffer through a filtered cursor.
+It reports the time spent per second of signal, for chunks of
+1, 10 and 100 ms, for the numpy and scipy paths of SOSFilter.
+Real time is kept if the load is under 100 %.
+Run from the repository root:
+    python -m benchmarks.filters
+'''
+
+import time
+import numpy as np
+from dynplot.buffer import Buffer
+from dynplot.filters import (SOSFilter, FIRDecimator, Chain, bandpass,
+                             notch, sosfilt)
+
+
+def chain(sample_rate, num_channels, use_scipy):
+    # Return the display chain.
+    sos = np.vstack([bandpass(0.5, 300, sample_rate),
+                     notch(50, sample_rate, harmonics=3)])
+    return Chain(SOSFilter(sos, num_channels, use_scipy=use_scipy),
+                 FIRDecimator(10, num_channels))
+
+
+def bench(chunk_size, use_scipy, sample_rate=10000, num_channels=64,
+          seconds=5):
+    # Return seconds spent per second of signal.
+    buffer = Buffer(sample_rate, num_channels)
+    cursor = buffer.cursor('display',
+                           chain(sample_rate, num_channels, use_scipy))
+    chunk = np.random.randn(chunk_size, num_channels)
+    passed = 0
+    for _ in range(seconds * sample_rate // chunk_size):
+        buffer.push(chunk)
+        begin = time.perf_counter()
+        buffer.read_since(cursor)
+        passed += time.perf_counter() - begin
+    return passed / seconds
+
+
+if __name__ == '__main__':
+    paths = [False] + ([True] if sosfilt is not None else [])
+    for use_scipy in paths:
+        for chunk_size in [10, 100, 1000]:
+            load = bench(chunk_size, use_scipy)
+            print('%5s, chunk %4d: %7.1f ms per second, load %5.1f %%' % (
+                'scipy' if use_scipy else 'numpy', chunk_size,
+                load * 1e3, load * 100))
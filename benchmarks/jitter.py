@@ -0,0 +1,80 @@
+# coding: utf-8
+
+'''
+Timing jitter of acquisition under heavy redraw,
+with the source on a thread of the GUI process
+and with the source in its own process through a SharedBuffer.
+The main process keeps drawing 64 channels on Agg while
+every chunk records, in its first channel, how late it was pushed
+after its last sample was due.
+Run from the repository root:
+    python -m benchmarks.jitter
+'''
+
+import time
+import threading
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from dynplot.buffer import Buffer
+from dynplot.shared import AcquisitionProcess
+from dynplot.sources import SyntheticSource
+
+
+def stamp_push(buffer, timestamp, chunk):
+    # Push chunk with its lateness in ms in the first channel.
+    rate = 1000
+    chunk[:, 0] = (time.monotonic() - timestamp - (len(chunk) - 1) / rate) \
+        * 1e3
+    buffer.push(chunk)
+
+
+def heavy_redraw(buffer, seconds, num_channels=64, max_length=2000):
+    # Keep drawing for seconds, return the lateness of every chunk.
+    fig, axe = plt.subplots(1, 1, figsize=(8, 6), dpi=100)
+    axe.plot(np.random.randn(max_length, num_channels))
+    cursor = buffer.cursor('redraw')
+    lateness = []
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        fig.canvas.draw()
+        new_data = buffer.read_since(cursor)
+        # Every chunk of 10 samples carries the same lateness.
+        lateness.append(new_data[::10, 0])
+    plt.close(fig)
+    return np.concatenate(lateness)
+
+
+def report(mode, lateness):
+    return dict(mode=mode, chunks=len(lateness),
+                p50_ms=round(float(np.percentile(lateness, 50)), 3),
+                p99_ms=round(float(np.percentile(lateness, 99)), 3),
+                max_ms=round(float(lateness.max()), 3))
+
+
+def bench_thread(seconds=3.0):
+    source = SyntheticSource(1000, 4, chunk_size=10)
+    buffer = Buffer(capacity=10000, num_channels=4)
+    thread = threading.Thread(
+        target=source.run, args=(lambda t, c: stamp_push(buffer, t, c),))
+    thread.start()
+    lateness = heavy_redraw(buffer, seconds)
+    source.stop()
+    thread.join()
+    return report('thread', lateness)
+
+
+def bench_process(seconds=3.0):
+    acquisition = AcquisitionProcess(SyntheticSource(1000, 4, chunk_size=10),
+                                     capacity=10000, callback=stamp_push)
+    acquisition.set_record(True)
+    acquisition.start()
+    lateness = heavy_redraw(acquisition.buffer, seconds)
+    acquisition.stop()
+    return report('process', lateness)
+
+
+if __name__ == '__main__':
+    print(bench_thread())
+    print(bench_process())
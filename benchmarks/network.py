@@ -0,0 +1,71 @@
+# coding: utf-8
+
+'''
+Sustained ingest throughput and end-to-end latency of NetworkSource
+into a Buffer, fed by a localhost ReplayServer, over UDP and TCP.
+Throughput is measured with an unpaced source,
+latency with a source paced at 10 kHz x 64 channels.
+Run from the repository root:
+    python -m benchmarks.network
+'''
+
+import time
+import threading
+import numpy as np
+from dynplot.buffer import Buffer
+from dynplot.network import NetworkSource, ReplayServer, max_rows
+from dynplot.sources import SyntheticSource
+
+
+def bench(protocol, port, pace, sample_rate=10000, num_channels=64,
+          seconds=2.0):
+    # Return a report dict.
+    chunk_size = max_rows(num_channels) if not pace else sample_rate // 100
+    server_source = SyntheticSource(sample_rate, num_channels, chunk_size,
+                                    pace=pace)
+    address = ('127.0.0.1', port)
+    source = NetworkSource(address, protocol, sample_rate, num_channels)
+    if protocol == 'udp':
+        # Bind before the server sends.
+        source.start()
+        server = ReplayServer(address, protocol, server_source)
+    else:
+        # Listen before the source connects.
+        server = ReplayServer(address, protocol, server_source)
+    buffer = Buffer(capacity=sample_rate, num_channels=num_channels)
+    latency = []
+
+    def on_chunk(timestamp, chunk):
+        buffer.push(chunk)
+        last = timestamp + (len(chunk) - 1) / sample_rate
+        latency.append(time.monotonic() - last)
+
+    thread = threading.Thread(target=source.run, args=(on_chunk,))
+    server.start()
+    thread.start()
+    begin = time.monotonic()
+    time.sleep(seconds)
+    server.stop()
+    passed = time.monotonic() - begin
+    time.sleep(0.2)
+    source.stop()
+    thread.join()
+    report = dict(protocol=protocol, pace=pace,
+                  samples_per_second=round(buffer.total / passed),
+                  mb_per_second=round(buffer.total * num_channels * 4
+                                      / passed / 1e6, 1),
+                  received=source.info['received'],
+                  lost=source.info['lost'], late=source.info['late'])
+    if pace:
+        latency = np.array(latency) * 1e3
+        report['latency_p50_ms'] = round(float(np.percentile(latency, 50)), 3)
+        report['latency_p99_ms'] = round(float(np.percentile(latency, 99)), 3)
+    return report
+
+
+if __name__ == '__main__':
+    port = 9870
+    for protocol in ['udp', 'tcp']:
+        for pace in [False, True]:
+            print(bench(protocol, port, pace))
+            port += 1
@@ -0,0 +1,82 @@
+# coding: utf-8
+
+'''
+Time every stage of the dynplot pipeline on the same stream,
+    source -> buffer -> filter -> sweep -> renderer
+                     -> sink
+at 64 channels of int16 counts at 10 kHz, in chunks of 10 ms,
+with the display read 30 times per second.
+Each stage reports ms per second of signal, so the stages add up
+to the load of the whole pipeline, which keeps real time under 1000 ms.
+Run from the repository root:
+    python -m benchmarks.pipeline
+'''
+
+import os
+import time
+import tempfile
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from dynplot.sources import SyntheticSource
+from dynplot.buffer import Buffer
+from dynplot.filters import SOSFilter, FIRDecimator, Chain, bandpass
+from dynplot.displayer import Sweep
+from dynplot.renderers import RENDERERS
+from dynplot.sinks import MemmapRecorder
+
+
+def bench(sample_rate=10000, num_channels=64, frame_rate=30, seconds=3,
+          mode='lines'):
+    # Return ms per second of signal of every stage.
+    passed = dict.fromkeys(['source', 'push', 'sink', 'filter', 'sweep',
+                            'renderer'], 0.0)
+    source = SyntheticSource(sample_rate, num_channels, pace=False, seed=0,
+                             dtype='int16')
+    buffer = Buffer(sample_rate, num_channels, dtype=source.info['dtype'],
+                    scale=source.info['scale'])
+    chain = Chain(SOSFilter(bandpass(0.5, 300, sample_rate), num_channels),
+                  FIRDecimator(10, num_channels))
+    display = buffer.cursor('display', chain)
+    record = buffer.cursor('record')
+    sweep = Sweep(sample_rate // chain.factor * 2, num_channels)
+    fig, axe = plt.subplots(1, 1, figsize=(5, 4), dpi=100)
+    renderer = RENDERERS[mode](axe, sweep)
+    axe.set_xlim([-1, sweep.info['max_length']])
+    axe.set_ylim([-1, 2 * num_channels])
+    fig.canvas.draw()
+    path = os.path.join(tempfile.mkdtemp(), 'pipeline.raw')
+    sink = MemmapRecorder(path, num_channels, source.info['dtype'],
+                          sample_rate, scale=buffer.scale)
+
+    def timed(stage, function, *args):
+        begin = time.perf_counter()
+        out = function(*args)
+        passed[stage] += time.perf_counter() - begin
+        return out
+
+    source.start()
+    per_frame = sample_rate // frame_rate
+    while buffer.total < seconds * sample_rate:
+        _, chunk = timed('source', source.read)
+        timed('push', buffer.push, chunk)
+        timed('sink', sink.write, buffer.read_since(record))
+        if buffer.total - display.position >= per_frame:
+            # The chain converts counts to values itself.
+            values = timed('filter', buffer.read_since, display)
+            timed('sweep', sweep.write, values)
+            timed('renderer', renderer.update)
+            for artist in renderer.artists:
+                timed('renderer', axe.draw_artist, artist)
+    sink.close()
+    plt.close(fig)
+    os.remove(path)
+    return {stage: value / seconds * 1e3 for stage, value in passed.items()}
+
+
+if __name__ == '__main__':
+    for mode in ['lines', 'raster']:
+        report = bench(mode=mode)
+        print('%6s: ' % mode +
+              ', '.join('%s %.1f' % item for item in report.items()) +
+              ', total %.1f ms per second' % sum(report.values()))
@@ -0,0 +1,111 @@
+# coding: utf-8
+
+'''
+Replay a recording of 64 channels of int16 counts at 10 kHz,
+memmap and chunked, through PlaybackSource.
+Unpaced, the file drives the display path as fast as it goes,
+source -> buffer -> filter -> sweep -> renderer on Agg,
+and the same file gives the same work every run.
+Paced, the achieved speed is checked against the asked one,
+and the time of a seek anywhere in the file is measured.
+Run from the repository root:
+    python -m benchmarks.playback
+'''
+
+import os
+import time
+import tempfile
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from dynplot.sources import SyntheticSource
+from dynplot.sinks import SINKS
+from dynplot.playback import PlaybackSource
+from dynplot.buffer import Buffer
+from dynplot.filters import SOSFilter, FIRDecimator, Chain, bandpass
+from dynplot.displayer import Sweep
+from dynplot.renderers import RENDERERS
+
+
+def record(record_format, seconds=60, sample_rate=10000, num_channels=64):
+    # Record seconds of the synthetic source, return the path.
+    path = os.path.join(tempfile.mkdtemp(), 'session.raw')
+    source = SyntheticSource(sample_rate, num_channels, pace=False, seed=0,
+                             dtype='int16', chunk_size=1000)
+    sink = SINKS[record_format](path, num_channels, 'int16', sample_rate,
+                                scale=source.info['scale'])
+    source.start()
+    for _ in range(seconds * sample_rate // 1000):
+        sink.write(source.read()[1])
+    sink.close()
+    return path
+
+
+def display(path, mode='raster', frame_rate=30):
+    # Return times real time of the unpaced display path.
+    source = PlaybackSource(path, pace=False)
+    info = source.info
+    num_channels, sample_rate = info['num_channels'], info['sample_rate']
+    buffer = Buffer(sample_rate, num_channels, dtype=info['dtype'],
+                    scale=info['scale'])
+    chain = Chain(SOSFilter(bandpass(0.5, 300, sample_rate), num_channels),
+                  FIRDecimator(10, num_channels))
+    cursor = buffer.cursor('display', chain)
+    sweep = Sweep(sample_rate // chain.factor * 2, num_channels)
+    fig, axe = plt.subplots(1, 1, figsize=(5, 4), dpi=100)
+    renderer = RENDERERS[mode](axe, sweep)
+    axe.set_xlim([-1, sweep.info['max_length']])
+    axe.set_ylim([-1, 2 * num_channels])
+    fig.canvas.draw()
+    per_frame = sample_rate // frame_rate
+
+    def on_chunk(timestamp, chunk):
+        buffer.push(chunk, timestamp)
+        if buffer.total - cursor.position >= per_frame:
+            sweep.write(buffer.read_since(cursor))
+            renderer.update()
+            for artist in renderer.artists:
+                axe.draw_artist(artist)
+
+    begin = time.perf_counter()
+    source.run(on_chunk)
+    passed = time.perf_counter() - begin
+    plt.close(fig)
+    return source.duration / passed
+
+
+def paced(path, speed, seconds=1.0):
+    # Return the achieved speed of playback at speed.
+    source = PlaybackSource(path, speed)
+    samples = [0]
+
+    def on_chunk(timestamp, chunk):
+        samples[0] += len(chunk)
+        if time.monotonic() - begin >= seconds:
+            source.stop()
+
+    begin = time.monotonic()
+    source.run(on_chunk)
+    passed = time.monotonic() - begin
+    return samples[0] / source.info['sample_rate'] / passed
+
+
+def seek(path, seeks=50):
+    # Return ms of a seek and the read of the next chunk.
+    source = PlaybackSource(path, pace=False)
+    times = np.random.default_rng(0).uniform(0, source.duration, seeks)
+    begin = time.perf_counter()
+    for t in times:
+        source.seek(t)
+        source.read()
+    return (time.perf_counter() - begin) / seeks * 1e3
+
+
+if __name__ == '__main__':
+    for record_format in SINKS:
+        path = record(record_format)
+        print('%7s: display %6.1fx real time, seek %5.2f ms, ' % (
+            record_format, display(path), seek(path)) +
+            ', '.join('%gx at %gx' % (round(paced(path, speed), 2), speed)
+                      for speed in [1, 10, 100]))
@@ -0,0 +1,99 @@
+# coding: utf-8
+
+'''
+Zoom and pan over a 1 hour capture, as the history view of App does.
+One hour at 1 kHz is summarized by the pyramid of a buffer
+whose raw ring holds 5 seconds only, the figure is the one of App,
+the sweep on top and the history view under it, on Agg.
+Every redraw zooms or pans at random, queries Buffer.summary,
+refreshes the view, rasterizes it and draws the image
+over the cached background of the history axes,
+the range shown is a Tk label in App, it is not drawn here,
+then the same redraws are done with a full draw of the figure,
+as a view changing the limits of its axes would need.
+Redraws are checked against the 16 ms of a 60 fps frame.
+On Tk, the blit of the history axes adds a copy of its pixels.
+Run from the repository root:
+    python -m benchmarks.pyramid
+'''
+
+import time
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from dynplot.buffer import Buffer
+from dynplot.history import HistoryView
+from dynplot.renderers import RasterRenderer, BlitManager
+
+# ms of a frame at 60 fps.
+TARGET = 16.0
+
+
+def fill(sample_rate=1000, seconds=3600, num_channels=4, ring=5,
+         chunk_size=1000, levels=8):
+    # Return a buffer of a random walk summarized as it came,
+    # and us per push and summary of a chunk.
+    buffer = Buffer(sample_rate * ring, num_channels, levels=levels,
+                    history=sample_rate * seconds)
+    walk = np.zeros(num_channels)
+    chunks = sample_rate * seconds // chunk_size
+    begin = time.perf_counter()
+    for _ in range(chunks):
+        chunk = walk + np.cumsum(
+            np.random.randn(chunk_size, num_channels), axis=0)
+        walk = chunk[-1]
+        buffer.push(chunk)
+        buffer.summarize()
+    passed = time.perf_counter() - begin
+    return buffer, passed / chunks * 1e6
+
+
+def bench(buffer, redraws=200, full=False, seed=0):
+    # Return ms of the slowest and mean redraw,
+    # a redraw is a zoom or a pan, the query and the draw.
+    random = np.random.RandomState(seed)
+    fig, (axe, history_axe) = plt.subplots(
+        2, 1, figsize=(5, 5), dpi=100,
+        gridspec_kw=dict(height_ratios=[4, 1]))
+    num_channels = buffer.info['num_channels']
+    axe.plot(np.zeros((100, num_channels)))
+    # Spread the walks over their lanes.
+    view = HistoryView(history_axe, buffer, height=2)
+    view.set_gain(np.full(num_channels, 0.01), np.zeros(num_channels))
+    renderer = RasterRenderer(history_axe, view)
+    manager = BlitManager(fig.canvas, history_axe, renderer.artists)
+    pixels = view.info['pixels']
+    view.update()
+    renderer.update()
+    manager.update()
+    passed = []
+    for _ in range(redraws):
+        begin = time.perf_counter()
+        if random.rand() < 0.5:
+            view.zoom(2.0 ** random.randint(-3, 4),
+                      random.uniform(0, pixels))
+        else:
+            view.pan(random.uniform(-pixels, pixels))
+        view.update()
+        renderer.update()
+        if full:
+            fig.canvas.draw()
+        else:
+            manager.update()
+        passed.append(time.perf_counter() - begin)
+    plt.close(fig)
+    return max(passed) * 1e3, np.mean(passed) * 1e3
+
+
+if __name__ == '__main__':
+    for num_channels in [4, 17]:
+        buffer, push_us = fill(num_channels=num_channels)
+        print('%d channels, push and summarize: %.1f us / 1000 samples'
+              % (num_channels, push_us))
+        for full in [False, True]:
+            slowest, mean = bench(buffer, full=full)
+            print('    %s: redraw max %.2f ms, mean %.2f ms, '
+                  'target %.0f ms %s' % (
+                      'full draw' if full else 'blitted ', slowest, mean,
+                      TARGET, 'met' if slowest <= TARGET else 'not met'))
@@ -0,0 +1,146 @@
+# coding: utf-8
+
+'''
+Headless rendering benchmark of the display path, on the Agg backend.
+It sweeps channels, window length, chunk size, renderer and strategy,
+and reports frames per second and ms per frame as JSON.
+Strategies are
+    draw: full fig.canvas.draw every frame,
+    redraw_blit: axe.redraw_in_frame then blit,
+    restore: restore_region of a cached background,
+             draw_artist of the renderer artists, then blit,
+    blit_manager: the same through renderers.BlitManager,
+    sweep_blitter: only the strip swept since the last frame,
+                   through renderers.SweepBlitter, as App does.
+Agg has no screen, so blit itself costs nothing here.
+Run from the repository root:
+    python -m benchmarks.render --output render.json
+'''
+
+import sys
+import json
+import time
+import argparse
+import platform
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from dynplot.displayer import Sweep
+from dynplot.renderers import RENDERERS, BlitManager, SweepBlitter
+
+
+def frame_draw(fig, axe, renderer, background):
+    fig.canvas.draw()
+
+
+def frame_redraw_blit(fig, axe, renderer, background):
+    axe.redraw_in_frame()
+    fig.canvas.blit(axe.bbox)
+
+
+def frame_restore(fig, axe, renderer, background):
+    fig.canvas.restore_region(background)
+    for artist in renderer.artists:
+        axe.draw_artist(artist)
+    fig.canvas.blit(axe.bbox)
+
+
+def frame_blit_manager(fig, axe, renderer, blitter):
+    blitter.update()
+
+
+# Strategies by name.
+STRATEGIES = dict(
+    draw=frame_draw,
+    redraw_blit=frame_redraw_blit,
+    restore=frame_restore,
+    blit_manager=frame_blit_manager,
+    sweep_blitter=frame_blit_manager,
+)
+
+
+def bench(num_channels, max_length, chunk_size, mode, strategy,
+          frames=20, warmup=2, seed=0, size=(5, 4)):
+    # Return a result dict of one combination.
+    plt.style.use('ggplot')
+    fig, axe = plt.subplots(1, 1, figsize=size, dpi=100)
+    sweep = Sweep(max_length, num_channels, gap=2)
+    renderer = RENDERERS[mode](axe, sweep)
+    axe.set_xlim([-1, max_length])
+    axe.set_ylim([-1, 2 * num_channels])
+    if strategy == 'blit_manager':
+        background = BlitManager(fig.canvas, axe, renderer.artists)
+    elif strategy == 'sweep_blitter':
+        background = SweepBlitter(fig.canvas, axe, sweep, renderer.artists)
+    else:
+        # Background without the animated artists.
+        for artist in renderer.artists:
+            artist.set_animated(strategy == 'restore')
+    fig.canvas.draw()
+    if strategy not in ('blit_manager', 'sweep_blitter'):
+        background = fig.canvas.copy_from_bbox(axe.bbox)
+    chunk = np.random.default_rng(seed).standard_normal(
+        (chunk_size, num_channels))
+    draw = STRATEGIES[strategy]
+    passed = []
+    for j in range(warmup + frames):
+        begin = time.perf_counter()
+        sweep.write(chunk)
+        renderer.update()
+        draw(fig, axe, renderer, background)
+        if j >= warmup:
+            passed.append(time.perf_counter() - begin)
+    plt.close(fig)
+    ms = float(np.mean(passed)) * 1e3
+    return dict(channels=num_channels, max_length=max_length,
+                chunk_size=chunk_size, renderer=mode,
+                strategy=strategy, frames=frames,
+                ms_per_frame=round(ms, 3),
+                ms_p95=round(float(np.percentile(passed, 95)) * 1e3, 3),
+                fps=round(1e3 / ms, 2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--channels', type=int, nargs='+',
+                        default=[16, 64, 256])
+    parser.add_argument('--lengths', type=int, nargs='+',
+                        default=[500, 2000])
+    parser.add_argument('--chunks', type=int, nargs='+', default=[10, 100])
+    parser.add_argument('--renderers', nargs='+', default=list(RENDERERS),
+                        choices=list(RENDERERS))
+    parser.add_argument('--strategies', nargs='+', default=list(STRATEGIES),
+                        choices=list(STRATEGIES))
+    parser.add_argument('--frames', type=int, default=20)
+    parser.add_argument('--size', type=float, nargs=2, default=[5, 4],
+                        help='figure size in inches')
+    parser.add_argument('--output', default=None,
+                        help='JSON file, default is stdout')
+    args = parser.parse_args(argv)
+
+    results = []
+    for num_channels in args.channels:
+        for max_length in args.lengths:
+            for chunk_size in args.chunks:
+                for renderer in args.renderers:
+                    for strategy in args.strategies:
+                        result = bench(num_channels, max_length, chunk_size,
+                                       renderer, strategy, args.frames,
+                                       size=args.size)
+                        print(result, file=sys.stderr)
+                        results.append(result)
+
+    report = dict(python=platform.python_version(),
+                  numpy=np.__version__, matplotlib=matplotlib.__version__,
+                  machine=platform.machine(), results=results)
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# coding: utf-8
+
+'''
+Compare LinesRenderer, CollectionRenderer and RasterRenderer
+on the Agg backend, at 16, 64, 256 and 1024 channels.
+Speed is ms per frame of update and draw,
+quality is how well the inked pixels of a renderer match the ones of
+LinesRenderer, within one pixel, as precision and recall.
+Run from the repository root:
+    python -m benchmarks.renderers
+'''
+
+import time
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from dynplot.displayer import Sweep
+from dynplot.renderers import RENDERERS
+
+
+def bench(mode, num_channels, max_length=500, chunk_size=33, frames=30):
+    # Return ms per frame of update and draw of the renderer.
+    fig, axe = plt.subplots(1, 1, figsize=(5, 4), dpi=100)
+    sweep = Sweep(max_length, num_channels)
+    renderer = RENDERERS[mode](axe, sweep)
+    axe.set_xlim([-1, max_length])
+    axe.set_ylim([-1, 2 * num_channels])
+    fig.canvas.draw()
+    chunk = np.random.randn(chunk_size, num_channels)
+    begin = time.perf_counter()
+    for _ in range(frames):
+        sweep.write(chunk)
+        renderer.update()
+        for artist in renderer.artists:
+            axe.draw_artist(artist)
+    passed = (time.perf_counter() - begin) / frames * 1e3
+    plt.close(fig)
+    return passed
+
+
+def ink(mode, num_channels, max_length=500, seed=0):
+    # Return the pixels inked by the renderer, as a boolean image.
+    fig, axe = plt.subplots(1, 1, figsize=(5, 4), dpi=100)
+    axe.set_axis_off()
+    sweep = Sweep(max_length, num_channels)
+    sweep.write(np.random.default_rng(seed).standard_normal(
+        (max_length, num_channels)) * 0.3)
+    renderer = RENDERERS[mode](axe, sweep)
+    axe.set_xlim([-1, max_length])
+    axe.set_ylim([-1, 2 * num_channels])
+    renderer.update()
+    fig.canvas.draw()
+    image = np.asarray(fig.canvas.buffer_rgba())[:, :, :3]
+    plt.close(fig)
+    return (255 - image.min(axis=2)) > 64
+
+
+def grow(mask):
+    # Grow mask by one pixel in every direction.
+    out = mask.copy()
+    out[1:] |= mask[:-1]
+    out[:-1] |= mask[1:]
+    out[:, 1:] |= out[:, :-1].copy()
+    out[:, :-1] |= out[:, 1:].copy()
+    return out
+
+
+def quality(mode, num_channels):
+    # Return precision and recall of the ink of mode against lines.
+    test, reference = ink(mode, num_channels), ink('lines', num_channels)
+    precision = (test & grow(reference)).sum() / max(test.sum(), 1)
+    recall = (reference & grow(test)).sum() / max(reference.sum(), 1)
+    return precision, recall
+
+
+if __name__ == '__main__':
+    for num_channels in [16, 64, 256, 1024]:
+        report = {mode: bench(mode, num_channels) for mode in RENDERERS}
+        print('%5d channels: ' % num_channels +
+              ', '.join('%s %7.2f ms' % e for e in report.items()))
+    for num_channels in [16, 64]:
+        print('%5d channels: ' % num_channels + ', '.join(
+            '%s precision %.3f recall %.3f' % ((mode,) + quality(
+                mode, num_channels)) for mode in RENDERERS))
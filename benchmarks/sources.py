@@ -0,0 +1,47 @@
+# coding: utf-8
+
+'''
+Run SyntheticSource into a Buffer on a thread,
+at rates up to 100 kHz x 64 channels,
+report the achieved rate, lateness of chunks and CPU load.
+Run from the repository root:
+    python -m benchmarks.sources
+'''
+
+import time
+import threading
+import numpy as np
+from dynplot.buffer import Buffer
+from dynplot.sources import SyntheticSource
+
+
+def bench(sample_rate, num_channels=64, seconds=2.0):
+    # Return a report dict.
+    source = SyntheticSource(sample_rate, num_channels)
+    buffer = Buffer(capacity=sample_rate, num_channels=num_channels)
+    lateness = []
+
+    def on_chunk(timestamp, chunk):
+        buffer.push(chunk)
+        # Delay between the last sample being due and being pushed.
+        last = timestamp + (len(chunk) - 1) / sample_rate
+        lateness.append(time.monotonic() - last)
+
+    thread = threading.Thread(target=source.run, args=(on_chunk,))
+    begin, cpu = time.monotonic(), time.process_time()
+    thread.start()
+    time.sleep(seconds)
+    source.stop()
+    thread.join()
+    passed = time.monotonic() - begin
+    lateness = np.array(lateness) * 1e3
+    return dict(sample_rate=sample_rate,
+                achieved_rate=round(buffer.total / passed),
+                late_p50_ms=round(float(np.percentile(lateness, 50)), 3),
+                late_p99_ms=round(float(np.percentile(lateness, 99)), 3),
+                cpu_load=round((time.process_time() - cpu) / passed, 3))
+
+
+if __name__ == '__main__':
+    for sample_rate in [1000, 10000, 100000]:
+        print(bench(sample_rate))
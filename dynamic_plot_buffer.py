@@ -2,19 +2,19 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-from local_toolbox import Buffer, Plotter
+from dynplot import Buffer, Plotter
 
 plt.style.use('ggplot')
 frame_rate = 20
 
 buffer = Buffer()
-buffer.push(np.random.randn(50, buffer.info['channels']))
-buffer.display()
+buffer.push(np.random.randn(50, buffer.info['num_channels']))
+buffer.print()
 
 
 plotter = Plotter()
-plotter.prepare_plot(max_length=buffer.info['max_length'],
-                     channels=buffer.info['channels'])
+plotter.prepare_plot(max_length=buffer.info['capacity'],
+                     channels=buffer.info['num_channels'])
 plotter.plot(buffer.data)
 
 plt.show(block=False)
@@ -25,6 +25,6 @@ plt.pause(1 / frame_rate)
 # input('Press enter to start.')
 
 for j in range(100):
-    plotter.update(np.random.randn(1, buffer.info['channels']))
+    plotter.update(np.random.randn(1, buffer.info['num_channels']))
 
 # input('Press enter to quit.')
@@ -3,28 +3,36 @@
 import time
 import numpy as np
 import matplotlib.pyplot as plt
+from dynplot import Buffer, RunningStats, Limits
 
 
-class Buffer():
+class Scroll():
+    '''
+    This is a scrolling window of one channel, on a ring Buffer.
+    '''
     def __init__(self, length=100, interval=1):
         self.length = length
         self.interval = interval
-        self.prepare()
+        self.buffer = Buffer(length, num_channels=1)
 
-    def prepare(self):
-        self.x_data = np.arange(self.length) * self.interval
-        self.y_data = np.zeros(self.length)
+    @property
+    def x_data(self):
+        return (self.buffer.total + np.arange(self.length)) * self.interval
+
+    @property
+    def y_data(self):
+        return self.buffer.data[:, 0]
 
     def push(self, new_y_data):
-        length = len(new_y_data)
-        x_data = self.x_data[0] + \
-            np.arange(self.length + length) * self.interval
-        y_data = np.concatenate([self.y_data, new_y_data])
-        self.x_data = x_data[-self.length:]
-        self.y_data = y_data[-self.length:]
+        self.buffer.push(np.asarray(new_y_data)[:, None])
 
 
-buffer = Buffer()
+buffer = Scroll()
+# Running min and max of the window, and hysteresis of the y limits.
+# About 64 blocks cover the window, a query never scans every sample,
+# the limits hide the coarseness of whole blocks.
+stats = RunningStats(buffer.length, num_channels=1)
+limits = Limits()
 
 plt.style.use('ggplot')
 # plt.ion()
@@ -33,23 +41,26 @@ frame_rate = 20
 fig, axes = plt.subplots(2, 1)
 background = fig.canvas.copy_from_bbox(axes[0].bbox)
 line = axes[0].plot(buffer.x_data, buffer.y_data, '-o', alpha=0.8)
-plt.show(False)
+plt.show(block=False)
 plt.draw()
 
 plt.pause(1 / frame_rate)
 
 
 for j in range(100):
-    buffer.push(np.random.randn(1))
+    new_y_data = np.random.randn(1)
+    buffer.push(new_y_data)
+    stats.push(new_y_data[:, None])
 
     line[0].set_xdata(buffer.x_data)
     line[0].set_ydata(buffer.y_data)
 
     axes[0].set_xlim([buffer.x_data[0], buffer.x_data[-1]])
 
-    new_min, new_max = min(buffer.y_data), max(buffer.y_data)
-    axes[0].set_ylim([min(new_min, axes[0].get_ylim()[0]),
-                      max(new_max, axes[0].get_ylim()[1])])
+    # Limits only move when data leaves them, or uses too little of them.
+    new_limits = limits.update(stats.min()[0], stats.max()[0])
+    if new_limits is not None:
+        axes[0].set_ylim(new_limits)
 
     t = time.time()
     # fig.canvas.restore_region(background)
@@ -0,0 +1,67 @@
+# coding: utf-8
+
+'''
+Streaming plots of multichannel signals.
+
+The pipeline is
+    source -> ring buffer -> transforms -> display matrix -> renderer
+                          -> sinks
+sources     Source, SyntheticSource, NetworkSource, PlaybackSource,
+            pace and make chunks,
+buffer      Buffer, Cursor, SharedBuffer, lock-free ring of raw samples,
+transforms  Chain, SOSFilter, FIRDecimator, RunningStats, Pyramid,
+display     Sweep, EnvelopeSweep, FramePacer, the matrix shown on screen,
+renderers   LinesRenderer, CollectionRenderer, RasterRenderer,
+            BlitManager, SweepBlitter, HistoryView, Plotter, App,
+sinks       MemmapRecorder, ChunkedRecorder, SinkThread,
+headless    Recorder, run by python -m dynplot.recorder.
+Every stage has its benchmark in benchmarks/.
+
+Names are imported on first use, so a headless recorder
+never imports matplotlib or tkinter.
+'''
+
+import importlib
+
+# Public names, and the module they live in.
+_EXPORTS = dict(
+    to_float='buffer', Cursor='buffer', Buffer='buffer',
+    Pyramid='pyramid',
+    SharedBuffer='shared', AcquisitionProcess='shared',
+    Clock='sources', Source='sources', SyntheticSource='sources',
+    SOURCES='sources',
+    NetworkSource='network', ReplayServer='network',
+    PlaybackSource='playback', open_recording='playback',
+    biquad='filters', bandpass='filters', notch='filters',
+    SOSFilter='filters', FIRDecimator='filters', Chain='filters',
+    RunningStats='stats', AutoGain='stats', Limits='stats',
+    MemmapRecorder='sinks', MemmapReader='sinks', ChunkedRecorder='sinks',
+    ChunkedReader='sinks', SinkThread='sinks', SINKS='sinks',
+    Recorder='recorder',
+    Metrics='metrics',
+    Sweep='displayer', FramePacer='displayer',
+    EnvelopeSweep='decimation',
+    LinesRenderer='renderers', CollectionRenderer='renderers',
+    RasterRenderer='renderers', RENDERERS='renderers',
+    BlitManager='renderers', SweepBlitter='renderers',
+    HistoryView='history',
+    Plotter='plotter',
+    App='app',
+)
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    # Import the module of name on first use.
+    if name not in _EXPORTS:
+        raise AttributeError('module %r has no attribute %r'
+                             % (__name__, name))
+    module = importlib.import_module('.' + _EXPORTS[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,636 @@
+# coding: utf-8
+
+'''
+This a tkinter app to display waveforms in real time.
+Start it with tkapp_dynamic_plot.py.
+'''
+
+import time
+import numpy as np
+import threading
+import tkinter as tk
+import matplotlib.pyplot as plt
+from pprint import pprint
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from .buffer import Buffer
+from .displayer import Sweep, FramePacer
+from .decimation import EnvelopeSweep
+from .sinks import SINKS, SinkThread
+from .sources import SyntheticSource
+from .shared import SharedBuffer, AcquisitionProcess
+from .metrics import Metrics
+from .stats import RunningStats, AutoGain
+from .renderers import RENDERERS, RasterRenderer, BlitManager, SweepBlitter
+from .history import HistoryView
+
+
+class App():
+    # Levels of the summary pyramid, bins of 4 to 65536 samples.
+    LEVELS = 8
+
+    def __init__(self, root, frame_rate=20, record_rate=30, num_channels=17,
+                 renderer='collection', max_length=100, record_path=None,
+                 record_format='memmap', source=None, acquisition='thread',
+                 status=False, autogain=False, chain=None, attach=None,
+                 sink_latency=5, history=600):
+        # Initialize root.
+        self.root = root
+
+        # Initialize parameters.
+        self.init_params(frame_rate, record_rate, num_channels, renderer,
+                         max_length, record_path, record_format, source,
+                         acquisition, status, autogain, chain, attach,
+                         sink_latency, history)
+
+        # Create components.
+        self.create()
+
+        # Layout the tkinter GUI.
+        self.layout()
+
+        # Bound dynamic figure and buttons function.
+        self.bounding()
+
+        # Overwrite onclose function for safety quit.
+        self.root.protocol('WM_DELETE_WINDOW', self._quit)
+
+    """ Initialize parameters. recorder_info and displayer_info """
+    def init_params(self, frame_rate, record_rate, num_channels, renderer,
+                    max_length, record_path, record_format, source,
+                    acquisition, status, autogain, chain, attach,
+                    sink_latency, history):
+        # self.frame_rate = frame_rate
+        # self.record_rate = record_rate
+        # self.num_channels = num_channels
+ 
+        # A viewer attached to a running recorder shows its shared buffer,
+        # it has no source of its own and the recorder writes the file.
+        if attach is not None:
+            if record_path is not None:
+                raise ValueError('An attached viewer does not record, '
+                                 'the recorder writes the file.')
+            source = acquisition = None
+            buffer = SharedBuffer.attach(attach)
+        else:
+            # Default source makes record_rate chunks of 3 samples per second.
+            if source is None:
+                source = SyntheticSource(sample_rate=record_rate * 3,
+                                         num_channels=num_channels,
+                                         chunk_size=3)
+            # The buffer takes the channels of the source.
+            num_channels = source.info['num_channels']
+            # The ring holds sink_latency seconds of samples,
+            # a sink stalled that long still loses nothing.
+            capacity = max(500, int(source.info['sample_rate']
+                                    * sink_latency))
+
+            # Source runs on a thread, or in its own process
+            # pushing into a shared memory buffer.
+            if acquisition == 'process':
+                acquisition = AcquisitionProcess(source, capacity)
+                buffer = acquisition.buffer
+            else:
+                acquisition = None
+                # Raw samples of the source are stored as they come.
+                buffer = Buffer(capacity, num_channels=num_channels,
+                                dtype=source.info['dtype'],
+                                scale=source.info['scale'],
+                                offset=source.info['offset'])
+        num_channels = buffer.info['num_channels']
+
+        # The history view zooms and pans over summaries of history
+        # seconds, kept by this process whoever pushes the buffer.
+        # An attached viewer does not know the rate, it keeps 100 rings.
+        sample_rate = None if source is None else source.info['sample_rate']
+        buffer.keep_summary(self.LEVELS, 100 * buffer.info['capacity']
+                            if sample_rate is None
+                            else int(sample_rate * history))
+
+        # Initialize record parameters.
+        self.recorder_info = dict(
+            source=source,  # Source of data, None when attached.
+            attach=attach,  # Shared buffer name of a recorder, or None.
+            acquisition=acquisition,  # Acquisition process, or None.
+            buffer=buffer,  # Buffer of data.
+            record_rate=record_rate,  # Record rate.
+            record_on=False,  # Record switcher.
+            record_path=record_path,  # File to record into, or None.
+            record_format=record_format,  # Sink, memmap or chunked.
+            sink=None,  # Background writer of the record file.
+            sink_latency=sink_latency,  # Seconds the sink may lag behind.
+        )
+
+        # Initialize display parameters.
+        self.displayer_info = dict(
+            frame_rate=frame_rate,  # Frame rate of animation.
+            display_on=False,  # Display switcher.
+            idx=0,  # Current vertical index.
+            max_length=max_length,  # Length to display.
+            channels=np.arange(num_channels),  # Channels to display.
+            selected=np.ones(num_channels, dtype=bool),  # As a mask.
+            height=2,  # Height of each channel.
+            gap=2,  # Rows, or bins, blanked ahead of the cursor.
+            renderer=renderer,  # Renderer, lines, collection or raster.
+            pacer=FramePacer(frame_rate),  # Deadlines of frames.
+            job=None,  # Pending after() job of the next frame.
+            metrics=Metrics(),  # Latency and frame metrics.
+            status=status,  # Show metrics in the status panel.
+            status_time=0,  # Time the status panel was last updated.
+            autogain=autogain,  # Fit every channel into its lane.
+            chain=chain,  # Filters of the display, None for raw samples.
+            sample_rate=sample_rate,  # Sample rate, None when attached.
+            history_rate=4,  # Refreshes per second of a live history.
+            history_time=0,  # Time the history view was last refreshed.
+            drag=None,  # Column the history view is dragged from.
+        )
+
+    """ Create components, frames, buttons, labels and selectors. """
+    def create(self):
+        # Create components.
+        # Create frames.
+        self.frames = dict(
+            Figure=tk.Frame(self.root),  # Frame of figure.
+            Control=tk.Frame(self.root),  # Frame of controls.
+            Status=tk.Frame(self.root),  # Frame of status.
+            Selector=tk.Frame(self.root),  # Frame of selectors.
+        )
+
+        # Create buttons.
+        self.buttons = dict(
+            # Display button, toggle display.
+            Display=tk.Button(self.frames['Control']),
+            # Record button, toggle record.
+            Record=tk.Button(self.frames['Control']),
+            # Quit button, close window.
+            Quit=tk.Button(self.frames['Control']),
+        )
+        if self.displayer_info['status']:
+            # Export button, write metrics into CSV.
+            self.buttons['Export'] = tk.Button(self.frames['Control'])
+
+        # Create labels.
+        self.labels = dict(
+            # Display status label.
+            Display=tk.Label(self.frames['Status']),
+            # Record status label.
+            Record=tk.Label(self.frames['Status']),
+        )
+        # Range of the history view.
+        self.labels['History'] = tk.Label(self.frames['Status'])
+        if self.displayer_info['status']:
+            # Metrics status label.
+            self.labels['Metrics'] = tk.Label(self.frames['Status'])
+
+        # Create selectors.
+        self.selectors = dict()
+        for j in range(self.recorder_info['buffer'].info['num_channels']):
+            # Each selector is a list,
+            # [Checkbutton instance, IntVar instance]
+            self.selectors[j] = [tk.Checkbutton(
+                self.frames['Selector']), tk.IntVar()]
+
+    """ Place components. Place frames, buttons, labels and selectors """
+    def layout(self):
+        # Place frames.
+        print('Placing frames.')
+        pprint(self.frames)
+        for name, frame in self.frames.items():
+            frame.pack(side=tk.TOP)
+
+        # Place buttons in control frame.
+        print('Placing buttons.')
+        pprint(self.buttons)
+        for name, button in self.buttons.items():
+            button.config(text=name)
+            button.pack(side=tk.LEFT, padx=5, pady=1)
+
+        # Place labels in status frame.
+        print('Placing labels.')
+        pprint(self.labels)
+        for name, label in self.labels.items():
+            label.config(text=name)
+            label.pack(side=tk.LEFT, padx=5, pady=1)
+
+        # Place selectors in selectors frame.
+        print('Placing selectors.')
+        pprint(self.selectors)
+        for idx, selector in self.selectors.items():
+            selector[0].config(text=idx)
+            selector[0].grid(row=idx // 5, column=idx % 5)
+
+    """ Bounding functions.
+        _quit on Quit button,
+        _selectors_onchange on selectors,
+        _toggle_record on Record button """
+    def bounding(self):
+        # Bound _quit function on Quit button.
+        self.buttons['Quit'].config(command=self._quit)
+
+        # Bound _export_metrics function on Export button.
+        if self.displayer_info['status']:
+            self.buttons['Export'].config(command=self._export_metrics)
+
+        # Bound _selectors_change function on selectors.
+        for selector in self.selectors.values():
+            # Bounding variable.
+            selector[0].config(variable=selector[1])
+            # Setting variable as 1 means being selected.
+            selector[1].set(1)
+            # Bounding onchange function.
+            selector[0].config(command=self._selectors_onchange)
+
+        # Init buffer.
+        buffer = self.recorder_info['buffer']
+
+        # Plot using ggplot.
+        # matplotlib.use('TkAgg')
+        plt.style.use('ggplot')
+        # The live sweep on top, the zoomable history under it.
+        fig, (axe, history_axe) = plt.subplots(
+            2, 1, figsize=(5, 5), dpi=100,
+            gridspec_kw=dict(height_ratios=[4, 1]))
+        # Display matrix, every line shows one column of it.
+        # Windows wider than the axes in pixels are shown as
+        # min/max envelopes, one bin per pixel column.
+        pixels = int(axe.bbox.width)
+        if self.displayer_info['max_length'] > pixels:
+            sweep = EnvelopeSweep(max_length=self.displayer_info['max_length'],
+                                  num_channels=buffer.info['num_channels'],
+                                  height=self.displayer_info['height'],
+                                  pixels=pixels,
+                                  gap=self.displayer_info['gap'])
+        else:
+            sweep = Sweep(max_length=self.displayer_info['max_length'],
+                          num_channels=buffer.info['num_channels'],
+                          height=self.displayer_info['height'],
+                          gap=self.displayer_info['gap'])
+        # The display turns raw samples into values,
+        # unless a chain of filters already did.
+        if self.displayer_info['chain'] is None:
+            sweep.set_gain(buffer.scale, -buffer.offset / buffer.scale)
+        # Renderer draws the display matrix.
+        renderer = RENDERERS[self.displayer_info['renderer']](axe, sweep)
+        axe.set_xlim([-1, self.displayer_info['max_length']])
+        axe.set_ylim([-1, self.displayer_info['height']
+                      * buffer.info['num_channels']])
+
+        # Embed canvas on figure frame.
+        canvas = FigureCanvasTkAgg(fig, master=self.frames['Figure'])
+        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+        canvas._tkcanvas.pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+        # Embed on_key_event for key press on figure.
+        canvas.mpl_connect('key_press_event', self.on_key_event)
+        # Blitter caches the static background after each full draw,
+        # then only redraws the strip swept since the last frame.
+        blitter = SweepBlitter(canvas, axe, sweep, renderer.artists)
+        # History view, wheel zooms and dragging pans it, its limits
+        # never change, so a redraw only restores its own background.
+        # It is drawn as a raster, whose cost follows pixels only.
+        history = HistoryView(history_axe, buffer,
+                              self.displayer_info['height'],
+                              self.displayer_info['sample_rate'])
+        if self.displayer_info['chain'] is None:
+            history.set_gain(sweep.gain, sweep.center)
+        history_renderer = RasterRenderer(history_axe, history)
+        history_blitter = BlitManager(canvas, history_axe,
+                                      history_renderer.artists)
+        canvas.mpl_connect('scroll_event', self._on_scroll)
+        canvas.mpl_connect('button_press_event', self._on_press)
+        canvas.mpl_connect('motion_notify_event', self._on_drag)
+        canvas.mpl_connect('button_release_event', self._on_release)
+
+        # Bound toggle function on Record button.
+        self._toggle_record(init=True)
+        self.buttons['Record'].config(command=self._toggle_record)
+        # Start recording thread, or process.
+        if self.recorder_info['acquisition'] is not None:
+            self.recorder_info['acquisition'].start()
+        elif self.recorder_info['source'] is not None:
+            self._start_thread(self._realtime_record)
+        # Start writing recorded data into the file, if there is one.
+        if self.recorder_info['record_path'] is not None:
+            sink = SINKS[self.recorder_info['record_format']]
+            self.recorder_info['sink'] = SinkThread(buffer, sink(
+                self.recorder_info['record_path'],
+                num_channels=buffer.info['num_channels'],
+                dtype=buffer.info['dtype'],
+                sample_rate=self.recorder_info['source'].info['sample_rate'],
+                scale=buffer.scale, offset=buffer.offset))
+            self.recorder_info['sink'].start()
+
+        # Bound _realtime_display function on Display button.
+        self.buttons['Display'].config(text='Display_ON')
+        self.labels['Display'].config(bg='red')
+        self.displayer_info['display_on'] = False
+        self.buttons['Display'].config(command=self._realtime_display)
+        # Display reads through its own cursor, so it never misses a chunk,
+        # filtered by the chain of the display, the record stays raw.
+        self.displayer_info['cursor'] = buffer.cursor(
+            'display', self.displayer_info['chain'])
+        # An attached viewer shows the last window of the recorder at once.
+        if self.recorder_info['attach'] is not None:
+            self.displayer_info['cursor'].position = max(
+                buffer.total - self._window(), 0)
+        # Running statistics of the window, for the auto-gain.
+        self.displayer_info['stats'] = RunningStats(
+            self.displayer_info['max_length'], buffer.info['num_channels'])
+        self.displayer_info['gainer'] = AutoGain(self.displayer_info['height'])
+        # Followings are components used for _realtime_display function.
+        self.sweep = sweep
+        self.renderer = renderer
+        self.blitter = blitter
+        self.history = history
+        self.history_renderer = history_renderer
+        self.history_blitter = history_blitter
+        self.fig = fig
+        self.axe = axe
+        self.history_axe = history_axe
+
+    # Samples of the buffer shown by the display window.
+    def _window(self):
+        chain = self.displayer_info['chain']
+        return self.displayer_info['max_length'] \
+            * (1 if chain is None else chain.factor)
+
+    # Designed to run on selectors onchange,
+    # to toggle channels display status.
+    def _selectors_onchange(self):
+        selected = np.array([selector[1].get() == 1
+                             for selector in self.selectors.values()])
+        added = np.flatnonzero(selected & ~self.displayer_info['selected'])
+        channels = np.flatnonzero(selected)
+        self.displayer_info['selected'] = selected
+        self.displayer_info['channels'] = channels
+        # The display reads, filters and draws the shown channels only,
+        # None reads every channel without gathering columns.
+        cursor = self.displayer_info['cursor']
+        cursor.channels = None if selected.all() else channels
+        # Channels shown again were not read while hidden,
+        # fill their window again from the buffer.
+        if len(added):
+            self.sweep.backfill(self.recorder_info['buffer'].backfill(
+                cursor, added, self._window()), added)
+        self.renderer.set_channels(channels)
+        # Every column changes, the background does not.
+        self.blitter.touch()
+        self.history_renderer.set_channels(channels)
+        self._redraw_history()
+
+    # Toggle record function.
+    def _toggle_record(self, init=False):
+        # When init is True, initialize record function as closed.
+        if init:
+            # Change button text into ON.
+            self.buttons['Record'].config(text='Record_ON')
+            self.labels['Record'].config(bg='red')
+            # Turn off record.
+            self.recorder_info['record_on'] = False
+            return 0
+
+        # Toggle record function.
+        if self.recorder_info['record_on']:
+            # Change button text into ON.
+            self.buttons['Record'].config(text='Record_ON')
+            self.labels['Record'].config(bg='red')
+            # Turn off record.
+            self.recorder_info['record_on'] = False
+        else:
+            # Change button text into OFF.
+            self.buttons['Record'].config(text='Record_OFF')
+            self.labels['Record'].config(bg='green')
+            # Turn on record.
+            self.recorder_info['record_on'] = True
+            # Resume frames if display is waiting for data.
+            if self.displayer_info['display_on']:
+                self.displayer_info['pacer'].start()
+                self._schedule_frame(0)
+
+        # The acquisition process pushes only while record is on.
+        if self.recorder_info['acquisition'] is not None:
+            self.recorder_info['acquisition'].set_record(
+                self.recorder_info['record_on'])
+
+    # Initialize and start background thread.
+    def _start_thread(self, target):
+        p = threading.Thread(target=target)
+        p.start()
+
+    # Realtime feeding data into buffer.
+    def _realtime_record(self):
+        # Print starts.
+        print('Recording process starts.')
+        # Source paces itself, loop until it is stopped.
+        self.recorder_info['source'].run(self._on_chunk)
+        # Print stops.
+        print('Recording process stops.')
+
+    # Called by the source for every chunk.
+    def _on_chunk(self, timestamp, new_data):
+        if self.recorder_info['record_on']:
+            # Record if record_on.
+            self.recorder_info['buffer'].push(new_data, timestamp)
+
+    # Realtime display.
+    def _realtime_display(self):
+        # Toggle display.
+        if self.displayer_info['display_on']:
+            # Change button text into ON.
+            self.buttons['Display'].config(text='Display_ON')
+            self.labels['Display'].config(bg='red')
+            # Turn off display.
+            self.displayer_info['display_on'] = False
+        else:
+            # Change button text into OFF.
+            self.buttons['Display'].config(text='Display_OFF')
+            self.labels['Display'].config(bg='green')
+            # Turn on display.
+            self.displayer_info['display_on'] = True
+
+        if not self.displayer_info['display_on']:
+            # Cancel the next frame.
+            self._cancel_frame()
+            print('Display stops')
+            return 0
+
+        print('Display starts')
+        # Frames are scheduled on the Tk event loop,
+        # so buttons stay responsive at any frame rate.
+        self.displayer_info['pacer'].start()
+        self._schedule_frame(0)
+
+    # Schedule the next frame after delay milliseconds.
+    def _schedule_frame(self, delay):
+        if self.displayer_info['job'] is None:
+            self.displayer_info['job'] = self.root.after(
+                max(delay, 0), self._display_frame)
+
+    # Cancel the next frame if it is pending.
+    def _cancel_frame(self):
+        if self.displayer_info['job'] is not None:
+            self.root.after_cancel(self.displayer_info['job'])
+            self.displayer_info['job'] = None
+
+    # Draw one frame and schedule the next one.
+    def _display_frame(self):
+        self.displayer_info['job'] = None
+        if not self.displayer_info['display_on']:
+            return 0
+
+        # Nothing is new and nothing will come until record is on again,
+        # stop scheduling, _toggle_record resumes the frames.
+        buffer = self.recorder_info['buffer']
+        pending = buffer.total != self.displayer_info['cursor'].position
+        # An attached viewer keeps polling, the recorder pushes on its own.
+        if not pending and not self.recorder_info['record_on'] \
+                and self.recorder_info['attach'] is None:
+            return 0
+
+        metrics = self.displayer_info['metrics']
+        if pending:
+            # Stamp the frame begin, and the unread part of the buffer.
+            begin = time.monotonic()
+            cursor = self.displayer_info['cursor']
+            position = cursor.position
+            fill = (buffer.total - position) / buffer.info['capacity']
+
+            # Read every new sample since last frame from buffer.
+            new_data = buffer.read_since(cursor)
+            pop = time.monotonic()
+            # A decimating chain holds samples back until a whole block
+            # has come, nothing may be ready to show yet.
+            pending = len(new_data) > 0
+
+        if pending:
+            # Fit channels into their lanes, when they leave them.
+            if self.displayer_info['autogain']:
+                self._autogain(new_data)
+
+            # Write new_data of the shown channels into the display matrix.
+            self.displayer_info['idx'] = self.sweep.write(new_data,
+                                                          cursor.channels)
+
+            # Refresh the shown channels from the display matrix.
+            self.renderer.update()
+
+            # Restore cached background and draw lines.
+            self.blitter.draw()
+            draw = time.monotonic()
+
+            # Blit canvas.
+            self.blitter.blit()
+            metrics.frame(buffer.stamps(position, cursor.position),
+                          begin, pop, draw, time.monotonic(), fill)
+
+            # A live history shows the new samples a few times a second.
+            if self.history.following and time.monotonic() \
+                    - self.displayer_info['history_time'] \
+                    > 1 / self.displayer_info['history_rate']:
+                self._redraw_history()
+
+        # Wait until the deadline of the next frame.
+        pacer = self.displayer_info['pacer']
+        skipped = pacer.skipped
+        self._schedule_frame(pacer.next_delay())
+        if pacer.skipped > skipped:
+            # Count lagging, if a frame can not be updated on time.
+            metrics.drop(pacer.skipped - skipped)
+
+        # Refresh the status panel twice a second.
+        if self.displayer_info['status'] and \
+                time.monotonic() - self.displayer_info['status_time'] > 0.5:
+            self.displayer_info['status_time'] = time.monotonic()
+            self.labels['Metrics'].config(text=metrics.text())
+
+    # Update running statistics with new_data, and the gains if needed.
+    def _autogain(self, new_data):
+        stats = self.displayer_info['stats']
+        stats.push(new_data, self.displayer_info['cursor'].channels)
+        change = self.displayer_info['gainer'].update(
+            stats, self.sweep.gain, self.sweep.center)
+        if change is not None:
+            self.sweep.set_gain(*change)
+            self.blitter.touch()
+            # Gains of raw samples hold for the history too.
+            if self.displayer_info['chain'] is None:
+                self.history.set_gain(*change)
+
+    # Refresh the history view and show it.
+    def _redraw_history(self):
+        self.displayer_info['history_time'] = time.monotonic()
+        self.history.update()
+        self.history_renderer.update()
+        self.history_blitter.update()
+        self.labels['History'].config(text=self.history.text())
+
+    # Wheel on the history view zooms in and out around the pointer.
+    def _on_scroll(self, event):
+        if event.inaxes is not self.history_axe:
+            return
+        self.history.zoom(0.5 if event.button == 'up' else 2, event.xdata)
+        self._redraw_history()
+
+    # Dragging the history view pans it.
+    def _on_press(self, event):
+        if event.inaxes is self.history_axe:
+            self.displayer_info['drag'] = event.xdata
+
+    def _on_drag(self, event):
+        drag = self.displayer_info['drag']
+        if drag is None or event.inaxes is not self.history_axe:
+            return
+        # Samples follow the pointer, dragging right shows earlier ones.
+        self.history.pan(drag - event.xdata)
+        self.displayer_info['drag'] = event.xdata
+        self._redraw_history()
+
+    def _on_release(self, event):
+        self.displayer_info['drag'] = None
+
+    # Write metrics into a CSV file of the current time.
+    def _export_metrics(self):
+        path = time.strftime('metrics_%Y%m%d_%H%M%S.csv')
+        self.displayer_info['metrics'].export_csv(path)
+        print('Metrics exported to %s' % path)
+
+    # Key pressed event handler.
+    def on_key_event(self, event):
+        # Handel key press.
+        print('You pressed %s' % event.key)
+        # A playback source seeks with left and right by 5 seconds,
+        # and plays faster or slower with up and down.
+        source = self.recorder_info['source']
+        if not hasattr(source, 'seek'):
+            return
+        if event.key in ('left', 'right'):
+            step = 5 if event.key == 'right' else -5
+            source.seek(source.time + step)
+        elif event.key in ('up', 'down'):
+            speed = source.info['speed'] * (2 if event.key == 'up' else 0.5)
+            source.set_speed(min(max(speed, source.MIN_SPEED),
+                                 source.MAX_SPEED))
+        print('Playing at %gx from %.1f s' % (source.info['speed'],
+                                              source.time))
+
+    # Safety quit.
+    def _quit(self):
+        # Stop display frames.
+        self.displayer_info['display_on'] = False
+        self._cancel_frame()
+        # Write the rest of the record file and close it,
+        # while the buffer it drains is still mapped.
+        if self.recorder_info['sink'] is not None:
+            self.recorder_info['sink'].stop()
+            # Samples the sink lost, overwritten before it read them.
+            print('Sink overruns: %d samples.'
+                  % self.recorder_info['sink'].overruns)
+        # Stop recording thread, or process.
+        if self.recorder_info['acquisition'] is not None:
+            self.recorder_info['acquisition'].stop()
+        elif self.recorder_info['source'] is not None:
+            self.recorder_info['source'].stop()
+        else:
+            # Detach, the recorder goes on.
+            self.recorder_info['buffer'].close()
+        # Quit app and close window.
+        self.root.quit()
+        self.root.destroy()
@@ -0,0 +1,361 @@
+# coding: utf-8
+
+import time
+import numpy as np
+from pprint import pprint
+from .pyramid import Pyramid
+
+
+def to_float(raw, scale=None, offset=None):
+    # Values of raw samples, raw * scale + offset, as floats.
+    # Integers of up to 16 bits and float32 give float32,
+    # wider types give float64.
+    out = raw.astype(np.result_type(raw.dtype, np.float32))
+    if scale is not None:
+        out *= np.asarray(scale, dtype=out.dtype)
+    if offset is not None:
+        out += np.asarray(offset, dtype=out.dtype)
+    return out
+
+
+class Cursor():
+    '''
+    This is a read cursor of a buffer.
+    Every reader holds its own cursor,
+    so readers never steal samples from each other.
+    A cursor with a chain of filters reads a filtered view,
+    see filters.Chain, readers choose raw or filtered samples.
+    A cursor with channels, an index array, reads those columns only,
+    the other channels cost nothing, None reads every channel.
+    '''
+    def __init__(self, position=0, name=None, chain=None, channels=None):
+        # Name of the reader, for reporting only.
+        self.name = name
+        # Filters applied to what is read, None for raw samples.
+        self.chain = chain
+        # Columns read, None for every channel.
+        self.channels = channels
+        # Absolute index of the next sample to read.
+        self.position = position
+        # Number of samples lost because the reader fell behind.
+        self.overrun = 0
+
+    def __repr__(self):
+        return 'Cursor(name=%r, position=%d, overrun=%d)' % (
+            self.name, self.position, self.overrun)
+
+
+class Buffer():
+    '''
+    This is a data buffer.
+    It is a fixed-capacity ring buffer,
+    new data is written in place and wraps around,
+    so the cost of push only depends on the size of new data.
+
+    One producer thread pushes and any number of reader threads
+    read through their own cursors, no lock is taken on either side.
+    The memory model is the one of CPython:
+    every store of a Python attribute is atomic and
+    is seen by other threads in program order.
+    The producer publishes two counters,
+    _writing is raised before the ring is written and
+    total is raised after the ring is written.
+    Readers never look at samples at or beyond total,
+    and after copying they re-read _writing,
+    every copied sample older than (_writing - capacity)
+    may have been overwritten during the copy and is dropped as overrun.
+    So readers get whole, consistent chunks and the producer never waits.
+
+    Every chunk is stamped with its end index, acquisition time and
+    push time, in time.monotonic seconds, the last STAMPS chunks are kept.
+
+    Samples are stored raw, as dtype, for instance int16 counts of
+    an acquisition board, every channel has a scale and an offset,
+    a raw sample r is worth r * scale + offset.
+    Readers get raw samples, they are converted to floats by to_float
+    only where values are needed, by filters or the display.
+
+    With levels, a min/max/mean Pyramid of history samples is kept
+    for summary. It is not updated by push, summary catches it up
+    through its own cursor, so the producer pays nothing for it,
+    and every process reading a shared buffer keeps its own.
+    '''
+    # Number of chunk stamps kept.
+    STAMPS = 1024
+
+    def __init__(self, capacity=500, num_channels=13, levels=0,
+                 dtype='float64', scale=None, offset=None, history=None):
+        # Information of the buffer.
+        self.info = {}
+        # Capacity of the buffer.
+        self.comment('capacity', capacity)
+        # Number of channels.
+        self.comment('num_channels', num_channels)
+        # Type of raw samples.
+        self.comment('dtype', np.dtype(dtype).str)
+        # Initialize ring storage with capacity and num_channels.
+        # The buffer starts full of zeros, as it always did.
+        # Sample of absolute index i lives at i % capacity.
+        self._ring = self._allocate(capacity, num_channels,
+                                    np.dtype(dtype))
+        # Scale and offset of every channel, rows of units.
+        self.units = self._allocate_units(num_channels)
+        self.units[0] = 1 if scale is None else scale
+        self.units[1] = 0 if offset is None else offset
+        # Total number of samples ever pushed, published after writing.
+        self.total = 0
+        # End of the samples being written, published before writing.
+        self._writing = 0
+        # Stamps of chunks, rows of (end index, acquisition, push).
+        self._stamps = self._allocate_stamps(self.STAMPS)
+        # Total number of chunks ever pushed.
+        self._chunks = 0
+        # Initialize new_data.
+        # new_data stores the lastest pushed data.
+        self.new_data = None
+        # Cursor used by pop.
+        self._pop_cursor = self.cursor('pop')
+        # Min/max/mean pyramid of levels levels, if levels is not 0.
+        self.keep_summary(levels, history)
+
+    def _allocate(self, capacity, num_channels, dtype):
+        # Ring storage, subclasses may put it elsewhere.
+        return np.zeros((capacity, num_channels), dtype=dtype)
+
+    def _allocate_units(self, num_channels):
+        # Scale and offset storage, subclasses may put it elsewhere.
+        return np.zeros((2, num_channels))
+
+    def _allocate_stamps(self, size):
+        # Stamps storage, subclasses may put it elsewhere.
+        return np.full((size, 3), -1.0)
+
+    @property
+    def scale(self):
+        # Scale of every channel.
+        return self.units[0]
+
+    @property
+    def offset(self):
+        # Offset of every channel.
+        return self.units[1]
+
+    def to_float(self, raw, channels=None):
+        # Values of raw samples of this buffer, as floats.
+        # With channels, raw holds those columns only.
+        scale, offset = self.units
+        if channels is not None:
+            scale, offset = scale[channels], offset[channels]
+        return to_float(raw, None if (scale == 1).all() else scale,
+                        None if (offset == 0).all() else offset)
+
+    @property
+    def data(self):
+        # Buffered data in time order, oldest first.
+        return self.fetch()
+
+    def push(self, new_data, timestamp=None):
+        # Push new_data into the buffer.
+        # timestamp is the acquisition time of new_data, default is now.
+        # Use FIFO protocol to pervent the buffer exceeding capacity.
+        # Only called from the producer thread.
+        now = time.monotonic()
+        capacity = self.info['capacity']
+        total = self.total + len(new_data)
+        # Only the last capacity samples can survive.
+        chunk = new_data[-capacity:]
+        n = len(chunk)
+        # Announce the samples about to be overwritten.
+        self._writing = total
+        # Write in place, in two parts if it wraps around.
+        head = (total - n) % capacity
+        first = min(n, capacity - head)
+        self._ring[head:head + first] = chunk[:first]
+        self._ring[:n - first] = chunk[first:]
+        # Stamp the chunk.
+        self._stamps[self._chunks % self.STAMPS] = (
+            total, now if timestamp is None else timestamp, now)
+        self._chunks += 1
+        # Publish the new samples.
+        self.total = total
+        # Storage new_data.
+        self.new_data = new_data
+
+    def pop(self):
+        # Pop every sample pushed since last pop.
+        out = self.read_since(self._pop_cursor)
+        # Clear new_data.
+        self.new_data = None
+        if len(out) == 0:
+            # If nothing is new, return None.
+            return None
+        # Return out.
+        return out
+
+    def cursor(self, name=None, chain=None, channels=None):
+        # Make a new cursor, it starts reading from now on,
+        # through chain if it is not None, channels if it is not None.
+        return Cursor(self.total, name, chain, channels)
+
+    def read_since(self, cursor):
+        # Read every sample pushed since last read of the cursor,
+        # as one contiguous batch.
+        # If the cursor fell more than capacity behind,
+        # the lost samples are added to cursor.overrun
+        # and reading continues from the oldest valid sample.
+        capacity = self.info['capacity']
+        total = self.total
+        begin = max(cursor.position, total - capacity)
+        channels = cursor.channels
+        if channels is None:
+            out = np.array(self._slice(begin, total))
+        else:
+            # Only the columns of channels are copied.
+            out = self._slice(begin, total, channels)
+        # Drop samples the producer may have overwritten while copying.
+        torn = min(self._writing - capacity, total) - begin
+        if torn > 0:
+            out = out[torn:]
+            begin += torn
+        cursor.overrun += begin - cursor.position
+        cursor.position = total
+        # Filter values with the state of the cursor, the ring stays raw.
+        if cursor.chain is not None:
+            out = cursor.chain.process(self.to_float(out, channels),
+                                       channels)
+        return out
+
+    def backfill(self, cursor, channels, length):
+        # Read again the last length samples of channels before
+        # cursor.position, for channels the cursor did not read.
+        # The chain of cursor forgets channels and filters them again,
+        # its state is then ready to go on reading them.
+        # length is cut to what the ring still holds, and to a multiple
+        # of the decimation of the chain, so kept samples fall where
+        # they do for the other channels.
+        factor = 1 if cursor.chain is None else cursor.chain.factor
+        capacity = self.info['capacity']
+        end = cursor.position
+        begin = max(end - length, self.total - capacity, 0)
+        begin = end - (end - begin) // factor * factor
+        out = self._slice(begin, end, channels)
+        # Drop samples the producer may have overwritten while copying.
+        torn = min(self._writing - capacity, end) - begin
+        if torn > 0:
+            out = out[-(-torn // factor) * factor:]
+        # Filter from a clean state, kept outputs land where the
+        # ones of the other channels do.
+        if cursor.chain is not None:
+            cursor.chain.reset(channels)
+            out = cursor.chain.process(self.to_float(out, channels),
+                                       channels)
+        return out
+
+    def stamps(self, begin, end):
+        # Stamps of the chunks ending in (begin, end], absolute indices,
+        # rows of (end index, acquisition time, push time).
+        ends = self._stamps[:, 0]
+        out = self._stamps[(ends > begin) & (ends <= end)]
+        return out[np.argsort(out[:, 0])]
+
+    def fetch(self, start=0, stop=None):
+        # Peek buffered data from start to stop.
+        # start and stop work as slice of the time ordered data.
+        # Return a view if the window does not wrap, otherwise a copy.
+        # Views are not protected against later pushes,
+        # readers on other threads should use read_since.
+        capacity = self.info['capacity']
+        start, stop, _ = slice(start, stop).indices(capacity)
+        total = self.total
+        if stop <= start:
+            return self._ring[:0]
+        return self._slice(total - capacity + start, total - capacity + stop)
+
+    def keep_summary(self, levels, history=None):
+        # Keep a pyramid of levels levels covering history samples,
+        # default capacity, or none if levels is 0.
+        # The pyramid is made on the first summary.
+        capacity = self.info['capacity']
+        self.comment('levels', levels)
+        self.comment('history', capacity if history is None or not levels
+                     else max(history, capacity))
+        self.pyramid = None
+        self._summary_cursor = None
+
+    def summarize(self):
+        # Fold samples pushed since the last summary into the pyramid.
+        # Only one thread may summarize.
+        levels = self.info['levels']
+        if not levels:
+            return
+        if self.pyramid is None:
+            # A buffer attached late starts on a bin of the coarsest level,
+            # samples before the oldest one of the ring are lost.
+            self.pyramid = Pyramid(self.info['capacity'],
+                                   self.info['num_channels'], levels,
+                                   history=self.info['history'],
+                                   start=max(self.total
+                                             - self.info['capacity'], 0))
+            self._summary_cursor = self.cursor('summary')
+            self._summary_cursor.position = self.pyramid.total
+        cursor = self._summary_cursor
+        overrun = cursor.overrun
+        new_data = self.read_since(cursor)
+        # Samples overwritten before they were summarized.
+        self.pyramid.skip(cursor.overrun - overrun)
+        self.pyramid.push(new_data)
+
+    def summary(self, start=0, stop=None, pixels=500):
+        # Summary of the last history samples from start to stop,
+        # for pixels columns, up to the newest sample.
+        # start and stop work as in fetch, over history samples.
+        # Return x, min, max and mean in raw units,
+        # x is the absolute sample index,
+        # they come from the pyramid if there are too many samples,
+        # otherwise raw samples are returned as min, max and mean.
+        self.summarize()
+        history = self.info['history']
+        start, stop, _ = slice(start, stop).indices(history)
+        total = self.total if self.pyramid is None else self.pyramid.total
+        base = total - history
+        if self.pyramid is not None:
+            out = self.pyramid.query(base + start, base + stop, pixels)
+            if out is not None:
+                return out
+        if stop <= start:
+            raw = self._ring[:0]
+        else:
+            raw = self._slice(base + start, base + stop)
+        return np.arange(base + start, base + start + len(raw)), raw, raw, raw
+
+    def _slice(self, begin, end, channels=None):
+        # Ring content of absolute indices from begin to end.
+        # With channels, a copy of those columns only.
+        capacity = self.info['capacity']
+        begin, end = begin % capacity, begin % capacity + end - begin
+        if end <= capacity:
+            if channels is None:
+                return self._ring[begin:end]
+            return self._ring[begin:end, channels]
+        if channels is None:
+            return np.concatenate((self._ring[begin:],
+                                   self._ring[:end - capacity]))
+        return np.concatenate((self._ring[begin:, channels],
+                               self._ring[:end - capacity, channels]))
+
+    def length(self):
+        # Return current length of the buffer.
+        return self.info['capacity']
+
+    def comment(self, key, value):
+        # Record information.
+        self.info[key] = value
+
+    def print(self):
+        # Print infomations.
+        print('-' * 80)
+        # _shape refers current shape of the buffered data and new data.
+        self.comment('_data_shape', self._ring.shape)
+        self.comment('_new_data_shape', self.new_data.shape)
+        # Print updated infomations.
+        pprint(self.info)
@@ -0,0 +1,200 @@
+# coding: utf-8
+
+import numpy as np
+from pprint import pprint
+
+
+class EnvelopeSweep():
+    '''
+    This is a min/max envelope of a sweep display.
+    The window of max_length samples is cut into bins of bin_size samples,
+    so that there are at most pixels bins, one per pixel column.
+    Every bin keeps the min and max of its samples,
+    it is drawn as a vertical span so that spikes stay visible.
+    Bins are maintained as chunks arrive,
+    the cost of a frame scales with pixels and not with max_length.
+    It works as a drop-in of Sweep, column j is the y data of j-th line,
+    the eraser gap is counted in bins.
+    As in Sweep, writes may hold some channels only,
+    backfill fills the others again.
+    '''
+    def __init__(self, max_length=100000, num_channels=13, height=2,
+                 pixels=500, gap=0):
+        # Information of the envelope.
+        self.info = {}
+        # Length to display, in samples.
+        self.comment('max_length', max_length)
+        # Number of channels.
+        self.comment('num_channels', num_channels)
+        # Height of each channel.
+        self.comment('height', height)
+        # Samples in each bin.
+        bin_size = int(np.ceil(max_length / pixels))
+        self.comment('bin_size', bin_size)
+        # Number of bins.
+        num_bins = int(np.ceil(max_length / bin_size))
+        self.comment('num_bins', num_bins)
+        # Bins blanked ahead of the bin being filled.
+        self.comment('gap', gap)
+        # Bias of every channel, computed once.
+        self.offsets = np.arange(num_channels) * height
+        # Display matrix, min and max of every bin interleaved.
+        self.data = np.zeros((2 * num_bins, num_channels)) + self.offsets
+        # Bins view of the display matrix, (bins, min/max, channels).
+        self._bins = self.data.reshape(num_bins, 2, num_channels)
+        # Gain and center of every channel,
+        # a sample is shown at (sample - center) * gain + bias.
+        self.gain = np.ones(num_channels)
+        self.center = np.zeros(num_channels)
+        # x data shared by every line, both rows of a bin share its x.
+        self.x = np.repeat(np.arange(num_bins) * bin_size, 2)
+        # Current bin index.
+        self.idx = 0
+        # Total number of rows ever written, two for each bin.
+        self.total = 0
+        # Running min, max and size of the bin being filled.
+        self._part_min = np.full(num_channels, np.inf)
+        self._part_max = np.full(num_channels, -np.inf)
+        self._part_n = 0
+
+    @property
+    def row(self):
+        # Row of the display matrix written next.
+        return 2 * self.idx
+
+    @property
+    def ahead(self):
+        # Rows changed ahead of row by a write,
+        # the bin being filled and the gap.
+        return 2 + 2 * self.info['gap']
+
+    def write(self, new_data, channels=None):
+        # Fold new_data into the bins, with wrap-around.
+        # With channels, new_data holds those columns only.
+        # Return the updated bin index.
+        bin_size = self.info['bin_size']
+        cols = slice(None) if channels is None else channels
+        n, pos = len(new_data), 0
+        # Complete the bin being filled.
+        if self._part_n:
+            pos = min(bin_size - self._part_n, n)
+            self._fold(new_data[:pos], channels)
+            if self._part_n == bin_size:
+                self._commit(self._part_min[None, cols],
+                             self._part_max[None, cols], channels)
+                self._reset()
+        # Whole bins of new_data at once.
+        full = (n - pos) // bin_size
+        if full:
+            block = new_data[pos:pos + full * bin_size].reshape(
+                full, bin_size, -1)
+            self._commit(block.min(axis=1), block.max(axis=1), channels)
+            pos += full * bin_size
+        # Start a new bin with the rest.
+        if pos < n:
+            self._fold(new_data[pos:], channels)
+        # Show the bin being filled, without moving on.
+        if self._part_n:
+            self._bins[self.idx, 0, cols] = self._scale(self._part_min[cols],
+                                                        channels)
+            self._bins[self.idx, 1, cols] = self._scale(self._part_max[cols],
+                                                        channels)
+        # Blank the eraser gap.
+        if self.info['gap']:
+            self._bins[(self.idx + 1 + np.arange(self.info['gap']))
+                       % self.info['num_bins']] = np.nan
+        return self.idx
+
+    def _fold(self, chunk, channels=None):
+        # Fold chunk into the bin being filled.
+        if len(chunk) == 0:
+            return
+        if channels is None:
+            np.minimum(self._part_min, chunk.min(axis=0), out=self._part_min)
+            np.maximum(self._part_max, chunk.max(axis=0), out=self._part_max)
+        else:
+            self._part_min[channels] = np.minimum(self._part_min[channels],
+                                                  chunk.min(axis=0))
+            self._part_max[channels] = np.maximum(self._part_max[channels],
+                                                  chunk.max(axis=0))
+        self._part_n += len(chunk)
+
+    def _reset(self):
+        # Empty the bin being filled.
+        self._part_min.fill(np.inf)
+        self._part_max.fill(-np.inf)
+        self._part_n = 0
+
+    def _commit(self, mins, maxs, channels=None):
+        # Write complete bins at idx and move on.
+        num_bins = self.info['num_bins']
+        # Only the last num_bins bins can be seen.
+        skip = max(len(mins) - num_bins, 0)
+        rows = (self.idx + skip + np.arange(len(mins) - skip)) % num_bins
+        self._put(rows, mins[skip:], maxs[skip:], channels)
+        self.idx = (self.idx + len(mins)) % num_bins
+        self.total += 2 * len(mins)
+
+    def _put(self, rows, mins, maxs, channels=None):
+        # Write bins at rows, of channels if it is not None.
+        if channels is None:
+            self._bins[rows, 0] = self._scale(mins)
+            self._bins[rows, 1] = self._scale(maxs)
+        else:
+            self._bins[rows[:, None], 0, channels] = self._scale(mins,
+                                                                 channels)
+            self._bins[rows[:, None], 1, channels] = self._scale(maxs,
+                                                                 channels)
+
+    def _scale(self, values, channels=None):
+        # Values as they are shown, of channels if it is not None.
+        cols = slice(None) if channels is None else channels
+        return (values - self.center[cols]) * self.gain[cols] \
+            + self.offsets[cols]
+
+    def backfill(self, history, channels):
+        # Fold history of channels into the bins before idx and
+        # the bin being filled, history ends with the last sample written.
+        # The eraser gap is kept.
+        bin_size, num_bins = self.info['bin_size'], self.info['num_bins']
+        # The last samples belong to the bin being filled.
+        body = max(len(history) - self._part_n, 0)
+        if self._part_n and len(history) > body:
+            tail = history[body:]
+            self._part_min[channels] = tail.min(axis=0)
+            self._part_max[channels] = tail.max(axis=0)
+            self._put(np.array([self.idx]), self._part_min[None, channels],
+                      self._part_max[None, channels], channels)
+        # Whole bins before it.
+        count = min(body // bin_size, num_bins - 1 - self.info['gap'])
+        if count > 0:
+            block = history[body - count * bin_size:body].reshape(
+                count, bin_size, -1)
+            rows = (self.idx - count + np.arange(count)) % num_bins
+            self._put(rows, block.min(axis=1), block.max(axis=1), channels)
+
+    def set_gain(self, gain, center):
+        # Change gain and center of every channel,
+        # the samples already shown are rescaled in place.
+        # Copies, gain may be a view of units of a shared buffer.
+        gain = np.array(gain, dtype=float)
+        self.data -= self.offsets
+        self.data *= gain / self.gain
+        self.data += self.offsets + (self.center - center) * gain
+        self.gain = gain
+        self.center = np.array(center, dtype=float)
+
+    def column(self, j):
+        # View of the j-th channel.
+        return self.data[:, j]
+
+    def comment(self, key, value):
+        # Record information.
+        self.info[key] = value
+
+    def print(self):
+        # Print infomations.
+        print('-' * 80)
+        self.comment('_data_shape', self.data.shape)
+        self.comment('_idx', self.idx)
+        pprint(self.info)
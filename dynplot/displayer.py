@@ -0,0 +1,160 @@
+# coding: utf-8
+
+import time
+import numpy as np
+from pprint import pprint
+
+
+class Sweep():
+    '''
+    This is a sweep display matrix.
+    It holds max_length samples of every channel, already scaled and biased,
+    new samples are written at idx and wrap around like an oscilloscope.
+    The gap samples ahead of idx are blanked as an eraser.
+    Column j is the y data of the j-th line.
+    Writes may hold some channels only, the other columns are left
+    as they are, backfill fills them again when they are shown again.
+    '''
+    def __init__(self, max_length=100, num_channels=13, height=2, gap=0):
+        # Information of the sweep.
+        self.info = {}
+        # Length to display.
+        self.comment('max_length', max_length)
+        # Number of channels.
+        self.comment('num_channels', num_channels)
+        # Height of each channel.
+        self.comment('height', height)
+        # Samples blanked ahead of idx.
+        self.comment('gap', gap)
+        # Bias of every channel, computed once.
+        self.offsets = np.arange(num_channels) * height
+        # Display matrix, starts as flat lines at the biases.
+        self.data = np.zeros((max_length, num_channels)) + self.offsets
+        # Gain and center of every channel,
+        # a sample is shown at (sample - center) * gain + bias.
+        self.gain = np.ones(num_channels)
+        self.center = np.zeros(num_channels)
+        # x data shared by every line.
+        self.x = np.arange(max_length)
+        # Current vertical index.
+        self.idx = 0
+        # Total number of rows ever written.
+        self.total = 0
+
+    @property
+    def row(self):
+        # Row of the display matrix written next.
+        return self.idx
+
+    @property
+    def ahead(self):
+        # Rows changed ahead of row by a write.
+        return self.info['gap']
+
+    def write(self, new_data, channels=None):
+        # Write new_data at idx, biased, with wrap-around.
+        # With channels, new_data holds those columns only.
+        # Return the updated idx.
+        max_length = self.info['max_length']
+        # Only the last max_length samples can be seen.
+        chunk = new_data[-max_length:]
+        n = len(chunk)
+        start = (self.idx + len(new_data) - n) % max_length
+        first = min(n, max_length - start)
+        if channels is None:
+            # Scale and write in two slices, no Python loop over samples.
+            self._scale(chunk[:first], self.data[start:start + first])
+            self._scale(chunk[first:], self.data[:n - first])
+        else:
+            # Scale and scatter the columns of channels.
+            rows = (start + np.arange(n)) % max_length
+            self.data[rows[:, None], channels] = self._shown(chunk, channels)
+        self.idx = (start + n) % max_length
+        self.total += len(new_data)
+        # Blank the eraser gap.
+        if self.info['gap']:
+            self.data[(self.idx + np.arange(self.info['gap']))
+                      % max_length] = np.nan
+        return self.idx
+
+    def _scale(self, samples, out):
+        # Write samples into out, as they are shown.
+        np.subtract(samples, self.center, out=out)
+        out *= self.gain
+        out += self.offsets
+
+    def _shown(self, samples, channels):
+        # Samples of channels, as they are shown.
+        return (samples - self.center[channels]) * self.gain[channels] \
+            + self.offsets[channels]
+
+    def backfill(self, history, channels):
+        # Write history of channels as the rows before idx,
+        # history ends with the last sample written.
+        # The eraser gap is kept.
+        max_length = self.info['max_length']
+        chunk = history[max(len(history) - max_length + self.info['gap'],
+                            0):]
+        rows = (self.idx - len(chunk) + np.arange(len(chunk))) % max_length
+        self.data[rows[:, None], channels] = self._shown(chunk, channels)
+
+    def set_gain(self, gain, center):
+        # Change gain and center of every channel,
+        # the samples already shown are rescaled in place.
+        # Copies, gain may be a view of units of a shared buffer.
+        gain = np.array(gain, dtype=float)
+        self.data -= self.offsets
+        self.data *= gain / self.gain
+        self.data += self.offsets + (self.center - center) * gain
+        self.gain = gain
+        self.center = np.array(center, dtype=float)
+
+    def column(self, j):
+        # View of the j-th channel.
+        return self.data[:, j]
+
+    def comment(self, key, value):
+        # Record information.
+        self.info[key] = value
+
+    def print(self):
+        # Print infomations.
+        print('-' * 80)
+        self.comment('_data_shape', self.data.shape)
+        self.comment('_idx', self.idx)
+        pprint(self.info)
+
+
+class FramePacer():
+    '''
+    This is a deadline based frame pacer.
+    Frames are due every 1 / frame_rate seconds from start,
+    so the pace does not drift with the time spent in each frame.
+    When rendering falls behind, missed deadlines are skipped
+    instead of being drawn in a burst.
+    '''
+    def __init__(self, frame_rate=20, clock=time.monotonic):
+        # Time lag between frames.
+        self.lag = 1 / frame_rate
+        # Monotonic clock in seconds.
+        self.clock = clock
+        # Deadline of the next frame.
+        self.deadline = None
+        # Number of skipped frames.
+        self.skipped = 0
+
+    def start(self):
+        # The first frame is due now.
+        self.deadline = self.clock()
+
+    def next_delay(self):
+        # Move to the next deadline after a frame is done,
+        # return the delay until it in milliseconds.
+        now = self.clock()
+        self.deadline += self.lag
+        if now > self.deadline:
+            # Skip every deadline already missed.
+            missed = int((now - self.deadline) // self.lag) + 1
+            self.skipped += missed
+            self.deadline += missed * self.lag
+        return int((self.deadline - now) * 1000)
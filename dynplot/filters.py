@@ -0,0 +1,246 @@
+# coding: utf-8
+
+import numpy as np
+from pprint import pprint
+try:
+    from scipy.signal import sosfilt
+except ImportError:
+    sosfilt = None
+
+
+def biquad(kind, freq, sample_rate, q=0.7071):
+    # Return one second order section (b0, b1, b2, 1, a1, a2)
+    # of kind lowpass, highpass, bandpass or notch,
+    # from the formulas of the audio EQ cookbook.
+    w = 2 * np.pi * freq / sample_rate
+    cos, alpha = np.cos(w), np.sin(w) / (2 * q)
+    if kind == 'lowpass':
+        b = [(1 - cos) / 2, 1 - cos, (1 - cos) / 2]
+    elif kind == 'highpass':
+        b = [(1 + cos) / 2, -1 - cos, (1 + cos) / 2]
+    elif kind == 'bandpass':
+        b = [alpha, 0, -alpha]
+    elif kind == 'notch':
+        b = [1, -2 * cos, 1]
+    else:
+        raise ValueError('unknown biquad kind %r' % kind)
+    a = [1 + alpha, -2 * cos, 1 - alpha]
+    return np.array(b + a) / a[0]
+
+
+def bandpass(low, high, sample_rate, order=2):
+    # Return sections of a band-pass from low to high Hz,
+    # order highpass and order lowpass biquads.
+    return np.array([biquad('highpass', low, sample_rate)] * order
+                    + [biquad('lowpass', high, sample_rate)] * order)
+
+
+def notch(freq, sample_rate, q=30, harmonics=1):
+    # Return sections of a notch at freq Hz and its first harmonics,
+    # for 50 or 60 Hz mains.
+    return np.array([biquad('notch', freq * k, sample_rate, q)
+                     for k in range(1, harmonics + 1)
+                     if freq * k < sample_rate / 2])
+
+
+class SOSFilter():
+    '''
+    This is a streaming cascade of biquads, second order sections.
+    It filters (samples, channels) chunks, the state of every section
+    and channel is kept between chunks, so chunks of any size give
+    the same output as one long signal.
+    scipy.signal.sosfilt is used if it is installed.
+    Otherwise every section runs as a block state-space product,
+    y = T x + O s, with T and O computed once for block samples,
+    so the recursion over samples is a matrix product across channels.
+    With channels, chunks hold those columns only,
+    only their states move on.
+    '''
+    def __init__(self, sos, num_channels=13, block=64, use_scipy=True):
+        # Information of the filter.
+        self.info = {}
+        # Sections, rows of (b0, b1, b2, 1, a1, a2).
+        self.sos = np.atleast_2d(np.asarray(sos, dtype=float))
+        self.comment('sections', len(self.sos))
+        # Number of channels.
+        self.comment('num_channels', num_channels)
+        # Samples of a block of the NumPy path.
+        self.comment('block', block)
+        # Path used, scipy or numpy.
+        self.comment('path', 'scipy' if use_scipy and sosfilt else 'numpy')
+        # State of every section, (sections, 2, channels), as scipy.
+        self.state = np.zeros((len(self.sos), 2, num_channels))
+        if self.info['path'] == 'numpy':
+            self._blocks = [self._block(s, block) for s in self.sos]
+
+    @staticmethod
+    def _block(section, block):
+        # Block matrices of one section in transposed direct form II,
+        # s[k + 1] = A s[k] + B x[k], y[k] = C s[k] + D x[k].
+        b0, b1, b2, _, a1, a2 = section
+        A = np.array([[-a1, 1], [-a2, 0]])
+        B = np.array([b1 - a1 * b0, b2 - a2 * b0])
+        # Powers of A, from A^0 to A^block.
+        powers = np.empty((block + 1, 2, 2))
+        powers[0] = np.eye(2)
+        for k in range(block):
+            powers[k + 1] = A @ powers[k]
+        # Response of the output to the state, C A^k.
+        O = powers[:block, 0]
+        # Response of the state to one sample, A^k B.
+        H = powers[:block] @ B
+        # Response of the output to the samples, lower triangular.
+        impulse = np.r_[b0, H[:-1, 0]]
+        k = np.arange(block)
+        lag = k[:, None] - k[None, :]
+        T = np.where(lag >= 0, impulse[np.clip(lag, 0, None)], 0)
+        return T, O, H, powers
+
+    def process(self, chunk, channels=None):
+        # Return chunk filtered, and keep the state.
+        chunk = np.asarray(chunk, dtype=float)
+        if len(chunk) == 0:
+            return chunk
+        if channels is not None:
+            # Filter with the states of channels, and put them back.
+            full, self.state = self.state, self.state[:, :, channels]
+            out = self.process(chunk)
+            full[:, :, channels], self.state = self.state, full
+            return out
+        if self.info['path'] == 'scipy':
+            out, self.state = sosfilt(self.sos, chunk, axis=0,
+                                      zi=self.state)
+            return out
+        out = np.empty_like(chunk)
+        block = self.info['block']
+        for begin in range(0, len(chunk), block):
+            x = chunk[begin:begin + block]
+            n = len(x)
+            for j, (T, O, H, powers) in enumerate(self._blocks):
+                state = self.state[j]
+                y = T[:n, :n] @ x + O[:n] @ state
+                self.state[j] = powers[n] @ state + H[n - 1::-1].T @ x
+                x = y
+            out[begin:begin + n] = x
+        return out
+
+    def reset(self, channels=None):
+        # Forget the past signal, of channels if it is not None.
+        if channels is None:
+            self.state.fill(0)
+        else:
+            self.state[:, :, channels] = 0
+
+    def comment(self, key, value):
+        # Record information.
+        self.info[key] = value
+
+    def print(self):
+        # Print infomations.
+        print('-' * 80)
+        pprint(self.info)
+
+
+class FIRDecimator():
+    '''
+    This is a streaming FIR low-pass and decimator.
+    Every factor-th output of the FIR is kept,
+    the last taps - 1 samples and the phase are kept between chunks,
+    so chunks of any size give the same output as one long signal.
+    Only kept outputs are computed, as one product across channels.
+    With channels, chunks hold those columns only,
+    the phase is common to every channel.
+    '''
+    def __init__(self, factor=10, num_channels=13, taps=None):
+        # Information of the decimator.
+        self.info = {}
+        # Decimation factor.
+        self.comment('factor', factor)
+        # Number of channels.
+        self.comment('num_channels', num_channels)
+        # Windowed sinc low-pass at the new Nyquist, if taps is not given.
+        if taps is None:
+            n = np.arange(8 * factor + 1) - 4 * factor
+            taps = np.sinc(n / factor) * np.hamming(len(n))
+            taps /= taps.sum()
+        # Taps, reversed once so outputs are plain dot products.
+        self.taps = np.asarray(taps, dtype=float)
+        self._reversed = self.taps[::-1].copy()
+        self.comment('taps', len(self.taps))
+        # Last taps - 1 samples of the past signal.
+        self._history = np.zeros((len(self.taps) - 1, num_channels))
+        # Samples to skip before the next kept output.
+        self._phase = 0
+
+    def process(self, chunk, channels=None):
+        # Return the decimated and filtered chunk, and keep the state.
+        chunk = np.asarray(chunk, dtype=float)
+        if len(chunk) == 0:
+            return chunk
+        history = self._history if channels is None \
+            else self._history[:, channels]
+        signal = np.concatenate((history, chunk))
+        window = len(self.taps)
+        # Windows ending at every kept sample of chunk.
+        starts = np.arange(self._phase, len(chunk), self.info['factor'])
+        views = np.lib.stride_tricks.sliding_window_view(
+            signal, window, axis=0)
+        out = np.einsum('nct,t->nc', views[starts], self._reversed)
+        self._phase = (self._phase - len(chunk)) % self.info['factor']
+        if channels is None:
+            self._history = signal[len(signal) - window + 1:]
+        else:
+            self._history[:, channels] = signal[len(signal) - window + 1:]
+        return out
+
+    def reset(self, channels=None):
+        # Forget the past signal, of channels if it is not None,
+        # the phase is kept then, the other channels go on with it.
+        if channels is None:
+            self._history.fill(0)
+            self._phase = 0
+        else:
+            self._history[:, channels] = 0
+
+    def comment(self, key, value):
+        # Record information.
+        self.info[key] = value
+
+    def print(self):
+        # Print infomations.
+        print('-' * 80)
+        pprint(self.info)
+
+
+class Chain():
+    '''
+    This is a chain of streaming stages, applied in order.
+    A stage has process(chunk, channels=None) and reset(channels=None),
+    chunks are (samples, channels), every stage keeps its own state,
+    with channels, an index array, chunks hold those columns only
+    and only their states are used.
+    Channels not read do not move on, see Buffer.backfill.
+    A chain set on a cursor filters what the buffer reads through it,
+    see Buffer.cursor.
+    '''
+    def __init__(self, *stages):
+        self.stages = list(stages)
+
+    @property
+    def factor(self):
+        # Decimation of the whole chain.
+        factor = 1
+        for stage in self.stages:
+            factor *= getattr(stage, 'info', {}).get('factor', 1)
+        return factor
+
+    def process(self, chunk, channels=None):
+        # Return chunk through every stage.
+        for stage in self.stages:
+            chunk = stage.process(chunk, channels)
+        return chunk
+
+    def reset(self, channels=None):
+        # Forget the past signal of every stage.
+        for stage in self.stages:
+            stage.reset(channels)
@@ -0,0 +1,168 @@
+# coding: utf-8
+
+import numpy as np
+
+
+class HistoryView():
+    '''
+    This is a zoomable view of the history of a buffer.
+    It holds the min and the max of every channel in every pixel column,
+    from Buffer.summary, scaled and biased into lanes as a Sweep is,
+    so the renderers draw it as they draw a sweep,
+    rows of x and data go min, max, column by column.
+    Zoom and pan change the range of samples shown, never the limits
+    of the axes, the range is mapped to pixel columns here,
+    so the background cached by a BlitManager stays valid
+    and a redraw is a query, a renderer update and a blit.
+    The range shown is text, for a label outside of the figure,
+    as text drawn every redraw costs as much as the traces.
+    The range follows the newest sample, until it is panned back,
+    panning to the newest sample follows again.
+    '''
+    def __init__(self, axe, buffer, height=2, sample_rate=None, pixels=None):
+        # Information of the view.
+        self.info = {}
+        # Buffer kept with levels, see Buffer.keep_summary.
+        self.buffer = buffer
+        num_channels = buffer.info['num_channels']
+        self.comment('num_channels', num_channels)
+        self.comment('height', height)
+        # Seconds are shown if known, samples otherwise.
+        self.comment('sample_rate', sample_rate)
+        # Pixel columns of the axes.
+        if pixels is None:
+            pixels = max(int(axe.bbox.width), 1)
+        self.comment('pixels', pixels)
+        # Gain and center of every channel, in raw units,
+        # a sample is shown at (sample - center) * gain + bias.
+        self.gain = np.array(buffer.scale, dtype=float)
+        self.center = -buffer.offset / buffer.scale
+        self.offsets = np.arange(num_channels) * height
+        # Min and max of every column, NaN where it has no sample.
+        self.x = np.repeat(np.arange(pixels) + 0.5, 2)
+        self.data = np.full((2 * pixels, num_channels), np.nan)
+        # Samples shown, and the absolute end of the range,
+        # None follows the newest sample.
+        self.span = buffer.info['history']
+        self.stop = None
+        # Limits never change, columns and lanes.
+        axe.set_xlim(0, pixels)
+        axe.set_ylim(-1, height * num_channels)
+        axe.set_xticks([])
+
+    @property
+    def following(self):
+        # True while the range follows the newest sample.
+        return self.stop is None
+
+    def column(self, j):
+        # View of the j-th channel.
+        return self.data[:, j]
+
+    def set_gain(self, gain, center):
+        # Change gain and center of every channel, in raw units,
+        # shown from the next update.
+        self.gain = np.array(gain, dtype=float)
+        self.center = np.array(center, dtype=float)
+
+    def _range(self):
+        # Absolute begin and end of the samples shown.
+        total = self.buffer.total
+        stop = total if self.stop is None else min(self.stop, total)
+        return stop - self.span, stop
+
+    def zoom(self, factor, column=None):
+        # Show factor times the samples, keeping the sample
+        # at column where it is, the middle by default.
+        # A live range stays live, on the newest samples.
+        pixels = self.info['pixels']
+        begin, end = self._range()
+        if column is None:
+            column = pixels / 2
+        at = begin + self.span * column / pixels
+        span = int(round(self.span * factor))
+        self.span = min(max(span, 16), self.buffer.info['history'])
+        if self.stop is not None:
+            self._move(int(round(at + self.span * (1 - column / pixels))))
+
+    def pan(self, columns):
+        # Move the range by columns pixel columns, later if positive.
+        self._move(self._range()[1]
+                   + int(round(columns * self.span / self.info['pixels'])))
+
+    def _move(self, stop):
+        # End the range at stop, follow the newest sample past it,
+        # never go before the oldest sample of history.
+        total = self.buffer.total
+        oldest = max(total - self.buffer.info['history'], 0)
+        stop = max(stop, oldest + self.span)
+        self.stop = None if stop >= total else stop
+
+    def update(self):
+        # Refresh min and max of every column from the summary.
+        buffer = self.buffer
+        pixels = self.info['pixels']
+        begin, end = self._range()
+        # Indices of summary count from the oldest sample of history,
+        # a range left behind by the history is cut to it.
+        base = buffer.total - buffer.info['history']
+        x, mins, maxs, _ = buffer.summary(max(begin - base, 0),
+                                          max(end - base, 0), pixels)
+        lo, hi = self._columns((x - begin) * (pixels / self.span),
+                               mins, maxs)
+        self.data[0::2] = (lo - self.center) * self.gain + self.offsets
+        self.data[1::2] = (hi - self.center) * self.gain + self.offsets
+
+    def _columns(self, at, mins, maxs):
+        # Min and max of every column, from bins starting at columns at.
+        pixels = self.info['pixels']
+        lo = np.full((pixels, self.info['num_channels']), np.nan)
+        hi = lo.copy()
+        if len(at) > pixels:
+            # Min of the mins and max of the maxs of every column.
+            cols = np.floor(at).astype(int)
+            first, last = np.searchsorted(cols, (0, pixels))
+            cols = cols[first:last]
+            if len(cols):
+                starts = np.flatnonzero(np.r_[True, cols[1:] != cols[:-1]])
+                lo[cols[starts]] = np.minimum.reduceat(
+                    mins[first:last], starts, axis=0)
+                hi[cols[starts]] = np.maximum.reduceat(
+                    maxs[first:last], starts, axis=0)
+        elif len(at) > 1 and mins is maxs:
+            # Fewer raw samples than columns,
+            # the trace is sampled at the centre of every column.
+            width = at[1] - at[0]
+            pos = np.interp(np.arange(pixels) + 0.5, at + width / 2,
+                            np.arange(len(at)), left=np.nan, right=np.nan)
+            valid = np.flatnonzero(~np.isnan(pos))
+            i = np.minimum(pos[valid].astype(int), len(at) - 2)
+            w = (pos[valid] - i)[:, None]
+            lo[valid] = mins[i] * (1 - w) + mins[i + 1] * w
+            hi[valid] = lo[valid]
+        elif len(at) > 1:
+            # Bins wider than columns, every column shows
+            # the bin it is in, so no min or max is lost.
+            centres = np.arange(pixels) + 0.5
+            i = np.searchsorted(at, centres, side='right') - 1
+            valid = np.flatnonzero(
+                (i >= 0) & (centres < at[-1] + at[1] - at[0]))
+            lo[valid] = mins[i[valid]]
+            hi[valid] = maxs[i[valid]]
+        return lo, hi
+
+    def text(self):
+        # Range shown, in seconds if the sample rate is known.
+        begin, end = self._range()
+        begin = max(begin, 0)
+        sample_rate = self.info['sample_rate']
+        if sample_rate:
+            text = '%.2f s to %.2f s' % (begin / sample_rate,
+                                         end / sample_rate)
+        else:
+            text = 'samples %d to %d' % (begin, end)
+        return text + (', live' if self.stop is None else '')
+
+    def comment(self, key, value):
+        # Record information.
+        self.info[key] = value
@@ -0,0 +1,99 @@
+# coding: utf-8
+
+import numpy as np
+from pprint import pprint
+
+
+class Metrics():
+    '''
+    This is a lightweight collector of display metrics.
+    Every chunk shown is kept with its stamps, in time.monotonic seconds,
+    acquisition and push come from Buffer.stamps,
+    pop, draw and blit are stamped by the display for the frame showing it.
+    Every frame is kept with its begin time and duration.
+    Both are kept in fixed size rings, nothing is allocated per frame.
+    '''
+    # Columns of chunk rows.
+    COLUMNS = ('end', 'acquire', 'push', 'pop', 'draw', 'blit')
+
+    def __init__(self, size=4096):
+        # Size of the rings.
+        self.size = size
+        # Chunk rows and their count.
+        self._chunks = np.full((size, len(self.COLUMNS)), np.nan)
+        self._num_chunks = 0
+        # Frame rows of (begin, duration) and their count.
+        self._frames = np.full((size, 2), np.nan)
+        self._num_frames = 0
+        # Number of dropped frames.
+        self.dropped = 0
+        # Buffer fill level of the last frame, unread / capacity.
+        self.fill = 0.0
+
+    def frame(self, stamps, begin, pop, draw, blit, fill=None):
+        # Record a frame drawn from begin to blit,
+        # showing the chunks of stamps, rows of Buffer.stamps.
+        stamps = stamps[-self.size:]
+        rows = (self._num_chunks + np.arange(len(stamps))) % self.size
+        self._chunks[rows, :3] = stamps
+        self._chunks[rows, 3:] = pop, draw, blit
+        self._num_chunks += len(stamps)
+        self._frames[self._num_frames % self.size] = begin, blit - begin
+        self._num_frames += 1
+        if fill is not None:
+            self.fill = fill
+
+    def drop(self, count):
+        # Record count dropped frames.
+        self.dropped += count
+
+    def latency(self):
+        # Acquisition to pixel latency of the kept chunks, in seconds.
+        return self._chunks[:, 5] - self._chunks[:, 1]
+
+    def summary(self):
+        # Return a dict of latency percentiles, frame time,
+        # achieved fps, dropped frames and fill level.
+        latency = self.latency()
+        latency = latency[~np.isnan(latency)] * 1e3
+        frames = self._frames[~np.isnan(self._frames[:, 0])]
+        out = dict(frames=self._num_frames, dropped=self.dropped,
+                   fill=round(self.fill, 3))
+        if len(latency):
+            for q in [50, 95, 99]:
+                out['latency_p%d_ms' % q] = round(
+                    float(np.percentile(latency, q)), 3)
+        if len(frames):
+            out['frame_ms'] = round(float(frames[:, 1].mean()) * 1e3, 3)
+        if len(frames) > 1:
+            # Frames of the last second kept.
+            begins = np.sort(frames[:, 0])
+            recent = begins[begins >= begins[-1] - 1.0]
+            if len(recent) > 1:
+                out['fps'] = round(float((len(recent) - 1)
+                                         / (recent[-1] - recent[0])), 2)
+        return out
+
+    def text(self):
+        # One line summary for a status panel.
+        out = self.summary()
+        return 'p50 %s / p99 %s ms, %s fps, %s ms/frame, %d dropped, ' \
+            'fill %.0f%%' % (out.get('latency_p50_ms', '-'),
+                             out.get('latency_p99_ms', '-'),
+                             out.get('fps', '-'), out.get('frame_ms', '-'),
+                             out['dropped'], out['fill'] * 100)
+
+    def export_csv(self, path):
+        # Write kept chunk rows, oldest first, with latency in ms.
+        count = min(self._num_chunks, self.size)
+        rows = (self._num_chunks - count + np.arange(count)) % self.size
+        chunks = self._chunks[rows]
+        latency = (chunks[:, 5] - chunks[:, 1])[:, None] * 1e3
+        np.savetxt(path, np.hstack((chunks, latency)), delimiter=',',
+                   header=','.join(self.COLUMNS + ('latency_ms',)),
+                   comments='', fmt='%.6f')
+
+    def print(self):
+        # Print summary.
+        print('-' * 80)
+        pprint(self.summary())
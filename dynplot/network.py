@@ -0,0 +1,302 @@
+# coding: utf-8
+
+'''
+Network ingest of framed binary packets, over UDP or TCP.
+Every packet is a header followed by a float32 block of
+(rows, num_channels) samples, little endian.
+'''
+
+import socket
+import struct
+import threading
+import numpy as np
+from .sources import Source, SyntheticSource
+
+
+# Header of a packet: magic, sequence number, index of the first sample,
+# sender timestamp of the first sample, rows and channels of the block.
+HEADER = struct.Struct('<4sIqdII')
+MAGIC = b'DPLT'
+# Largest UDP payload.
+MAX_DATAGRAM = 65507
+
+
+def max_rows(num_channels):
+    # Most rows of num_channels float32 that fit in one datagram.
+    return (MAX_DATAGRAM - HEADER.size) // (4 * num_channels)
+
+
+def unwrap(seq, near):
+    # The 32 bit sequence number seq, as the integer nearest to near,
+    # so sequence numbers keep counting when the sender wraps around.
+    return near + ((seq - near + 0x80000000) & 0xffffffff) - 0x80000000
+
+
+def pack(packet, seq, first, timestamp, block):
+    # Write a packet of block into the bytearray packet, return its size.
+    rows, num_channels = block.shape
+    HEADER.pack_into(packet, 0, MAGIC, seq & 0xffffffff, first, timestamp,
+                     rows, num_channels)
+    size = HEADER.size + 4 * block.size
+    np.frombuffer(packet, dtype='<f4', count=block.size,
+                  offset=HEADER.size).reshape(block.shape)[:] = block
+    return size
+
+
+class NetworkSource(Source):
+    '''
+    This is a source of framed packets from UDP or TCP.
+    Packets are received with recv_into into preallocated buffers,
+    the chunk returned by read is a view of one of them,
+    it is valid until the next read, push or copy it before.
+    With UDP, up to reorder packets are held back to put them in order,
+    packets older than that are counted as late and dropped,
+    missing ones are counted as lost.
+    Sequence numbers of 32 bits are unwrapped against the expected one,
+    so a stream outlives 2^32 packets.
+    Counters live in info: received, lost, late and lost_samples.
+    The timestamp of a chunk is the one given by the sender.
+    '''
+    def __init__(self, address=('127.0.0.1', 9870), protocol='udp',
+                 sample_rate=1000, num_channels=13, reorder=8,
+                 timeout=0.1):
+        Source.__init__(self, sample_rate, num_channels, dtype='<f4')
+        self.comment('address', address)
+        self.comment('protocol', protocol)
+        self.comment('reorder', reorder)
+        self.comment('received', 0)
+        self.comment('lost', 0)
+        self.comment('late', 0)
+        self.comment('lost_samples', 0)
+        self.timeout = timeout
+        size = HEADER.size + 4 * num_channels * max_rows(num_channels)
+        # Packet being received.
+        self._incoming = bytearray(size)
+        # Slots of packets held back, and their sequence numbers.
+        self._slots = [bytearray(size) for _ in range(reorder)]
+        self._slot_seq = [-1] * reorder
+        # Next sequence number to deliver, and next sample index.
+        self._expected = None
+        self._next_sample = None
+        # Sequence number to skip to, after a packet far ahead.
+        self._target = None
+        self._spare = bytearray(size)
+        self._spare_seq = None
+        self._sock = None
+
+    def start(self):
+        # Open the socket, if it is not open yet.
+        Source.start(self)
+        if self._sock is not None:
+            return
+        if self.info['protocol'] == 'udp':
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+            self._sock.bind(tuple(self.info['address']))
+        else:
+            self._sock = socket.create_connection(tuple(self.info['address']))
+        self._sock.settimeout(self.timeout)
+
+    def close(self):
+        # Close the socket.
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def run(self, callback):
+        try:
+            Source.run(self, callback)
+        finally:
+            self.close()
+
+    def read(self):
+        while self._running:
+            # Skip to the target, delivering what is held back.
+            while self._target is not None:
+                if self._expected == self._target:
+                    self._target = None
+                    self._hold(self._spare, self._spare_seq)
+                    break
+                out = self._take(self._expected)
+                self._expected += 1
+                if out is not None:
+                    return out
+                self.info['lost'] += 1
+            # Deliver the next packet if it is held back.
+            if self._expected is not None:
+                out = self._take(self._expected)
+                if out is not None:
+                    self._expected += 1
+                    return out
+            # Receive a packet.
+            seq = self._receive()
+            if seq is None:
+                continue
+            self.info['received'] += 1
+            if self._expected is None:
+                self._expected = seq
+            seq = unwrap(seq, self._expected)
+            if seq == self._expected:
+                self._expected += 1
+                return self._parse(self._incoming)
+            if seq < self._expected:
+                self.info['late'] += 1
+            elif seq < self._expected + self.info['reorder']:
+                self._hold(self._incoming, seq)
+            else:
+                # Far ahead, keep it aside and skip to make room.
+                self._incoming, self._spare = self._spare, self._incoming
+                self._spare_seq = seq
+                self._target = seq - self.info['reorder'] + 1
+        return None
+
+    def _receive(self):
+        # Receive one packet into _incoming, return its sequence number,
+        # or None on timeout.
+        try:
+            if self.info['protocol'] == 'udp':
+                self._sock.recv_into(self._incoming)
+            else:
+                self._recv_exact(0, HEADER.size)
+                rows, num_channels = HEADER.unpack_from(self._incoming)[4:]
+                self._recv_exact(HEADER.size, 4 * rows * num_channels)
+        except socket.timeout:
+            return None
+        magic, seq = HEADER.unpack_from(self._incoming)[:2]
+        if magic != MAGIC:
+            return None
+        return seq
+
+    def _recv_exact(self, offset, size):
+        # Receive exactly size bytes of a TCP stream at offset of _incoming.
+        view = memoryview(self._incoming)
+        end = offset + size
+        while offset < end:
+            try:
+                n = self._sock.recv_into(view[offset:end])
+            except socket.timeout:
+                if not self._running:
+                    raise
+                continue
+            if n == 0:
+                self._running = False
+                raise socket.timeout()
+            offset += n
+
+    def _hold(self, packet, seq):
+        # Hold a packet of unwrapped sequence seq back in its slot,
+        # by swapping buffers.
+        k = seq % self.info['reorder']
+        if self._slot_seq[k] == seq:
+            self.info['late'] += 1
+            return
+        if packet is self._incoming:
+            self._incoming, self._slots[k] = self._slots[k], self._incoming
+        else:
+            self._spare, self._slots[k] = self._slots[k], self._spare
+        self._slot_seq[k] = seq
+
+    def _take(self, seq):
+        # Parse the held packet of sequence seq, or return None.
+        k = seq % self.info['reorder']
+        if self._slot_seq[k] != seq:
+            return None
+        self._slot_seq[k] = -1
+        return self._parse(self._slots[k])
+
+    def _parse(self, packet):
+        # Return (timestamp, chunk) of a packet, chunk is a view.
+        _, _, first, timestamp, rows, num_channels = HEADER.unpack_from(packet)
+        if self._next_sample is not None and first > self._next_sample:
+            self.info['lost_samples'] += first - self._next_sample
+        self._next_sample = first + rows
+        chunk = np.frombuffer(packet, dtype='<f4', count=rows * num_channels,
+                              offset=HEADER.size)
+        return timestamp, chunk.reshape(rows, num_channels)
+
+
+class ReplayServer():
+    '''
+    This is a localhost stand-in of the acquisition device.
+    It runs a source and sends its chunks as packets,
+    to address over UDP, or to the client connected to address over TCP.
+    drop and swap are probabilities to drop a packet
+    and to swap it with the next one, to exercise loss and reordering.
+    '''
+    def __init__(self, address=('127.0.0.1', 9870), protocol='udp',
+                 source=None, drop=0.0, swap=0.0, seed=None):
+        if source is None:
+            source = SyntheticSource()
+        self.source = source
+        self.address = tuple(address)
+        self.protocol = protocol
+        self.drop = drop
+        self.swap = swap
+        self._random = np.random.default_rng(seed)
+        num_channels = source.info['num_channels']
+        self._rows = max_rows(num_channels)
+        size = HEADER.size + 4 * num_channels * self._rows
+        self._packet = bytearray(size)
+        self._held = bytearray(size)
+        self._held_size = 0
+        self._seq = 0
+        self._first = 0
+        self._sock = None
+        self._client = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        if protocol == 'tcp':
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._sock.bind(self.address)
+            self._sock.listen(1)
+        else:
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def start(self):
+        # Start sending.
+        self._thread.start()
+
+    def stop(self):
+        # Stop sending and close sockets.
+        self.source.stop()
+        self._thread.join()
+
+    def _run(self):
+        if self.protocol == 'tcp':
+            self._client, _ = self._sock.accept()
+        try:
+            self.source.run(self._send_chunk)
+        except OSError:
+            pass
+        finally:
+            if self._client is not None:
+                self._client.close()
+            self._sock.close()
+
+    def _send_chunk(self, timestamp, chunk):
+        # Send chunk as packets of at most _rows rows.
+        rate = self.source.info['sample_rate']
+        for j in range(0, len(chunk), self._rows):
+            block = chunk[j:j + self._rows]
+            size = pack(self._packet, self._seq, self._first,
+                        timestamp + j / rate, block)
+            self._seq += 1
+            self._first += len(block)
+            if self._random.random() < self.drop:
+                continue
+            if not self._held_size and self._random.random() < self.swap:
+                # Hold this packet back, send it after the next one.
+                self._packet, self._held = self._held, self._packet
+                self._held_size = size
+                continue
+            self._send(self._packet, size)
+            if self._held_size:
+                self._send(self._held, self._held_size)
+                self._held_size = 0
+
+    def _send(self, packet, size):
+        view = memoryview(packet)[:size]
+        if self.protocol == 'tcp':
+            self._client.sendall(view)
+        else:
+            self._sock.sendto(view, self.address)
@@ -0,0 +1,123 @@
+# coding: utf-8
+
+'''
+Replay of recordings, as a source.
+'''
+
+import os
+import time
+import threading
+from .sources import Source, Clock
+from .sinks import MemmapReader, ChunkedReader
+
+
+def open_recording(path):
+    # Reader of the recording at path, memmap or chunked.
+    # Chunked recordings have a block index next to them.
+    if os.path.exists(path + '.idx'):
+        return 'chunked', ChunkedReader(path)
+    return 'memmap', MemmapReader(path)
+
+
+class PlaybackSource(Source):
+    '''
+    This is a source replaying a recording of MemmapRecorder or
+    ChunkedRecorder, it takes the place of a live source.
+    Samples are read lazily, a memmap recording through the page cache,
+    a chunked one block by block, so hours of data never sit in RAM.
+    Chunks of chunk_size samples are paced at speed times real time,
+    0.1 to 100, with pace=False they come as fast as they can be read,
+    which makes the file a deterministic benchmark of the display path.
+    seek jumps to a time in seconds through the time index,
+    sample_rate of the header times seconds, and only the blocks
+    touched by the next chunk are read.
+    The recording ends the source, unless loop is set.
+    '''
+    MIN_SPEED, MAX_SPEED = 0.1, 100.0
+
+    def __init__(self, path, speed=1.0, chunk_size=None, start=0.0,
+                 pace=True, loop=False, sample_rate=None):
+        record_format, self.reader = open_recording(path)
+        header = self.reader.info
+        # Old recordings may not know their rate.
+        sample_rate = header.get('sample_rate') or sample_rate
+        if not sample_rate:
+            raise ValueError('%s has no sample_rate, give one.' % path)
+        Source.__init__(self, sample_rate, header['num_channels'],
+                        header['dtype'], header.get('scale'),
+                        header.get('offset'))
+        # Samples of each chunk, about 100 chunks per second by default.
+        if chunk_size is None:
+            chunk_size = max(int(sample_rate) // 100, 1)
+        self.comment('path', path)
+        self.comment('record_format', record_format)
+        self.comment('length', self.reader.length())
+        self.comment('chunk_size', chunk_size)
+        self.comment('pace', pace)
+        self.comment('loop', loop)
+        self.comment('speed', None)
+        # Next sample to play.
+        self.position = 0
+        # seek and set_speed come from other threads than read.
+        self._lock = threading.Lock()
+        self.clock = None
+        self.set_speed(speed)
+        self.seek(start)
+
+    @property
+    def time(self):
+        # Time of the next sample to play, in seconds of the recording.
+        return self.position / self.info['sample_rate']
+
+    @property
+    def duration(self):
+        # Length of the recording in seconds.
+        return self.info['length'] / self.info['sample_rate']
+
+    def set_speed(self, speed):
+        # Play at speed times real time, from now on.
+        if not self.MIN_SPEED <= speed <= self.MAX_SPEED:
+            raise ValueError('speed must be within %g and %g, not %g.'
+                             % (self.MIN_SPEED, self.MAX_SPEED, speed))
+        with self._lock:
+            self.comment('speed', speed)
+            self._restart()
+
+    def seek(self, seconds):
+        # Play from seconds of the recording, from now on.
+        with self._lock:
+            position = int(round(seconds * self.info['sample_rate']))
+            self.position = min(max(position, 0), self.info['length'])
+            self._restart()
+
+    def _restart(self):
+        # Pace again from now on, the lock is held.
+        self.clock = Clock(self.info['sample_rate'] * self.info['speed'])
+        if self._running:
+            self.clock.start()
+
+    def start(self):
+        Source.start(self)
+        with self._lock:
+            self.clock.start()
+
+    def read(self):
+        info = self.info
+        with self._lock:
+            if self.position >= info['length']:
+                # A recording being written may have grown.
+                info['length'] = self.reader.refresh()
+            if self.position >= info['length']:
+                if not info['loop'] or info['length'] == 0:
+                    return None
+                self.position = 0
+                self.clock.start()
+            first = self.position
+            chunk = self.reader.fetch(first, first + info['chunk_size'])
+            self.position += len(chunk)
+            clock = self.clock
+        if info['pace']:
+            timestamp = clock.wait(len(chunk))
+        else:
+            timestamp = time.monotonic()
+        return timestamp, chunk
@@ -0,0 +1,46 @@
+# coding: utf-8
+
+from .displayer import Sweep
+from .renderers import RENDERERS, BlitManager
+
+
+class Plotter():
+    '''
+    This is a sweep plot on a matplotlib axes.
+    Without fig and ax it makes its own figure with pyplot.
+    '''
+    def __init__(self, fig=None, ax=None, frame_rate=20, mode='lines'):
+        if fig is None:
+            import matplotlib.pyplot as plt
+            fig, ax = plt.subplots(1, 1)
+        self.fig = fig
+        self.ax = ax
+        self.frame_rate = frame_rate
+        # Name of renderer, lines, collection or raster.
+        self.mode = mode
+
+    def prepare_plot(self, max_length, channels):
+        self.sweep = Sweep(max_length, channels, height=1)
+        self.data = self.sweep.data
+        self.now = 0
+        self.max_length = max_length
+
+        self.renderer = RENDERERS[self.mode](self.ax, self.sweep)
+        self.lines = self.renderer.artists
+        self.blitter = BlitManager(self.fig.canvas, self.ax, self.lines)
+
+        self.ax.set_xlim([0, max_length-1])
+        self.ax.set_ylim([-1, channels+1])
+        self.ax.set_title('Init')
+
+    def plot(self, data):
+        self.now = self.sweep.write(data)
+        self.renderer.update()
+
+    def update(self, new_data):
+        if new_data is None:
+            return 0
+
+        self.now = self.sweep.write(new_data)
+        self.renderer.update()
+        self.blitter.update()
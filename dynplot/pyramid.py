@@ -0,0 +1,216 @@
+# coding: utf-8
+
+import numpy as np
+from pprint import pprint
+
+
+class Level():
+    '''
+    This is one level of a summary pyramid.
+    Every bin holds min, max and mean of factor samples,
+    bins live in a ring, bin of absolute index b covers
+    samples from b * factor to (b + 1) * factor.
+    The first bin pushed is bin start // factor.
+    '''
+    def __init__(self, factor, ratio, size, num_channels, start=0):
+        # Samples in each bin.
+        self.factor = factor
+        # Items of the lower level in each bin.
+        self.ratio = ratio
+        # Number of bins in the ring.
+        self.size = size
+        # Ring of min, max and mean.
+        self.min = np.zeros((size, num_channels))
+        self.max = np.zeros((size, num_channels))
+        self.mean = np.zeros((size, num_channels))
+        # Total number of complete bins, with the ones before start.
+        self.total = start // factor
+        # Running min, max, sum and size of the bin being filled.
+        self._part = [np.full(num_channels, np.inf),
+                      np.full(num_channels, -np.inf),
+                      np.zeros(num_channels), 0]
+
+    def push(self, mins, maxs, means):
+        # Fold items of the lower level into bins,
+        # return min, max and mean of the completed bins.
+        ratio = self.ratio
+        n, pos = len(mins), 0
+        done = []
+        part = self._part
+        # Complete the bin being filled.
+        if part[3]:
+            pos = min(ratio - part[3], n)
+            self._fold(mins[:pos], maxs[:pos], means[:pos])
+            if part[3] == ratio:
+                done.append((part[0][None].copy(), part[1][None].copy(),
+                             part[2][None] / ratio))
+                self._reset()
+        # Whole bins at once.
+        full = (n - pos) // ratio
+        if full:
+            end = pos + full * ratio
+            shape = (full, ratio, -1)
+            done.append((mins[pos:end].reshape(shape).min(axis=1),
+                         maxs[pos:end].reshape(shape).max(axis=1),
+                         means[pos:end].reshape(shape).mean(axis=1)))
+            pos = end
+        # Start a new bin with the rest.
+        if pos < n:
+            self._fold(mins[pos:], maxs[pos:], means[pos:])
+        if not done:
+            return None
+        if len(done) > 1:
+            done = [tuple(np.concatenate(e) for e in zip(*done))]
+        self._write(*done[0])
+        return done[0]
+
+    def _fold(self, mins, maxs, means):
+        # Fold items into the bin being filled.
+        if len(mins) == 0:
+            return
+        part = self._part
+        np.minimum(part[0], mins.min(axis=0), out=part[0])
+        np.maximum(part[1], maxs.max(axis=0), out=part[1])
+        part[2] += means.sum(axis=0)
+        part[3] += len(mins)
+
+    def _reset(self):
+        # Empty the bin being filled.
+        part = self._part
+        part[0].fill(np.inf)
+        part[1].fill(-np.inf)
+        part[2].fill(0)
+        part[3] = 0
+
+    def _write(self, mins, maxs, means):
+        # Write complete bins into the ring.
+        skip = max(len(mins) - self.size, 0)
+        rows = (self.total + skip + np.arange(len(mins) - skip)) % self.size
+        self.min[rows] = mins[skip:]
+        self.max[rows] = maxs[skip:]
+        self.mean[rows] = means[skip:]
+        self.total += len(mins)
+
+    @property
+    def oldest(self):
+        # Absolute index of the oldest bin still in the ring.
+        return max(self.total - self.size, 0)
+
+    def read(self, begin, end):
+        # Bins of absolute index from begin to end,
+        # clipped to the bins still in the ring.
+        begin = max(begin, self.oldest)
+        end = min(end, self.total)
+        rows = np.arange(begin, max(end, begin)) % self.size
+        return (np.arange(begin, max(end, begin)) * self.factor,
+                self.min[rows], self.max[rows], self.mean[rows])
+
+
+class Pyramid():
+    '''
+    This is a multi-resolution summary of a sample stream.
+    Level k keeps min, max and mean of bins of ratio ** (k + 1) samples.
+    capacity is the length of the raw ring next to it,
+    level k covers capacity * ratio ** k samples, up to history,
+    so every level holds at most capacity / ratio bins,
+    but the coarsest one always covers history,
+    and coarse levels reach far behind the raw ring,
+    an hour of summary needs only minutes of raw samples.
+    Levels are updated incrementally on each push,
+    any time range is served at any zoom in O(pixels),
+    the bins being filled included, so a summary reaches the newest sample.
+    A pyramid may start on a running stream, start is rounded down
+    to a bin of the coarsest level, see skip for samples it never saw.
+    '''
+    def __init__(self, capacity=500, num_channels=13, levels=6, ratio=4,
+                 history=None, start=0):
+        # Information of the pyramid.
+        self.info = {}
+        # Samples of the raw ring.
+        self.comment('capacity', capacity)
+        # Samples covered by the coarse levels, at least capacity.
+        history = capacity if history is None else max(history, capacity)
+        self.comment('history', history)
+        # Number of channels.
+        self.comment('num_channels', num_channels)
+        # Decimation between two levels.
+        self.comment('ratio', ratio)
+        # Levels, from fine to coarse.
+        self.levels = []
+        start = start // ratio ** levels * ratio ** levels
+        for k in range(1, levels + 1):
+            factor = ratio ** k
+            cover = history if k == levels else \
+                min(history, capacity * ratio ** (k - 1))
+            size = int(np.ceil(cover / factor))
+            self.levels.append(Level(factor, ratio, size, num_channels,
+                                     start))
+        self.comment('factors', [e.factor for e in self.levels])
+        # Total number of samples ever pushed, with the ones before start.
+        self.total = start
+
+    def push(self, new_data):
+        # Update every level with new_data.
+        items = (new_data, new_data, new_data)
+        for level in self.levels:
+            items = level.push(*items)
+            if items is None:
+                break
+        self.total += len(new_data)
+
+    def skip(self, n):
+        # Push n lost samples, the bins they fall in hold NaN.
+        gap = np.full((min(n, 65536), self.info['num_channels']), np.nan)
+        while n > 0:
+            self.push(gap[:n])
+            n -= len(gap)
+
+    def query(self, start, stop, pixels=500):
+        # Summary of samples from start to stop, absolute indices,
+        # from the finest level with no more than 2 * pixels bins
+        # that still covers start, the coarsest one otherwise.
+        # Return x, min, max and mean, x is the first sample of each bin,
+        # return None if raw samples of the ring are fine enough.
+        span = stop - start
+        if span <= 2 * pixels and \
+                start >= self.total - self.info['capacity']:
+            return None
+        for k, level in enumerate(self.levels):
+            if span / level.factor <= 2 * pixels and \
+                    max(start, 0) >= level.oldest * level.factor:
+                break
+        out = level.read(start // level.factor, -(-stop // level.factor))
+        # The bin being filled, if the range reaches into it.
+        first = level.total * level.factor
+        if stop > first and self.total > first:
+            pending = self._pending(k)
+            out = tuple(np.concatenate((e, p)) for e, p in
+                        zip(out, ([first],) + pending))
+        return out
+
+    def _pending(self, k):
+        # Min, max and mean of the samples after the last complete bin
+        # of level k, as rows, folded from the bins being filled
+        # of level k and of every level below it.
+        part = self.levels[0]._part
+        mins, maxs = part[0].copy(), part[1].copy()
+        sums, n = part[2].copy(), part[3]
+        for lower, level in zip(self.levels, self.levels[1:k + 1]):
+            part = level._part
+            if part[3]:
+                np.minimum(mins, part[0], out=mins)
+                np.maximum(maxs, part[1], out=maxs)
+                # Items of the level below are means of lower.factor samples.
+                sums += part[2] * lower.factor
+                n += part[3] * lower.factor
+        return mins[None], maxs[None], sums[None] / n
+
+    def comment(self, key, value):
+        # Record information.
+        self.info[key] = value
+
+    def print(self):
+        # Print infomations.
+        print('-' * 80)
+        self.comment('_total', self.total)
+        pprint(self.info)
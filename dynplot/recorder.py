@@ -0,0 +1,179 @@
+# coding: utf-8
+
+'''
+Headless recording, source -> buffer -> sink, without any GUI.
+Only numpy and the standard library are imported,
+never tkinter nor matplotlib, so it starts fast on acquisition nodes.
+The buffer lives in shared memory, a viewer attaches to the running
+recorder by the printed name and shows the live buffer,
+    python -m dynplot.recorder --output session.raw --name live
+    python tkapp_dynamic_plot.py --attach live
+It runs until interrupted, SIGTERM or --seconds.
+'''
+
+import sys
+import time
+import signal
+import argparse
+import threading
+from pprint import pprint
+from .buffer import Buffer
+from .shared import SharedBuffer
+from .sinks import SINKS, SinkThread
+
+
+class Recorder():
+    '''
+    This is the headless pipeline.
+    The source runs on the calling thread and pushes into the buffer,
+    a SinkThread writes the record file through its own cursor.
+    With shared, the buffer is a SharedBuffer of name,
+    any process may attach to it while recording goes on.
+    capacity defaults to 10 seconds of samples.
+    '''
+    def __init__(self, source, path=None, record_format='memmap',
+                 capacity=None, name=None, shared=True):
+        # Information of the recording.
+        self.info = {}
+        sample_rate = source.info['sample_rate']
+        if capacity is None:
+            capacity = int(sample_rate * 10)
+        self.comment('path', path)
+        self.comment('record_format', record_format)
+        self.comment('capacity', capacity)
+        self.comment('shared', shared)
+        self.source = source
+        # Set by stop, a stop may come before the source has started.
+        self._stopping = threading.Event()
+        # Raw samples of the source are stored as they come.
+        units = dict(dtype=source.info['dtype'], scale=source.info['scale'],
+                     offset=source.info['offset'])
+        if shared:
+            self.buffer = SharedBuffer(capacity, source.info['num_channels'],
+                                       name=name, **units)
+            self.comment('name', self.buffer.name)
+        else:
+            self.buffer = Buffer(capacity, source.info['num_channels'],
+                                 **units)
+            self.comment('name', None)
+        # Writer of the record file, if there is one.
+        self.sink = None
+        if path is not None:
+            self.sink = SinkThread(self.buffer, SINKS[record_format](
+                path, num_channels=source.info['num_channels'],
+                dtype=self.buffer.info['dtype'], sample_rate=sample_rate,
+                scale=self.buffer.scale, offset=self.buffer.offset))
+
+    def run(self, seconds=None):
+        # Record until stop, the end of the source, or seconds.
+        timer = None
+        if seconds is not None:
+            timer = threading.Timer(seconds, self.stop)
+            timer.daemon = True
+            timer.start()
+        if self.sink is not None:
+            self.sink.start()
+        self.source.run(self._on_chunk)
+        if timer is not None:
+            timer.cancel()
+
+    def _on_chunk(self, timestamp, chunk):
+        # Called by the source for every chunk.
+        if self._stopping.is_set():
+            self.source.stop()
+            return
+        self.buffer.push(chunk, timestamp)
+
+    def stop(self):
+        # Stop the source, run returns after the current chunk.
+        # Safe to call from a signal handler or another thread.
+        self._stopping.set()
+        self.source.stop()
+
+    def close(self):
+        # Write the rest of the record file, then free the buffer.
+        if self.sink is not None:
+            self.sink.stop()
+        if self.info['shared']:
+            self.buffer.close()
+
+    def comment(self, key, value):
+        # Record information.
+        self.info[key] = value
+
+    def print(self):
+        # Print infomations.
+        print('-' * 80)
+        pprint(self.info)
+
+
+def make_source(args):
+    # Source of the command line arguments.
+    if args.source == 'synthetic':
+        from .sources import SyntheticSource
+        return SyntheticSource(args.rate, args.channels,
+                               chunk_size=args.chunk, dtype=args.dtype)
+    if args.source == 'playback':
+        from .playback import PlaybackSource
+        return PlaybackSource(args.input, args.speed or 1.0, args.chunk,
+                              pace=args.speed > 0)
+    from .network import NetworkSource
+    host, port = args.address.rsplit(':', 1)
+    return NetworkSource((host, int(port)), args.source, args.rate,
+                         args.channels)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--source', default='synthetic',
+                        choices=['synthetic', 'udp', 'tcp', 'playback'])
+    parser.add_argument('--address', default='127.0.0.1:9870',
+                        help='host:port of udp and tcp sources')
+    parser.add_argument('--input', default=None,
+                        help='recording replayed by the playback source')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='speed of playback, 0 plays unpaced')
+    parser.add_argument('--rate', type=int, default=1000,
+                        help='samples per second')
+    parser.add_argument('--channels', type=int, default=13)
+    parser.add_argument('--chunk', type=int, default=None,
+                        help='samples per chunk of synthetic and playback')
+    parser.add_argument('--dtype', default='float64',
+                        help='raw samples of the synthetic source')
+    parser.add_argument('--output', default=None,
+                        help='record file, default records nothing')
+    parser.add_argument('--format', default='memmap', choices=list(SINKS))
+    parser.add_argument('--capacity', type=int, default=None,
+                        help='samples of the buffer, default 10 seconds')
+    parser.add_argument('--name', default=None,
+                        help='shared memory name viewers attach to')
+    parser.add_argument('--private', action='store_true',
+                        help='keep the buffer private, no live attach')
+    parser.add_argument('--seconds', type=float, default=None,
+                        help='stop after seconds, default runs until killed')
+    args = parser.parse_args(argv)
+
+    recorder = Recorder(make_source(args), args.output, args.format,
+                        args.capacity, args.name, not args.private)
+    # Stop cleanly on Ctrl-C and kill, the record file is closed.
+    for signum in [signal.SIGINT, signal.SIGTERM]:
+        signal.signal(signum, lambda *_: recorder.stop())
+    message = 'Recording %d channels at %g Hz' % (
+        recorder.source.info['num_channels'],
+        recorder.source.info['sample_rate'])
+    if recorder.info['name'] is not None:
+        message += ', attach with --attach %s' % recorder.info['name']
+    print(message + '.', file=sys.stderr, flush=True)
+    begin = time.monotonic()
+    try:
+        recorder.run(args.seconds)
+    finally:
+        total = recorder.buffer.total
+        recorder.close()
+    print('Recorded %d samples in %.1f s.' % (total,
+                                               time.monotonic() - begin),
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,388 @@
+# coding: utf-8
+
+import numpy as np
+import matplotlib
+from matplotlib.collections import LineCollection
+from matplotlib.transforms import Bbox
+
+
+class LinesRenderer():
+    '''
+    This is the per-channel renderer.
+    Every channel is one Line2D, refreshed from a column of the sweep.
+    Only the lines of the shown channels are refreshed,
+    visibility is set when the channels change, not every frame.
+    '''
+    def __init__(self, axe, sweep, alpha=0.8):
+        # The sweep to show.
+        self.sweep = sweep
+        # One line for each channel.
+        self.lines = [axe.plot(sweep.x, sweep.column(j), '-', alpha=alpha)[0]
+                      for j in range(sweep.info['num_channels'])]
+        # Every channel is shown at the beginning.
+        self.mask = np.ones(len(self.lines), dtype=bool)
+        self.index = np.arange(len(self.lines))
+
+    @property
+    def artists(self):
+        # Artists to draw every frame.
+        return self.lines
+
+    def set_channels(self, channels):
+        # Show the channels of the index array channels.
+        mask = np.zeros(len(self.lines), dtype=bool)
+        mask[channels] = True
+        for j in np.flatnonzero(mask != self.mask):
+            self.lines[j].set_visible(mask[j])
+        self.mask = mask
+        self.index = np.flatnonzero(mask)
+
+    def set_mask(self, mask):
+        # Show the channels where mask is True.
+        self.set_channels(np.flatnonzero(mask))
+
+    def update(self):
+        # Refresh y data of the shown lines.
+        for j in self.index:
+            self.lines[j].set_ydata(self.sweep.column(j))
+
+
+class CollectionRenderer():
+    '''
+    This is the single artist renderer.
+    Every channel is one segment of a LineCollection,
+    all segments are refreshed from the sweep in one array operation,
+    so the per-artist overhead of matplotlib is paid only once.
+    Only the segments of the shown channels are built.
+    '''
+    def __init__(self, axe, sweep, alpha=0.8):
+        # The sweep to show.
+        self.sweep = sweep
+        num_channels = sweep.info['num_channels']
+        # Colors follow the color cycle, as lines plotted one by one.
+        cycle = matplotlib.rcParams['axes.prop_cycle'].by_key()['color']
+        self.colors = [cycle[j % len(cycle)] for j in range(num_channels)]
+        # The only artist.
+        self.collection = LineCollection([], alpha=alpha)
+        axe.add_collection(self.collection)
+        # Every channel is shown at the beginning.
+        self.set_channels(np.arange(num_channels))
+
+    @property
+    def artists(self):
+        # Artists to draw every frame.
+        return [self.collection]
+
+    def set_channels(self, channels):
+        # Show the channels of the index array channels.
+        # Segment array of the shown channels, (channels, rows, xy).
+        self.index = np.asarray(channels, dtype=int)
+        self.mask = np.zeros(len(self.colors), dtype=bool)
+        self.mask[self.index] = True
+        self.segments = np.empty((len(self.index), len(self.sweep.x), 2))
+        self.segments[:, :, 0] = self.sweep.x
+        self.collection.set_color([self.colors[j] for j in self.index])
+        self.update()
+
+    def set_mask(self, mask):
+        # Show the channels where mask is True.
+        self.set_channels(np.flatnonzero(mask))
+
+    def update(self):
+        # Refresh y data of the shown segments at once.
+        self.segments[:, :, 1] = self.sweep.data[:, self.index].T
+        self.collection.set_segments(self.segments)
+
+
+class RasterRenderer():
+    '''
+    This is the raster renderer.
+    The traces are drawn straight into an RGBA image of the size of
+    the axes in pixels and shown by a single imshow artist.
+    Every channel is one vertical span in every pixel column,
+    from the min to the max of the samples of the column,
+    joined to the last sample of the previous column.
+    Spans are whole pixels and nothing is antialiased,
+    no path is built, so the cost follows pixels and samples
+    instead of matplotlib path processing.
+    '''
+    def __init__(self, axe, sweep, alpha=0.8):
+        # The sweep to show.
+        self.sweep = sweep
+        self.axe = axe
+        num_channels = sweep.info['num_channels']
+        # Colors follow the color cycle, as lines plotted one by one.
+        cycle = matplotlib.rcParams['axes.prop_cycle'].by_key()['color']
+        colors = [cycle[j % len(cycle)] for j in range(num_channels)]
+        # Palette of the image, 0 is the transparent background,
+        # j + 1 is channel j.
+        self.palette = np.zeros((num_channels + 1, 4), dtype=np.uint8)
+        self.palette[1:] = np.round(
+            matplotlib.colors.to_rgba_array(colors, alpha) * 255)
+        # Channel of every pixel, and the image, sized on update.
+        self.labels = np.zeros((1, 1), dtype=np.int16)
+        self.rgba = np.zeros((1, 1, 4), dtype=np.uint8)
+        # The only artist, it always covers the whole axes.
+        self.image = axe.imshow(self.rgba, origin='upper', aspect='auto',
+                                interpolation='nearest',
+                                extent=axe.get_xlim() + axe.get_ylim())
+        # Every channel is shown at the beginning.
+        self.set_channels(np.arange(num_channels))
+
+    @property
+    def artists(self):
+        # Artists to draw every frame.
+        return [self.image]
+
+    def set_channels(self, channels):
+        # Show the channels of the index array channels.
+        self.index = np.asarray(channels, dtype=int)
+        self.mask = np.zeros(len(self.palette) - 1, dtype=bool)
+        self.mask[self.index] = True
+        self.update()
+
+    def set_mask(self, mask):
+        # Show the channels where mask is True.
+        self.set_channels(np.flatnonzero(mask))
+
+    def update(self):
+        # Draw the shown channels into the image.
+        box = self.axe.bbox
+        width = max(int(round(box.width)), 1)
+        height = max(int(round(box.height)), 1)
+        if self.labels.shape != (height, width):
+            self.labels = np.zeros((height, width), dtype=np.int16)
+            self.rgba = np.zeros((height, width, 4), dtype=np.uint8)
+        x0, x1 = self.axe.get_xlim()
+        y0, y1 = self.axe.get_ylim()
+        self.labels.fill(0)
+        if len(self.index):
+            lo, hi = self._columns(width, x0, x1)
+            # Rows of the spans, row 0 is the top of the axes.
+            scale = height / (y1 - y0)
+            with np.errstate(invalid='ignore'):
+                top = np.floor((y1 - hi) * scale)
+                bottom = np.floor((y1 - lo) * scale)
+                shown = (bottom >= 0) & (top < height)
+            self._fill(np.clip(top, 0, height - 1),
+                       np.clip(bottom, 0, height - 1), shown)
+        np.take(self.palette, self.labels, axis=0, out=self.rgba)
+        self.image.set_data(self.rgba)
+        self.image.set_extent((x0, x1, y0, y1))
+
+    def _columns(self, width, x0, x1):
+        # Span of every pixel column, (width, shown channels) lo and hi,
+        # NaN where a column has no sample or an erased one.
+        x = self.sweep.x
+        data = self.sweep.data[:, self.index]
+        scale = width / (x1 - x0)
+        ends = np.full((width, len(self.index)), np.nan)
+        if len(x) < width:
+            # Fewer samples than columns,
+            # the trace is sampled at the centre of every column.
+            centres = x0 + (np.arange(width) + 0.5) / scale
+            pos = np.interp(centres, x, np.arange(len(x)),
+                            left=np.nan, right=np.nan)
+            valid = np.flatnonzero(~np.isnan(pos))
+            i = np.minimum(pos[valid].astype(int), len(x) - 2)
+            w = (pos[valid] - i)[:, None]
+            ends[valid] = data[i] * (1 - w) + data[i + 1] * w
+            lo, hi = ends, ends
+        else:
+            # Min and max of the samples of every column.
+            cols = np.floor((x - x0) * scale).astype(int)
+            first, last = np.searchsorted(cols, (0, width))
+            cols, data = cols[first:last], data[first:last]
+            lo, hi = ends.copy(), ends.copy()
+            if len(cols):
+                starts = np.flatnonzero(np.r_[True, cols[1:] != cols[:-1]])
+                at = cols[starts]
+                lo[at] = np.minimum.reduceat(data, starts, axis=0)
+                hi[at] = np.maximum.reduceat(data, starts, axis=0)
+                ends[at] = data[np.r_[starts[1:], len(cols)] - 1]
+        # Join every column to the last sample of the previous one.
+        before = np.full_like(ends, np.nan)
+        before[1:] = ends[:-1]
+        erased = np.isnan(lo)
+        lo = np.where(erased, np.nan, np.fmin(lo, before))
+        hi = np.where(erased, np.nan, np.fmax(hi, before))
+        return lo, hi
+
+    def _fill(self, top, bottom, shown):
+        # Paint the spans into labels, later channels on top.
+        # Arrays are (columns, channels), flattened channel by channel.
+        top, bottom, shown = top.T, bottom.T, shown.T
+        channel, column = np.nonzero(shown)
+        top = top[shown].astype(np.intp)
+        lengths = bottom[shown].astype(np.intp) - top + 1
+        # Every pixel of every span, in one fancy assignment.
+        offsets = np.arange(lengths.sum()) - np.repeat(
+            np.cumsum(lengths) - lengths, lengths)
+        self.labels[np.repeat(top, lengths) + offsets,
+                    np.repeat(column, lengths)] = np.repeat(
+                        self.index[channel] + 1, lengths)
+
+
+# Renderers by name.
+RENDERERS = dict(
+    lines=LinesRenderer,
+    collection=CollectionRenderer,
+    raster=RasterRenderer,
+)
+
+
+class BlitManager():
+    '''
+    This is a cached-background blitter.
+    The static part of the axes, background, grid and ticks,
+    is drawn once and cached after a full draw,
+    every frame only restores it and draws the animated artists.
+    The cache is dropped on resize, on a change of limits,
+    or by invalidate, for instance after a change of theme,
+    and the next frame is a full draw that caches it again.
+    '''
+    def __init__(self, canvas, axe, artists=()):
+        self.canvas = canvas
+        self.axe = axe
+        self.artists = []
+        # Cached background, None if it must be drawn again.
+        self.background = None
+        for artist in artists:
+            self.add_artist(artist)
+        canvas.mpl_connect('draw_event', self._on_draw)
+        canvas.mpl_connect('resize_event', self.invalidate)
+        axe.callbacks.connect('xlim_changed', self.invalidate)
+        axe.callbacks.connect('ylim_changed', self.invalidate)
+
+    def add_artist(self, artist):
+        # Draw artist every frame, it is not part of the background.
+        artist.set_animated(True)
+        self.artists.append(artist)
+
+    def invalidate(self, *args):
+        # Drop the cached background.
+        self.background = None
+
+    def _on_draw(self, event):
+        # Cache the background after a full draw, then draw the artists.
+        self.background = self.canvas.copy_from_bbox(self.axe.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            self.axe.draw_artist(artist)
+
+    def draw(self):
+        # Draw a new frame into the canvas.
+        if self.background is None:
+            # Full draw, _on_draw caches the background.
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.background)
+            self._draw_artists()
+
+    def blit(self):
+        # Show the drawn frame on screen.
+        self.canvas.blit(self.axe.bbox)
+
+    def update(self):
+        # Draw and show a new frame.
+        self.draw()
+        self.blit()
+
+
+class SweepBlitter(BlitManager):
+    '''
+    This is a dirty-rectangle blitter for sweep displays.
+    Only the x-range of the rows written since the last frame,
+    and the eraser gap ahead of them, is restored, drawn and blitted,
+    the artists are clipped to that strip while they are drawn.
+    So the pixel work of a frame follows the new samples,
+    not the size of the figure.
+    '''
+    def __init__(self, canvas, axe, sweep, artists=(), margin=3):
+        BlitManager.__init__(self, canvas, axe, artists)
+        # The sweep shown by the artists.
+        self.sweep = sweep
+        # Pixels added on both sides of a strip, for line widths.
+        self.margin = margin
+        # Rows written when last drawn.
+        self._total = sweep.total
+        # Strips of the last draw, None means the whole axes.
+        self.strips = None
+        # Redraw every column on the next frame.
+        self._all = False
+
+    def add_artist(self, artist):
+        # Agg snaps a path to pixels only if the whole path is rectilinear,
+        # so a strip could be snapped unlike its neighbours, never snap.
+        artist.set_snap(False)
+        BlitManager.add_artist(self, artist)
+
+    def draw(self):
+        sweep = self.sweep
+        span = sweep.total - self._total
+        if self._all:
+            span, self._all = len(sweep.x), False
+        self._total = sweep.total
+        if self.background is None:
+            self.strips = None
+            BlitManager.draw(self)
+            return
+        num_rows = len(sweep.x)
+        # From the row before the first new row,
+        # to the row after the rows changed ahead of the cursor.
+        begin = sweep.row - span - 1
+        end = sweep.row + sweep.ahead + 1
+        if end - begin >= num_rows:
+            self.strips = [self._strip(0, num_rows)]
+        elif begin < 0:
+            self.strips = [self._strip(begin + num_rows, num_rows),
+                           self._strip(0, end)]
+        elif end > num_rows:
+            self.strips = [self._strip(begin, num_rows),
+                           self._strip(0, end - num_rows)]
+        else:
+            self.strips = [self._strip(begin, end)]
+        for strip in self.strips:
+            self._draw_strip(strip)
+
+    def touch(self):
+        # Every column changed, redraw them all on the next frame,
+        # over the cached background.
+        self._all = True
+
+    def _strip(self, begin, end):
+        # Display bbox of rows from begin to end, full axes height.
+        box = self.axe.bbox
+        x = self.sweep.x
+        to_pixel = self.axe.transData.transform
+        x0 = to_pixel((x[begin], 0))[0] - self.margin
+        x1 = to_pixel((x[end - 1], 0))[0] + self.margin
+        # Strips touching an edge of the data run to the edge of the axes.
+        if begin == 0:
+            x0 = box.x0
+        if end == len(x):
+            x1 = box.x1
+        return Bbox.from_extents(max(np.floor(x0), box.x0), box.y0,
+                                 min(np.ceil(x1), box.x1), box.y1)
+
+    def _draw_strip(self, strip):
+        # Restore the background of strip and draw the artists in it.
+        # The restored columns are inclusive, the clipped ones are not.
+        rx0, ry0, rx1, ry1 = self.background.get_extents()
+        self.canvas.restore_region(
+            self.background, bbox=(strip.x0, ry0, strip.x1 - 1, ry1),
+            xy=(rx0, ry0))
+        for artist in self.artists:
+            clip = artist.get_clip_box()
+            artist.set_clip_box(strip)
+            self.axe.draw_artist(artist)
+            artist.set_clip_box(clip)
+
+    def blit(self):
+        if self.strips is None:
+            BlitManager.blit(self)
+            return
+        for strip in self.strips:
+            self.canvas.blit(strip)
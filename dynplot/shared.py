@@ -0,0 +1,202 @@
+# coding: utf-8
+
+'''
+Acquisition in a separate process, through a shared memory Buffer.
+'''
+
+import threading
+import multiprocessing
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+from .buffer import Buffer
+
+# Counters at the head of the shared memory, as int64.
+TOTAL, WRITING, CAPACITY, NUM_CHANNELS, CHUNKS, DTYPE = range(6)
+NUM_COUNTERS = 6
+
+
+def dtype_code(dtype):
+    # dtype as an int64 counter, its 8 bytes are the dtype string.
+    return int.from_bytes(np.dtype(dtype).str.encode().ljust(8, b'\0'),
+                          'little')
+
+
+def code_dtype(code):
+    # dtype of an int64 counter made by dtype_code.
+    return np.dtype(int(code).to_bytes(8, 'little').rstrip(b'\0').decode())
+
+
+class SharedBuffer(Buffer):
+    '''
+    This is a Buffer living in shared memory.
+    It works as Buffer, one process pushes and other processes
+    attach by name and read through their own cursors, zero-copy.
+    total, _writing and _chunks are int64 counters at the head of
+    the memory, chunk stamps, scale and offset follow,
+    the ring comes last, so samples of any dtype stay aligned.
+    An aligned 8 bytes store is atomic on the platforms we run on,
+    so the handoff documented in Buffer holds across processes.
+    The pyramid is not shared, a process reading summaries
+    keeps its own, see Buffer.keep_summary.
+    '''
+    def __init__(self, capacity=500, num_channels=13, name=None,
+                 dtype='float64', scale=None, offset=None):
+        # Create the shared memory, counters, stamps, units then ring.
+        size = (8 * (NUM_COUNTERS + 3 * self.STAMPS + 2 * num_channels)
+                + capacity * num_channels * np.dtype(dtype).itemsize)
+        self._shm = shared_memory.SharedMemory(name=name, create=True,
+                                               size=size)
+        self._owner = True
+        self._counters = np.ndarray(NUM_COUNTERS, dtype=np.int64,
+                                    buffer=self._shm.buf)
+        self._counters[:] = [0, 0, capacity, num_channels, 0,
+                             dtype_code(dtype)]
+        Buffer.__init__(self, capacity, num_channels, dtype=dtype,
+                        scale=scale, offset=offset)
+        self._stamps.fill(-1)
+
+    @classmethod
+    def attach(cls, name):
+        # Attach to the SharedBuffer of name made by another process.
+        self = cls.__new__(cls)
+        self._shm = shared_memory.SharedMemory(name=name)
+        self._owner = False
+        # Only the creator may unlink it, do not let the tracker do it.
+        resource_tracker.unregister(self._shm._name, 'shared_memory')
+        counters = np.ndarray(NUM_COUNTERS, dtype=np.int64,
+                              buffer=self._shm.buf)
+        # Buffer.__init__ resets the counters, let it reset a scratch copy,
+        # the producer may be pushing right now.
+        self._counters = np.zeros(NUM_COUNTERS, dtype=np.int64)
+        # Units are written again with their own values.
+        num_channels = int(counters[NUM_CHANNELS])
+        units = np.ndarray((2, num_channels), dtype=np.float64,
+                           buffer=self._shm.buf, offset=self._units_offset())
+        Buffer.__init__(self, int(counters[CAPACITY]), num_channels,
+                        dtype=code_dtype(counters[DTYPE]),
+                        scale=units[0].copy(), offset=units[1].copy())
+        self._counters = counters
+        # Readers start from now on.
+        self._pop_cursor.position = self.total
+        return self
+
+    @property
+    def name(self):
+        # Name to attach with.
+        return self._shm.name
+
+    def _units_offset(self):
+        # Offset of scale and offset, after counters and stamps.
+        return 8 * (NUM_COUNTERS + 3 * self.STAMPS)
+
+    def _allocate(self, capacity, num_channels, dtype):
+        # Ring at the end.
+        return np.ndarray((capacity, num_channels), dtype=dtype,
+                          buffer=self._shm.buf,
+                          offset=self._units_offset() + 16 * num_channels)
+
+    def _allocate_units(self, num_channels):
+        # Scale and offset after the stamps.
+        return np.ndarray((2, num_channels), dtype=np.float64,
+                          buffer=self._shm.buf, offset=self._units_offset())
+
+    def _allocate_stamps(self, size):
+        # Stamps right after the counters.
+        return np.ndarray((size, 3), dtype=np.float64, buffer=self._shm.buf,
+                          offset=8 * NUM_COUNTERS)
+
+    @property
+    def total(self):
+        return int(self._counters[TOTAL])
+
+    @total.setter
+    def total(self, value):
+        self._counters[TOTAL] = value
+
+    @property
+    def _writing(self):
+        return int(self._counters[WRITING])
+
+    @_writing.setter
+    def _writing(self, value):
+        self._counters[WRITING] = value
+
+    @property
+    def _chunks(self):
+        return int(self._counters[CHUNKS])
+
+    @_chunks.setter
+    def _chunks(self, value):
+        self._counters[CHUNKS] = value
+
+    def close(self):
+        # Detach, the views must not be used anymore.
+        self._ring = self._stamps = self._counters = self.units = None
+        self._shm.close()
+        if self._owner:
+            # An attached process of the same tracker may have unregistered
+            # it, register again so that unlink finds it.
+            resource_tracker.register(self._shm._name, 'shared_memory')
+            self._shm.unlink()
+
+
+def push(buffer, timestamp, chunk):
+    # Default callback of the acquisition, push chunk.
+    buffer.push(chunk, timestamp)
+
+
+def _acquire(name, source, stopping, record_on, callback):
+    # Body of the acquisition process.
+    buffer = SharedBuffer.attach(name)
+
+    # Stop the source when stopping is set.
+    def watch():
+        stopping.wait()
+        source.stop()
+    threading.Thread(target=watch, daemon=True).start()
+
+    def on_chunk(timestamp, chunk):
+        if record_on.is_set():
+            callback(buffer, timestamp, chunk)
+    source.run(on_chunk)
+    buffer.close()
+
+
+class AcquisitionProcess():
+    '''
+    This is a source running in its own process.
+    Chunks are pushed into a SharedBuffer while record is on,
+    the GUI process reads self.buffer with the usual Buffer API,
+    so heavy drawing never holds the GIL of the acquisition.
+    callback(buffer, timestamp, chunk) does the push,
+    it must be a picklable function.
+    '''
+    def __init__(self, source, capacity=500, callback=push):
+        # The buffer takes dtype, scale and offset of the source.
+        self.buffer = SharedBuffer(capacity, source.info['num_channels'],
+                                   dtype=source.info.get('dtype', 'float64'),
+                                   scale=source.info.get('scale'),
+                                   offset=source.info.get('offset'))
+        self._stopping = multiprocessing.Event()
+        self._record_on = multiprocessing.Event()
+        self._process = multiprocessing.Process(
+            target=_acquire, daemon=True,
+            args=(self.buffer.name, source, self._stopping, self._record_on,
+                  callback))
+
+    def start(self):
+        # Start the process.
+        self._process.start()
+
+    def set_record(self, on):
+        # Toggle pushing into the buffer.
+        if on:
+            self._record_on.set()
+        else:
+            self._record_on.clear()
+
+    def stop(self):
+        # Stop the process and free the shared memory.
+        self._stopping.set()
+        self._process.join()
+        self.buffer.close()
@@ -0,0 +1,445 @@
+# coding: utf-8
+
+import os
+import bz2
+import json
+import lzma
+import time
+import zlib
+import threading
+import numpy as np
+from pprint import pprint
+
+
+def write_header(path, info):
+    # Replace the JSON header at path in one step,
+    # so readers never see a half written header.
+    temp = path + '.tmp'
+    with open(temp, 'w') as f:
+        json.dump(info, f)
+    os.replace(temp, path)
+
+
+def read_header(path):
+    # Read the JSON header at path.
+    with open(path) as f:
+        return json.load(f)
+
+
+def units(values):
+    # Scale or offset of every channel for a header, None stays None.
+    if values is None:
+        return None
+    return np.asarray(values, dtype=float).tolist()
+
+
+class MemmapRecorder():
+    '''
+    This is a recording sink on a memory mapped file.
+    Samples are appended to a raw binary file of (length, num_channels),
+    the file is preallocated and grows by doubling.
+    A JSON header next to it, path + '.json', tells dtype, shape,
+    scale and offset of raw samples, and how many samples are valid,
+    it is published on flush.
+    Nothing here calls fsync, the operating system writes pages back,
+    so the recording thread never waits for the disk.
+    '''
+    def __init__(self, path, num_channels=13, dtype='float64',
+                 sample_rate=None, allocate=65536, scale=None, offset=None):
+        # Information of the recording, it is the header.
+        self.info = {}
+        self.path = path
+        self.comment('num_channels', num_channels)
+        self.comment('dtype', np.dtype(dtype).str)
+        self.comment('sample_rate', sample_rate)
+        # A raw sample r is worth r * scale + offset, None for plain values.
+        self.comment('scale', units(scale))
+        self.comment('offset', units(offset))
+        # Number of valid samples.
+        self.comment('length', 0)
+        # Number of allocated samples.
+        self.comment('allocated', 0)
+        # Create the file and its header.
+        open(path, 'wb').close()
+        self._map = None
+        self._grow(allocate)
+        self.flush()
+
+    def _grow(self, allocated):
+        # Grow the file to allocated samples and map it again.
+        self._map = None
+        row = self.info['num_channels'] * np.dtype(self.info['dtype']).itemsize
+        with open(self.path, 'r+b') as f:
+            f.truncate(allocated * row)
+        self._map = np.memmap(self.path, dtype=self.info['dtype'], mode='r+',
+                              shape=(allocated, self.info['num_channels']))
+        self.comment('allocated', allocated)
+
+    def write(self, chunk):
+        # Append chunk to the file.
+        length = self.info['length']
+        end = length + len(chunk)
+        if end > self.info['allocated']:
+            self._grow(max(end, 2 * self.info['allocated']))
+        self._map[length:end] = chunk
+        self.comment('length', end)
+
+    def flush(self):
+        # Publish the valid length to readers, no fsync.
+        write_header(self.path + '.json', self.info)
+
+    def sync(self):
+        # Write pages back to the disk, it may block.
+        self._map.flush()
+        self.flush()
+
+    def close(self):
+        # Shrink the file to the valid samples and publish the header.
+        if self._map is None:
+            return
+        self._map.flush()
+        self._map = None
+        row = self.info['num_channels'] * np.dtype(self.info['dtype']).itemsize
+        with open(self.path, 'r+b') as f:
+            f.truncate(self.info['length'] * row)
+        self.comment('allocated', self.info['length'])
+        self.flush()
+
+    def comment(self, key, value):
+        # Record information.
+        self.info[key] = value
+
+    def print(self):
+        # Print infomations.
+        print('-' * 80)
+        pprint(self.info)
+
+
+class MemmapReader():
+    '''
+    This is a reader of a memmap recording.
+    It can be opened while the recording is being written,
+    length and fetch follow the last published header.
+    Samples are read from the page cache lazily,
+    hours of data can be scrolled without holding them in RAM.
+    '''
+    def __init__(self, path):
+        self.path = path
+        self.info = {}
+        self._map = None
+        self.refresh()
+
+    def refresh(self):
+        # Read the header again, map the file again if it grew.
+        info = read_header(self.path + '.json')
+        if self._map is None or info['allocated'] != self.info['allocated']:
+            self._map = None
+            if info['allocated']:
+                self._map = np.memmap(
+                    self.path, dtype=info['dtype'], mode='r',
+                    shape=(info['allocated'], info['num_channels']))
+        self.info = info
+        return info['length']
+
+    def length(self):
+        # Number of valid samples when last refreshed.
+        return self.info['length']
+
+    def fetch(self, start=0, stop=None):
+        # Samples from start to stop, a view of the file.
+        start, stop, _ = slice(start, stop).indices(self.info['length'])
+        if self._map is None or stop <= start:
+            return np.zeros((0, self.info['num_channels']),
+                            dtype=self.info['dtype'])
+        return self._map[start:stop]
+
+
+# Codecs of chunked recordings, name: (compress, decompress).
+CODECS = dict(
+    none=(bytes, bytes),
+    zlib=(lambda e: zlib.compress(e, 1), zlib.decompress),
+    bz2=(lambda e: bz2.compress(e, 1), bz2.decompress),
+    lzma=(lambda e: lzma.compress(e, preset=1), lzma.decompress),
+)
+
+# Row of the chunk index, one for each block.
+INDEX_DTYPE = np.dtype([('start', '<i8'), ('rows', '<i8'), ('offset', '<i8'),
+                        ('nbytes', '<i8'), ('time', '<f8')])
+
+
+def encode(chunk, shuffle=True, delta=True):
+    # Filter a chunk into bytes that compress well, losslessly.
+    # delta xors every sample with the previous one,
+    # shuffle groups the bytes of the same significance together.
+    raw = np.ascontiguousarray(chunk)
+    bits = raw.view('u%d' % raw.dtype.itemsize)
+    if delta:
+        bits = np.concatenate((bits[:1], bits[1:] ^ bits[:-1]))
+    out = bits.view(np.uint8).reshape(-1, raw.dtype.itemsize)
+    if shuffle:
+        out = out.T
+    return np.ascontiguousarray(out).tobytes()
+
+
+def decode(data, dtype, num_channels, shuffle=True, delta=True):
+    # Inverse of encode.
+    dtype = np.dtype(dtype)
+    out = np.frombuffer(data, dtype=np.uint8)
+    if shuffle:
+        out = out.reshape(dtype.itemsize, -1).T
+    bits = np.ascontiguousarray(out).view('u%d' % dtype.itemsize).ravel()
+    if delta:
+        bits = np.bitwise_xor.accumulate(bits.reshape(-1, num_channels))
+    return bits.view(dtype).reshape(-1, num_channels)
+
+
+class ChunkedRecorder():
+    '''
+    This is a compressed recording sink.
+    Samples are staged into blocks of chunk_size samples,
+    every block is filtered, compressed and appended to the file at path.
+    A binary index at path + '.idx' tells the first sample, size,
+    offset and time of every block, and the JSON header at
+    path + '.json' tells how to decode them.
+    Compression is done in write, run it on a SinkThread
+    so that it never stalls the recording thread.
+    '''
+    def __init__(self, path, num_channels=13, dtype='float64',
+                 sample_rate=None, chunk_size=4096, codec='zlib',
+                 shuffle=True, delta=True, scale=None, offset=None):
+        # Information of the recording, it is the header.
+        self.info = {}
+        self.path = path
+        self.comment('num_channels', num_channels)
+        self.comment('dtype', np.dtype(dtype).str)
+        self.comment('sample_rate', sample_rate)
+        # A raw sample r is worth r * scale + offset, None for plain values.
+        self.comment('scale', units(scale))
+        self.comment('offset', units(offset))
+        self.comment('chunk_size', chunk_size)
+        self.comment('codec', codec)
+        self.comment('shuffle', shuffle)
+        self.comment('delta', delta)
+        # Number of samples written into blocks.
+        self.comment('length', 0)
+        # Sizes before and after compression.
+        self.comment('raw_bytes', 0)
+        self.comment('compressed_bytes', 0)
+        # Staging block.
+        self._stage = np.zeros((chunk_size, num_channels), dtype=dtype)
+        self._staged = 0
+        self._compress = CODECS[codec][0]
+        self._begin = time.time()
+        self._file = open(path, 'wb')
+        self._index = open(path + '.idx', 'wb')
+        self.flush()
+
+    def write(self, chunk):
+        # Stage chunk, compress every full block.
+        chunk_size = self.info['chunk_size']
+        pos = 0
+        while pos < len(chunk):
+            n = min(chunk_size - self._staged, len(chunk) - pos)
+            self._stage[self._staged:self._staged + n] = chunk[pos:pos + n]
+            self._staged += n
+            pos += n
+            if self._staged == chunk_size:
+                self._write_block(self._stage)
+                self._staged = 0
+
+    def _write_block(self, block):
+        # Compress and append a block, then its index row.
+        data = self._compress(encode(block, self.info['shuffle'],
+                                     self.info['delta']))
+        start = self.info['length']
+        if self.info['sample_rate']:
+            seconds = start / self.info['sample_rate']
+        else:
+            seconds = time.time() - self._begin
+        row = np.array([(start, len(block), self._file.tell(), len(data),
+                         seconds)], dtype=INDEX_DTYPE)
+        self._file.write(data)
+        self._index.write(row.tobytes())
+        self.comment('length', start + len(block))
+        self.comment('raw_bytes', self.info['raw_bytes'] + block.nbytes)
+        self.comment('compressed_bytes',
+                     self.info['compressed_bytes'] + len(data))
+
+    def flush(self):
+        # Publish written blocks to readers, no fsync.
+        self._file.flush()
+        self._index.flush()
+        write_header(self.path + '.json', self.info)
+
+    def sync(self):
+        # Write back to the disk, it may block.
+        self.flush()
+        os.fsync(self._file.fileno())
+        os.fsync(self._index.fileno())
+
+    def close(self):
+        # Write the staged samples as a last short block.
+        if self._file.closed:
+            return
+        if self._staged:
+            self._write_block(self._stage[:self._staged])
+            self._staged = 0
+        self.flush()
+        self._file.close()
+        self._index.close()
+
+    def comment(self, key, value):
+        # Record information.
+        self.info[key] = value
+
+    def print(self):
+        # Print infomations.
+        print('-' * 80)
+        pprint(self.info)
+
+
+class ChunkedReader():
+    '''
+    This is a reader of a chunked recording.
+    Only the blocks touched by a request are read and decompressed.
+    It can be opened while the recording is being written,
+    refresh follows the blocks written so far.
+    '''
+    def __init__(self, path):
+        self.path = path
+        # Last decompressed block, as (k, samples),
+        # sequential reads of small chunks decompress every block once.
+        self._cached = (-1, None)
+        self.refresh()
+
+    def refresh(self):
+        # Read the header and the index again.
+        self.info = read_header(self.path + '.json')
+        self._decompress = CODECS[self.info['codec']][1]
+        index = np.fromfile(self.path + '.idx', dtype=np.uint8)
+        # Ignore a row being written.
+        whole = len(index) // INDEX_DTYPE.itemsize * INDEX_DTYPE.itemsize
+        self.index = index[:whole].view(INDEX_DTYPE)
+        return self.length()
+
+    def length(self):
+        # Number of samples in the blocks.
+        if len(self.index) == 0:
+            return 0
+        return int(self.index['start'][-1] + self.index['rows'][-1])
+
+    def _read_block(self, k):
+        # Decompress the k-th block, blocks never change once written.
+        if self._cached[0] == k:
+            return self._cached[1]
+        row = self.index[k]
+        with open(self.path, 'rb') as f:
+            f.seek(row['offset'])
+            data = f.read(row['nbytes'])
+        block = decode(self._decompress(data), self.info['dtype'],
+                       self.info['num_channels'], self.info['shuffle'],
+                       self.info['delta'])
+        # Read-only, views of it are handed out.
+        block.flags.writeable = False
+        self._cached = (k, block)
+        return block
+
+    def fetch(self, start=0, stop=None):
+        # Samples from start to stop, decompressing touched blocks only.
+        start, stop, _ = slice(start, stop).indices(self.length())
+        if stop <= start:
+            return np.zeros((0, self.info['num_channels']),
+                            dtype=self.info['dtype'])
+        starts = self.index['start']
+        first = np.searchsorted(starts, start, side='right') - 1
+        last = np.searchsorted(starts, stop, side='left')
+        if last - first == 1:
+            # Within one block, a view of it.
+            out = self._read_block(first)
+        else:
+            out = np.concatenate([self._read_block(k)
+                                  for k in range(first, last)])
+        offset = starts[first]
+        return out[start - offset:stop - offset]
+
+    def fetch_time(self, begin, end):
+        # Samples from begin to end seconds, through the time index.
+        times = self.index['time']
+        if self.info['sample_rate']:
+            rate = self.info['sample_rate']
+            return self.fetch(int(begin * rate), int(np.ceil(end * rate)))
+        first = max(np.searchsorted(times, begin, side='right') - 1, 0)
+        last = np.searchsorted(times, end, side='left')
+        if last <= first:
+            return self.fetch(0, 0)
+        stop = int(self.index['start'][last - 1]
+                   + self.index['rows'][last - 1])
+        return self.fetch(int(self.index['start'][first]), stop)
+
+
+class SinkThread():
+    '''
+    This is a background writer of a buffer into a sink.
+    It reads the buffer through its own cursor, so the recording
+    thread only pushes and never waits for the sink.
+    The sink is flushed every interval seconds.
+    With a chain of filters, the filtered view is written instead of
+    raw samples, they are plain values, so the sink must store floats,
+    its header gets the sample rate divided by chain.factor
+    and neither scale nor offset.
+    '''
+    def __init__(self, buffer, sink, interval=0.05, name='sink', chain=None):
+        if chain is not None:
+            # Filtered values would be truncated by an integer sink.
+            if np.dtype(sink.info['dtype']).kind != 'f':
+                raise ValueError('A chain writes floats, not %s.'
+                                 % np.dtype(sink.info['dtype']).name)
+            sample_rate = sink.info['sample_rate']
+            if sample_rate is not None:
+                sink.comment('sample_rate', sample_rate / chain.factor)
+            sink.comment('scale', None)
+            sink.comment('offset', None)
+            sink.flush()
+        self.buffer = buffer
+        self.sink = sink
+        self.interval = interval
+        self.cursor = buffer.cursor(name, chain)
+        self._running = False
+        self._thread = threading.Thread(target=self._run, name=name,
+                                        daemon=True)
+
+    @property
+    def overruns(self):
+        # Samples overwritten in the buffer before they were written.
+        return self.cursor.overrun
+
+    def start(self):
+        # Start writing.
+        self._running = True
+        self._thread.start()
+
+    def stop(self):
+        # Write what is left, close the sink.
+        self._running = False
+        self._thread.join()
+        self.sink.close()
+
+    def _drain(self):
+        # Write every new sample into the sink.
+        new_data = self.buffer.read_since(self.cursor)
+        if len(new_data):
+            self.sink.write(new_data)
+
+    def _run(self):
+        while self._running:
+            self._drain()
+            self.sink.flush()
+            time.sleep(self.interval)
+        self._drain()
+
+
+# Recording sinks by name.
+SINKS = dict(
+    memmap=MemmapRecorder,
+    chunked=ChunkedRecorder,
+)
@@ -0,0 +1,172 @@
+# coding: utf-8
+
+import time
+import numpy as np
+from pprint import pprint
+
+
+class Clock():
+    '''
+    This is a drift-free sample clock on time.monotonic.
+    Sample n is due at start + n / sample_rate,
+    waits are computed against that ideal timeline,
+    so the time spent between waits never accumulates as drift.
+    '''
+    def __init__(self, sample_rate):
+        self.sample_rate = sample_rate
+        # Time of sample 0.
+        self.begin = None
+        # Number of samples already due.
+        self.count = 0
+
+    def start(self):
+        # Sample 0 is due now.
+        self.begin = time.monotonic()
+        self.count = 0
+
+    def timestamp(self, n):
+        # Due time of the n-th sample.
+        return self.begin + n / self.sample_rate
+
+    def wait(self, n):
+        # Wait until n more samples are due,
+        # return the due time of the first of them.
+        first = self.count
+        self.count += n
+        # The chunk is complete when its last sample is due.
+        ahead = self.timestamp(self.count - 1) - time.monotonic()
+        if ahead > 0:
+            time.sleep(ahead)
+        return self.timestamp(first)
+
+
+class Source():
+    '''
+    This is the base of data sources.
+    read pulls the next chunk, waiting until it is due,
+    and returns (timestamp, chunk), or None when the source ends.
+    run calls callback(timestamp, chunk) for every chunk until stop.
+    timestamp is the time.monotonic time of the first sample of chunk.
+    Chunks are raw samples of dtype, a raw sample r is worth
+    r * scale + offset, scale and offset are None for plain values.
+    '''
+    def __init__(self, sample_rate=1000, num_channels=13, dtype='float64',
+                 scale=None, offset=None):
+        # Information of the source.
+        self.info = {}
+        # Samples per second.
+        self.comment('sample_rate', sample_rate)
+        # Number of channels.
+        self.comment('num_channels', num_channels)
+        # Type of raw samples, with scale and offset of every channel.
+        self.comment('dtype', np.dtype(dtype).str)
+        self.comment('scale', scale)
+        self.comment('offset', offset)
+        self._running = False
+
+    def start(self):
+        # Start producing.
+        self._running = True
+
+    def stop(self):
+        # Stop producing, run returns after the current chunk.
+        self._running = False
+
+    def read(self):
+        # Return (timestamp, chunk) or None.
+        raise NotImplementedError
+
+    def run(self, callback):
+        # Feed callback until stop or the end of the source.
+        self.start()
+        while self._running:
+            out = self.read()
+            if out is None:
+                break
+            callback(*out)
+        self._running = False
+
+    def comment(self, key, value):
+        # Record information.
+        self.info[key] = value
+
+    def print(self):
+        # Print infomations.
+        print('-' * 80)
+        pprint(self.info)
+
+
+class SyntheticSource(Source):
+    '''
+    This is a local synthetic source, sine + noise + spikes.
+    Channel j is a sine of frequency freq * (j + 1),
+    with gaussian noise and spikes of spike_rate per second.
+    Chunks of chunk_size samples are paced by a drift-free Clock,
+    with pace=False chunks come as fast as they can be made.
+    An integer dtype makes counts of an acquisition board,
+    scale defaults to the full range over the largest count.
+    '''
+    def __init__(self, sample_rate=1000, num_channels=13, chunk_size=None,
+                 freq=1.0, amplitude=0.5, noise=0.2, spike_rate=0.5,
+                 spike=1.5, pace=True, seed=None, dtype='float64',
+                 scale=None):
+        dtype = np.dtype(dtype)
+        if dtype.kind == 'i' and scale is None:
+            scale = (amplitude + spike + 5 * noise) / np.iinfo(dtype).max
+        Source.__init__(self, sample_rate, num_channels, dtype, scale)
+        # Samples of each chunk, about 100 chunks per second by default.
+        if chunk_size is None:
+            chunk_size = max(sample_rate // 100, 1)
+        self.comment('chunk_size', chunk_size)
+        self.comment('freq', freq)
+        self.comment('amplitude', amplitude)
+        self.comment('noise', noise)
+        self.comment('spike_rate', spike_rate)
+        self.comment('spike', spike)
+        self.comment('pace', pace)
+        self.clock = Clock(sample_rate)
+        self._random = np.random.default_rng(seed)
+        # Angular step of every channel per sample.
+        self._omega = 2 * np.pi * freq * np.arange(1, num_channels + 1) \
+            / sample_rate
+        # Sample index of every row of a chunk.
+        self._steps = np.arange(chunk_size)[:, None]
+
+    def start(self):
+        Source.start(self)
+        self.clock.start()
+
+    def read(self):
+        info = self.info
+        first = self.clock.count
+        if info['pace']:
+            timestamp = self.clock.wait(info['chunk_size'])
+        else:
+            self.clock.count += info['chunk_size']
+            timestamp = self.clock.timestamp(first)
+        # Phase is taken modulo one turn to keep precision over hours.
+        phase = np.mod(first * self._omega, 2 * np.pi)
+        chunk = np.sin(self._steps * self._omega + phase)
+        chunk *= info['amplitude']
+        chunk += self._random.standard_normal(chunk.shape) * info['noise']
+        # Spikes, on random samples and channels.
+        count = self._random.poisson(info['spike_rate'] * chunk.size
+                                     / info['sample_rate'])
+        if count:
+            rows = self._random.integers(0, chunk.shape[0], count)
+            cols = self._random.integers(0, chunk.shape[1], count)
+            chunk[rows, cols] += info['spike']
+        # Counts, or values of a narrower float.
+        if info['scale'] is not None:
+            chunk /= info['scale']
+            if np.dtype(info['dtype']).kind == 'i':
+                limits = np.iinfo(info['dtype'])
+                np.clip(np.round(chunk, out=chunk), limits.min, limits.max,
+                        out=chunk)
+        return timestamp, chunk.astype(info['dtype'], copy=False)
+
+
+# Data sources by name.
+SOURCES = dict(
+    synthetic=SyntheticSource,
+)
@@ -0,0 +1,215 @@
+# coding: utf-8
+
+import numpy as np
+from pprint import pprint
+
+
+class RunningStats():
+    '''
+    This is a running min, max and RMS of every channel over a window.
+    Samples are folded into blocks of block samples,
+    a ring of block summaries covers the window,
+    so push costs O(new samples) and a query O(window / block),
+    and the window is never scanned again.
+    The window is the last whole blocks covering window samples,
+    plus the block being filled.
+    Pushes may hold some channels only, the blocks of the other
+    channels are left empty, so they fade out of the window
+    and AutoGain leaves them alone.
+    '''
+    def __init__(self, window=1000, num_channels=13, block=None):
+        # Information of the statistics.
+        self.info = {}
+        # Length of the window, in samples.
+        self.comment('window', window)
+        # Number of channels.
+        self.comment('num_channels', num_channels)
+        # Samples in each block, the window is cut in about 64 blocks.
+        if block is None:
+            block = max(int(np.ceil(window / 64)), 1)
+        self.comment('block', block)
+        # Number of blocks in the ring.
+        num_blocks = int(np.ceil(window / block))
+        self.comment('num_blocks', num_blocks)
+        # Ring of min, max and sum of squares of blocks,
+        # empty blocks are neutral.
+        self._min = np.full((num_blocks, num_channels), np.inf)
+        self._max = np.full((num_blocks, num_channels), -np.inf)
+        self._sumsq = np.zeros((num_blocks, num_channels))
+        # Total number of complete blocks.
+        self.total = 0
+        # Running min, max, sum of squares and size of the block being filled.
+        self._part_min = np.full(num_channels, np.inf)
+        self._part_max = np.full(num_channels, -np.inf)
+        self._part_sumsq = np.zeros(num_channels)
+        self._part_n = 0
+
+    def push(self, new_data, channels=None):
+        # Fold new_data into the blocks.
+        # With channels, new_data holds those columns only.
+        block = self.info['block']
+        cols = slice(None) if channels is None else channels
+        n, pos = len(new_data), 0
+        # Complete the block being filled.
+        if self._part_n:
+            pos = min(block - self._part_n, n)
+            self._fold(new_data[:pos], cols)
+            if self._part_n == block:
+                self._commit(self._part_min[None, cols],
+                             self._part_max[None, cols],
+                             self._part_sumsq[None, cols], channels)
+                self._reset()
+        # Whole blocks of new_data at once.
+        full = (n - pos) // block
+        if full:
+            chunk = new_data[pos:pos + full * block].reshape(full, block, -1)
+            self._commit(chunk.min(axis=1), chunk.max(axis=1),
+                         np.square(chunk, dtype=float).sum(axis=1), channels)
+            pos += full * block
+        # Start a new block with the rest.
+        if pos < n:
+            self._fold(new_data[pos:], cols)
+
+    def _fold(self, chunk, cols=slice(None)):
+        # Fold chunk into the block being filled, in columns cols.
+        if len(chunk) == 0:
+            return
+        self._part_min[cols] = np.minimum(self._part_min[cols],
+                                          chunk.min(axis=0))
+        self._part_max[cols] = np.maximum(self._part_max[cols],
+                                          chunk.max(axis=0))
+        self._part_sumsq[cols] += np.square(chunk, dtype=float).sum(axis=0)
+        self._part_n += len(chunk)
+
+    def _reset(self):
+        # Empty the block being filled.
+        self._part_min.fill(np.inf)
+        self._part_max.fill(-np.inf)
+        self._part_sumsq.fill(0)
+        self._part_n = 0
+
+    def _commit(self, mins, maxs, sumsqs, channels=None):
+        # Write complete blocks into the ring,
+        # of channels if it is not None, the others are empty.
+        num_blocks = self.info['num_blocks']
+        # Only the last num_blocks blocks are kept.
+        skip = max(len(mins) - num_blocks, 0)
+        rows = (self.total + skip + np.arange(len(mins) - skip)) % num_blocks
+        if channels is None:
+            self._min[rows] = mins[skip:]
+            self._max[rows] = maxs[skip:]
+            self._sumsq[rows] = sumsqs[skip:]
+        else:
+            self._min[rows] = np.inf
+            self._max[rows] = -np.inf
+            self._sumsq[rows] = 0
+            self._min[rows[:, None], channels] = mins[skip:]
+            self._max[rows[:, None], channels] = maxs[skip:]
+            self._sumsq[rows[:, None], channels] = sumsqs[skip:]
+        self.total += len(mins)
+
+    def count(self):
+        # Number of samples in the window.
+        return (min(self.total, self.info['num_blocks']) * self.info['block']
+                + self._part_n)
+
+    def min(self):
+        # Min of every channel, inf if the window is empty.
+        return np.minimum(self._min.min(axis=0), self._part_min)
+
+    def max(self):
+        # Max of every channel, -inf if the window is empty.
+        return np.maximum(self._max.max(axis=0), self._part_max)
+
+    def rms(self):
+        # Root mean square of every channel, 0 if the window is empty.
+        sumsq = self._sumsq.sum(axis=0) + self._part_sumsq
+        return np.sqrt(sumsq / max(self.count(), 1))
+
+    def comment(self, key, value):
+        # Record information.
+        self.info[key] = value
+
+    def print(self):
+        # Print infomations.
+        print('-' * 80)
+        self.comment('_count', self.count())
+        pprint(self.info)
+
+
+class AutoGain():
+    '''
+    This is an automatic gain of every channel of a sweep.
+    Every channel owns a lane of height around its bias,
+    the gain and center fit its min and max into fill of the lane.
+    They only change when a channel overflows its lane,
+    or uses less than fill / tolerance of it,
+    so they stay still while the signal stays in between.
+    '''
+    def __init__(self, height=2, fill=0.8, tolerance=2.0):
+        # Height of each lane.
+        self.height = height
+        # Part of the lane a channel is fitted into.
+        self.fill = fill
+        # Shrink of a channel tolerated before it is fitted again.
+        self.tolerance = tolerance
+
+    def update(self, stats, gain, center):
+        # Return new gain and center of every channel,
+        # or None if no channel must change.
+        lo, hi = stats.min(), stats.max()
+        span = hi - lo
+        # Extent of every channel on screen, around its bias.
+        top = (hi - center) * gain
+        bottom = (lo - center) * gain
+        half = self.height / 2
+        change = ((top > half) | (bottom < -half)
+                  | (span * gain < self.fill * self.height / self.tolerance))
+        # Flat or empty channels keep their gain.
+        change &= np.isfinite(span) & (span > 0)
+        if not change.any():
+            return None
+        gain, center = gain.copy(), center.copy()
+        gain[change] = self.fill * self.height / span[change]
+        center[change] = (hi[change] + lo[change]) / 2
+        return gain, center
+
+
+class Limits():
+    '''
+    This is a hysteresis of axis limits.
+    Limits grow at once, with margin, when data leaves them,
+    and shrink only when data used less than shrink of them
+    for hold updates in a row,
+    so the background is not invalidated every frame.
+    '''
+    def __init__(self, margin=0.1, shrink=0.5, hold=20):
+        # Margin added on both sides, as a part of the data range.
+        self.margin = margin
+        # Part of the limits data must fill, before they shrink.
+        self.shrink = shrink
+        # Updates in a row before the limits shrink.
+        self.hold = hold
+        # Current limits, None before the first update.
+        self.limits = None
+        # Updates in a row with data under shrink of the limits.
+        self._under = 0
+
+    def update(self, lo, hi):
+        # Return new limits for data from lo to hi,
+        # or None if the current ones stay.
+        if hi <= lo:
+            lo, hi = lo - 0.5, hi + 0.5
+        if self.limits is not None:
+            low, high = self.limits
+            if low <= lo and hi <= high:
+                if hi - lo >= self.shrink * (high - low):
+                    self._under = 0
+                    return None
+                self._under += 1
+                if self._under < self.hold:
+                    return None
+        pad = (hi - lo) * self.margin
+        self.limits = (lo - pad, hi + pad)
+        self._under = 0
+        return self.limits
@@ -1,66 +1,17 @@
 # coding: utf-8
 
-import numpy as np
-from pprint import pprint
-import matplotlib.pyplot as plt
+'''
+Compatibility module, the toolbox lives in the dynplot package.
+Plotter is imported on first use, so importing Buffer from here
+does not import matplotlib.
+'''
 
+from dynplot.buffer import to_float, Cursor, Buffer
 
-class Buffer():
-    '''
-    This is a data buffer.
-    '''
-    def __init__(self, capacity=500, num_channels=13):
-        # Information of the buffer.
-        self.info = {}
-        # Capacity of the buffer.
-        self.comment('capacity', capacity)
-        # Number of channels.
-        self.comment('num_channels', num_channels)
-        # Initialize buffer with capacity and num_channels.
-        self.data = np.zeros((capacity, num_channels))
-        # Initialize new_data.
-        # new_data stores the lastest pushed data.
-        self.new_data = None
 
-    def push(self, new_data):
-        # Push new_data into the buffer.
-        # Use FIFO protocol to pervent the buffer exceeding capacity.
-        # Temporary concatenate self.data and new_data.
-        self.data = np.concatenate((self.data, new_data))
-        # Shrink buffer back to its capacity.
-        self.data = self.data[-self.info['capacity']:]
-        # Storage new_data.
-        self.new_data = new_data
-
-    def pop(self):
-        # Pop new_data since it storages lastest pushed data.
-        if self.new_data is None:
-            # If new_data is None, return None.
-            return None
-        # Set temporary variable out for new_data.
-        out = self.new_data
-        # Clear new_data.
-        self.new_data = None
-        # Return out.
-        return out
-
-    def fetch(self, start=0, stop=None):
-        # Peek buffered data from start to stop.
-        return self.data[start:stop]
-
-    def length(self):
-        # Return current length of the buffer.
-        return len(self.data)
-
-    def comment(self, key, value):
-        # Record information.
-        self.info[key] = value
-
-    def print(self):
-        # Print infomations.
-        print('-' * 80)
-        # _shape refers current shape of the buffered data and new data.
-        self.comment('_data_shape', self.data.shape)
-        self.comment('_new_data_shape', self.new_data.shape)
-        # Print updated infomations.
-        pprint(self.info)
+def __getattr__(name):
+    # Plotter, on first use.
+    if name == 'Plotter':
+        from dynplot.plotter import Plotter
+        return Plotter
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
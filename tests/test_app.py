@@ -0,0 +1,94 @@
+# coding: utf-8
+
+import os
+import time
+import pytest
+import numpy as np
+from dynplot.app import App
+from dynplot.sources import SyntheticSource
+from dynplot.sinks import MemmapRecorder
+from dynplot.playback import PlaybackSource
+
+
+def params(**kwargs):
+    # App with its parameters only, no Tk root is needed.
+    app = App.__new__(App)
+    args = dict(frame_rate=20, record_rate=30, num_channels=17,
+                renderer='collection', max_length=100, record_path=None,
+                record_format='memmap', source=None, acquisition='thread',
+                status=False, autogain=False, chain=None, attach=None,
+                sink_latency=5, history=600)
+    args.update(kwargs)
+    app.init_params(**args)
+    return app
+
+
+def test_buffer_takes_the_channels_of_the_source():
+    source = SyntheticSource(1000, num_channels=64, chunk_size=10,
+                             pace=False)
+    app = params(source=source)
+    buffer = app.recorder_info['buffer']
+    assert buffer.info['num_channels'] == 64
+    assert len(app.displayer_info['channels']) == 64
+    # The record thread pushes chunks of the source.
+    app.recorder_info['record_on'] = True
+    source.start()
+    app._on_chunk(*source.read())
+    assert buffer.total == 10
+
+
+def test_buffer_keeps_a_summary_of_history():
+    source = SyntheticSource(1000, num_channels=4, pace=False)
+    app = params(source=source, history=60)
+    buffer = app.recorder_info['buffer']
+    assert buffer.info['levels'] == App.LEVELS
+    assert buffer.info['history'] == 60000
+
+
+def test_default_source_has_num_channels():
+    app = params(num_channels=5)
+    assert app.recorder_info['buffer'].info['num_channels'] == 5
+
+
+def test_ring_holds_the_sink_latency():
+    source = SyntheticSource(10000, num_channels=4, pace=False)
+    app = params(source=source, sink_latency=2)
+    assert app.recorder_info['buffer'].info['capacity'] == 20000
+    # Slow sources keep the smallest ring.
+    app = params(num_channels=4)
+    assert app.recorder_info['buffer'].info['capacity'] == 500
+
+
+def test_keys_seek_and_speed_playback(tmp_path):
+    path = os.path.join(str(tmp_path), 'session.raw')
+    sink = MemmapRecorder(path, 3, sample_rate=100)
+    sink.write(np.zeros((6000, 3)))
+    sink.close()
+    app = params(source=PlaybackSource(path))
+    source = app.recorder_info['source']
+
+    class Key():
+        def __init__(self, key):
+            self.key = key
+
+    app.on_key_event(Key('right'))
+    assert source.time == 5
+    app.on_key_event(Key('up'))
+    assert source.info['speed'] == 2
+
+
+def test_app_records_a_source_of_other_channels():
+    tk = pytest.importorskip('tkinter')
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip('no display')
+    source = SyntheticSource(300, num_channels=5, chunk_size=3)
+    app = App(root, source=source)
+    app._toggle_record()
+    deadline = time.monotonic() + 1
+    while time.monotonic() < deadline:
+        root.update()
+        time.sleep(0.01)
+    assert app.recorder_info['buffer'].total > 0
+    app._quit()
@@ -0,0 +1,95 @@
+# coding: utf-8
+
+import sys
+import threading
+import numpy as np
+from dynplot.buffer import Buffer
+
+
+def numbered(first, size, num_channels):
+    # Samples carrying their absolute index in every channel.
+    return np.repeat(np.arange(first, first + size, dtype=float)[:, None],
+                     num_channels, axis=1)
+
+
+def test_overrun_counts_the_lost_samples():
+    buffer = Buffer(100, 3)
+    cursor = buffer.cursor('slow')
+    buffer.push(numbered(0, 30, 3))
+    buffer.push(numbered(30, 220, 3))
+    batch = buffer.read_since(cursor)
+    assert cursor.overrun == 150
+    assert np.array_equal(batch[:, 0], np.arange(150, 250))
+    buffer.push(numbered(250, 10, 3))
+    assert np.array_equal(buffer.read_since(cursor)[:, 0],
+                          np.arange(250, 260))
+    assert cursor.overrun == 150
+
+
+def test_samples_overwritten_during_a_read_are_dropped():
+    buffer = Buffer(100, 3)
+    cursor = buffer.cursor('slow')
+    buffer.push(numbered(0, 250, 3))
+    copy = buffer._slice
+
+    def pushed_during_copy(*args):
+        # The writer overwrites the oldest samples before they are copied.
+        buffer._slice = copy
+        buffer.push(numbered(250, 10, 3))
+        return copy(*args)
+
+    buffer._slice = pushed_during_copy
+    batch = buffer.read_since(cursor)
+    assert np.array_equal(batch[:, 0], np.arange(160, 250))
+    assert (batch == batch[:, :1]).all()
+    assert cursor.overrun == 160
+    assert np.array_equal(buffer.read_since(cursor)[:, 0],
+                          np.arange(250, 260))
+
+
+def test_concurrent_writer_tears_nothing():
+    # A small ring and a writer as fast as it can go,
+    # the reader stalls once so that it certainly falls behind.
+    capacity, num_channels, chunk_size, num_chunks = 64, 4, 3, 20000
+    buffer = Buffer(capacity, num_channels)
+    cursor = buffer.cursor('stress')
+    done = threading.Event()
+    errors = []
+
+    def produce():
+        for j in range(num_chunks):
+            buffer.push(numbered(j * chunk_size, chunk_size, num_channels))
+        done.set()
+
+    # Switch threads often, so the writer runs in the middle of reads.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    writer = threading.Thread(target=produce)
+    writer.start()
+    received = 0
+    stalled = False
+    while True:
+        finished = done.is_set()
+        expected = cursor.position
+        batch = buffer.read_since(cursor)
+        if len(batch):
+            first = cursor.position - len(batch)
+            # Consecutive samples after any overrun, never torn.
+            if not (np.array_equal(batch[:, 0],
+                                   np.arange(first, cursor.position))
+                    and (batch == batch[:, :1]).all()
+                    and first >= expected):
+                errors.append((expected, first, cursor.position))
+            received += len(batch)
+        if not stalled:
+            while not done.is_set() and \
+                    buffer.total < cursor.position + 4 * capacity:
+                pass
+            stalled = True
+        if finished:
+            break
+    writer.join()
+    sys.setswitchinterval(interval)
+    assert errors == []
+    assert cursor.overrun > 0
+    assert received + cursor.overrun == buffer.total == chunk_size * num_chunks
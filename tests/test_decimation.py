@@ -0,0 +1,31 @@
+# coding: utf-8
+
+import numpy as np
+from dynplot.buffer import Buffer
+from dynplot.filters import Chain, FIRDecimator
+from dynplot.decimation import EnvelopeSweep
+
+
+def test_empty_chunk_keeps_the_bin_being_filled():
+    sweep = EnvelopeSweep(max_length=1000, num_channels=3, pixels=100)
+    sweep.write(np.ones((4, 3)))
+    assert sweep._part_n == 4
+    before = sweep.data.copy()
+    sweep.write(np.zeros((0, 3)))
+    sweep.write(np.zeros((0, 2)), np.array([0, 2]))
+    assert sweep._part_n == 4
+    assert np.array_equal(sweep.data, before)
+
+
+def test_decimating_cursor_may_read_nothing():
+    # A chain holds samples back until a whole decimation block has come.
+    buffer = Buffer(100, 3)
+    cursor = buffer.cursor('display', Chain(FIRDecimator(10, 3)))
+    sweep = EnvelopeSweep(max_length=1000, num_channels=3, pixels=100)
+    buffer.push(np.ones((12, 3)))
+    sweep.write(buffer.read_since(cursor))
+    buffer.push(np.ones((3, 3)))
+    new_data = buffer.read_since(cursor)
+    assert len(new_data) == 0
+    sweep.write(new_data)
+    assert sweep._part_n == 2
@@ -0,0 +1,17 @@
+# coding: utf-8
+
+import numpy as np
+from dynplot.displayer import Sweep
+from dynplot.decimation import EnvelopeSweep
+
+
+def test_gain_is_a_copy():
+    # Gain given as a view, as units of a shared buffer are.
+    units = np.ones((2, 3))
+    for sweep in [Sweep(100, 3), EnvelopeSweep(1000, 3, pixels=100)]:
+        sweep.set_gain(units[0], units[1])
+        assert not np.shares_memory(sweep.gain, units)
+        assert not np.shares_memory(sweep.center, units)
+        units[0] = 2
+        assert np.array_equal(sweep.gain, [1, 1, 1])
+        units[0] = 1
@@ -0,0 +1,85 @@
+# coding: utf-8
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from dynplot.buffer import Buffer
+from dynplot.history import HistoryView
+from dynplot.renderers import RasterRenderer, BlitManager
+
+
+def setup(total=100000, capacity=10000):
+    # History of a ramp on 2 channels, drawn on Agg.
+    buffer = Buffer(capacity, 2, levels=6, history=total)
+    for begin in range(0, total, 1000):
+        chunk = np.arange(begin, begin + 1000, dtype=float)[:, None]
+        buffer.push(chunk.repeat(2, axis=1))
+        buffer.summarize()
+    fig, axe = plt.subplots(1, 1, figsize=(5, 2), dpi=100)
+    view = HistoryView(axe, buffer, sample_rate=1000, pixels=400)
+    renderer = RasterRenderer(axe, view)
+    manager = BlitManager(fig.canvas, axe, renderer.artists)
+    return buffer, view, manager, fig
+
+
+def shown(view):
+    # Min and max of the columns of channel 0, as the gain is 1.
+    values = view.column(0)
+    return values[~np.isnan(values)]
+
+
+def test_view_follows_the_newest_sample():
+    buffer, view, manager, fig = setup()
+    view.update()
+    values = shown(view)
+    assert values.min() == 0 and values.max() == 99999
+    assert view.text().endswith('live')
+    # The raster renderer paints both channels.
+    renderer = RasterRenderer(manager.axe, view)
+    assert set(np.unique(renderer.labels)) == {0, 1, 2}
+    plt.close(fig)
+
+
+def test_zoom_and_pan_keep_the_background():
+    buffer, view, manager, fig = setup()
+    view.update()
+    manager.update()
+    assert manager.background is not None
+    limits = manager.axe.get_xlim()
+    # A live range zooms on the newest samples.
+    view.zoom(1 / 8)
+    assert view.span == 12500 and view.following
+    # Pan back by 100 columns.
+    view.pan(-100)
+    assert view.stop == 100000 - 3125
+    # Zoom in around the middle, the sample there stays.
+    view.zoom(1 / 2)
+    assert view.stop == 100000 - 3125 - 3125
+    view.update()
+    values = shown(view)
+    assert values.min() >= 100000 - 3125 - 9375 - 16
+    assert values.max() <= view.stop + 16
+    # Limits never change, the cached background is kept.
+    assert manager.axe.get_xlim() == limits
+    assert manager.background is not None
+    manager.update()
+    # Panning past the newest sample follows again.
+    view.pan(10000)
+    assert view.following
+    plt.close(fig)
+
+
+def test_zoomed_in_view_shows_raw_samples():
+    buffer, view, manager, fig = setup()
+    for _ in range(12):
+        view.zoom(0.5)
+    view.update()
+    # Raw samples of the ring, sampled at every column,
+    # min and max are the sample.
+    values = shown(view)
+    assert len(values) >= 2 * 360
+    assert np.array_equal(values[::2], values[1::2])
+    assert np.all(np.diff(values[::2]) > 0)
+    assert values[0] >= 100000 - view.span and values[-1] <= 99999
+    plt.close(fig)
@@ -0,0 +1,122 @@
+# coding: utf-8
+
+import time
+import socket
+import threading
+import numpy as np
+from dynplot.sources import Source
+from dynplot.network import (NetworkSource, ReplayServer, HEADER, pack,
+                             unwrap, max_rows)
+
+
+class Counting(Source):
+    # Chunks of sizes samples, every channel holds the sample index.
+    # tail is called before the last chunks, to send them cleanly.
+    def __init__(self, sizes, num_channels=2, tail=None, clean=0):
+        Source.__init__(self, 1000, num_channels, 'float32')
+        self.sizes = list(sizes)
+        self.tail = tail
+        self.clean = clean
+        self.sent = 0
+
+    def read(self):
+        if not self.sizes:
+            return None
+        if len(self.sizes) == self.clean and self.tail is not None:
+            self.tail()
+        size = self.sizes.pop(0)
+        chunk = np.arange(self.sent, self.sent + size, dtype='float32')
+        self.sent += size
+        return 0.0, np.repeat(chunk[:, None], self.info['num_channels'], 1)
+
+
+def receive(source):
+    # Run source on a thread, return its delivered indices and the thread.
+    delivered = []
+    thread = threading.Thread(target=source.run, args=(
+        lambda timestamp, chunk: delivered.append(chunk[:, 0].copy()),))
+    thread.start()
+    return delivered, thread
+
+
+def test_unwrap_counts_past_2_32():
+    assert unwrap(5, 2 ** 32 - 3) == 2 ** 32 + 5
+    assert unwrap(2 ** 32 - 1, 2 ** 32 + 2) == 2 ** 32 - 1
+    assert unwrap(7, 9) == 7
+
+
+def test_sequence_wraps_around():
+    # reorder does not divide 2^32, slots must follow unwrapped numbers.
+    source = NetworkSource(('127.0.0.1', 0), 'udp', num_channels=2,
+                           reorder=5)
+    source.start()
+    address = source._sock.getsockname()
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    packet = bytearray(HEADER.size + 8 * max_rows(2))
+    order = [2 ** 32 - 3, 2 ** 32 - 1, 2 ** 32 - 2, 0, 2, 1, 3]
+    for seq in order:
+        j = (seq + 3) % 2 ** 32
+        block = np.full((2, 2), j, dtype='<f4')
+        size = pack(packet, seq, 2 * j, 0.0, block)
+        sender.sendto(memoryview(packet)[:size], address)
+    chunks = [source.read()[1][:, 0].copy() for _ in order]
+    sender.close()
+    source.close()
+    assert np.array_equal(np.concatenate(chunks), np.repeat(np.arange(7), 2))
+    assert source.info['received'] == 7
+    assert source.info['late'] == source.info['lost'] == 0
+    assert source.info['lost_samples'] == 0
+
+
+def test_udp_loss_and_reorder_are_counted():
+    reorder, num_chunks = 8, 2000
+    source = NetworkSource(('127.0.0.1', 0), 'udp', num_channels=2,
+                           reorder=reorder)
+    source.start()
+    server = ReplayServer(source._sock.getsockname(), 'udp', drop=0.05,
+                          swap=0.1, seed=1)
+
+    def tail():
+        # Nothing is lost in the last packets, so none stays held back.
+        server.drop = server.swap = 0.0
+
+    counting = Counting([7] * num_chunks, tail=tail, clean=reorder + 2)
+    server.source = counting
+    delivered, thread = receive(source)
+    server.start()
+    # The server ends with the last chunk of the source.
+    server._thread.join()
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and \
+            sum(map(len, delivered)) + source.info['lost_samples'] \
+            < counting.sent:
+        time.sleep(0.01)
+    source.stop()
+    thread.join()
+    info = source.info
+    assert info['lost'] > 0 and info['late'] == 0
+    assert info['received'] + info['lost'] == num_chunks
+    samples = np.concatenate(delivered)
+    assert len(samples) + info['lost_samples'] == counting.sent
+    # In order, each sample at most once.
+    assert (np.diff(samples) > 0).all()
+
+
+def test_tcp_framing():
+    # Chunks of every size, packets are cut anywhere by the stream.
+    sizes = np.random.default_rng(0).integers(1, 300, 500)
+    counting = Counting(sizes, num_channels=3)
+    server = ReplayServer(('127.0.0.1', 0), 'tcp', source=counting)
+    source = NetworkSource(server._sock.getsockname(), 'tcp',
+                           num_channels=3)
+    server.start()
+    source.start()
+    delivered, thread = receive(source)
+    # The server closes the stream at the end, run returns.
+    thread.join(10)
+    server.stop()
+    assert not thread.is_alive()
+    samples = np.concatenate(delivered)
+    assert np.array_equal(samples, np.arange(sizes.sum()))
+    assert source.info['received'] == len(sizes)
+    assert source.info['lost'] == source.info['lost_samples'] == 0
@@ -0,0 +1,58 @@
+# coding: utf-8
+
+import numpy as np
+from dynplot.buffer import Buffer
+from dynplot.pyramid import Pyramid
+
+
+def ramp(begin, end):
+    # One channel holding the sample index.
+    return np.arange(begin, end, dtype=float)[:, None]
+
+
+def test_empty_push_keeps_the_bin_being_filled():
+    pyramid = Pyramid(1000, 2, levels=2)
+    pyramid.push(np.arange(6.0)[:, None].repeat(2, axis=1))
+    pyramid.push(np.zeros((0, 2)))
+    pyramid.push(np.arange(6.0, 16.0)[:, None].repeat(2, axis=1))
+    level = pyramid.levels[0]
+    assert level.total == 4
+    assert np.array_equal(level.min[:4, 0], [0, 4, 8, 12])
+    assert np.array_equal(level.max[:4, 0], [3, 7, 11, 15])
+
+
+def test_summary_reaches_the_newest_sample():
+    buffer = Buffer(100000, 1, levels=6)
+    buffer.push(ramp(0, 100000 - 192))
+    x, mins, maxs, means = buffer.summary(pixels=100)
+    # The last bin is the one being filled, up to the newest sample.
+    assert maxs[-1, 0] == buffer.total - 1
+    assert x[-1] > buffer.total - 1024
+    assert mins[0, 0] == 0
+    # Means of the bin being filled weigh every sample.
+    assert means[-1, 0] == np.mean(np.arange(x[-1], buffer.total))
+
+
+def test_summary_covers_history_behind_the_ring():
+    buffer = Buffer(100, 1, levels=4, history=10000)
+    for begin in range(0, 10000, 50):
+        buffer.push(ramp(begin, begin + 50))
+        buffer.summarize()
+    x, mins, maxs, _ = buffer.summary(pixels=50)
+    assert x[0] == 0 and mins[0, 0] == 0
+    assert maxs[-1, 0] == 9999
+    assert not np.isnan(mins).any()
+    # Recent short ranges are raw samples of the ring.
+    x, mins, maxs, _ = buffer.summary(-20, None)
+    assert np.array_equal(x, np.arange(9980, 10000))
+    assert np.array_equal(mins[:, 0], x)
+
+
+def test_late_summary_marks_lost_samples():
+    # The pyramid starts on a bin of 16 samples, before the oldest one.
+    buffer = Buffer(100, 1, levels=2)
+    buffer.push(ramp(0, 1000))
+    x, mins, maxs, _ = buffer.summary(pixels=10)
+    assert x[0] == 896 and np.isnan(mins[0, 0])
+    assert x[-1] == 992 and maxs[-1, 0] == 999
+    assert np.array_equal(mins[1:, 0], x[1:])
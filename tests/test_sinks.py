@@ -0,0 +1,119 @@
+# coding: utf-8
+
+import os
+import numpy as np
+import pytest
+from dynplot.buffer import Buffer
+from dynplot.filters import Chain, FIRDecimator
+from dynplot.sinks import (MemmapRecorder, MemmapReader, SinkThread,
+                           ChunkedRecorder, ChunkedReader, CODECS,
+                           encode, decode)
+
+
+def samples(dtype, rows=1000, num_channels=3, seed=0):
+    # Random walk of dtype, with the extreme values of the type.
+    dtype = np.dtype(dtype)
+    walk = np.random.RandomState(seed).randn(rows, num_channels).cumsum(0)
+    if dtype.kind == 'i':
+        out = (walk * 100).astype(dtype)
+        out[0] = np.iinfo(dtype).min
+        out[1] = np.iinfo(dtype).max
+    else:
+        out = walk.astype(dtype)
+        out[0] = [np.nan, np.inf, -np.inf]
+        out[1] = [-0.0, np.finfo(dtype).tiny, np.finfo(dtype).max]
+    return out
+
+
+def same_bits(a, b):
+    # Equal bit for bit, NaN and -0.0 included.
+    return a.dtype == b.dtype and a.shape == b.shape and \
+        a.tobytes() == b.tobytes()
+
+
+@pytest.mark.parametrize('dtype', ['int16', 'float32', 'float64'])
+@pytest.mark.parametrize('codec', sorted(CODECS))
+def test_encode_decode_round_trip(dtype, codec):
+    compress, decompress = CODECS[codec]
+    chunk = samples(dtype)
+    for shuffle in [False, True]:
+        for delta in [False, True]:
+            data = compress(encode(chunk, shuffle, delta))
+            out = decode(decompress(data), dtype, 3, shuffle, delta)
+            assert same_bits(out, chunk)
+
+
+@pytest.mark.parametrize('dtype', ['int16', 'float32', 'float64'])
+def test_chunked_round_trip(tmp_path, dtype):
+    path = os.path.join(str(tmp_path), 'chunked.raw')
+    data = samples(dtype, rows=1037)
+    sink = ChunkedRecorder(path, 3, dtype, 1000, chunk_size=100,
+                           codec='zlib')
+    # Chunks of every size, across blocks.
+    pos = 0
+    for size in [1, 99, 150, 3, 250, 500, 34]:
+        sink.write(data[pos:pos + size])
+        pos += size
+    sink.close()
+    reader = ChunkedReader(path)
+    # close writes the staged samples as a last short block.
+    assert reader.length() == 1037
+    assert list(reader.index['rows'][-2:]) == [100, 37]
+    assert same_bits(reader.fetch(), data)
+    for start, stop in [(0, 1), (95, 205), (99, 100), (100, 101),
+                        (150, 950), (990, 1037), (1036, 2000), (500, 500)]:
+        assert same_bits(reader.fetch(start, stop), data[start:stop])
+    assert same_bits(reader.fetch_time(0.095, 0.205), data[95:205])
+    assert same_bits(reader.fetch_time(1.0, 2.0), data[1000:])
+
+
+def test_chunked_time_index_without_rate(tmp_path):
+    path = os.path.join(str(tmp_path), 'clock.raw')
+    data = samples('float32', rows=250)
+    sink = ChunkedRecorder(path, 3, 'float32', chunk_size=100)
+    sink.write(data)
+    sink.close()
+    reader = ChunkedReader(path)
+    # Blocks are found by the time they were written.
+    assert same_bits(reader.fetch_time(0, 1e9), data)
+    # The end of a block is not known, the last one may hold any later time.
+    assert same_bits(reader.fetch_time(1e9, 2e9), data[200:])
+
+
+def test_filtered_sink_round_trip(tmp_path):
+    path = os.path.join(str(tmp_path), 'filtered.raw')
+    buffer = Buffer(1000, 3, dtype='int16', scale=0.5)
+    sink = MemmapRecorder(path, 3, 'float32', 1000, scale=buffer.scale)
+    thread = SinkThread(buffer, sink, interval=0.001,
+                        chain=Chain(FIRDecimator(10, 3)))
+    raw = np.random.RandomState(0).randint(-1000, 1000, (400, 3))
+    thread.start()
+    for chunk in np.split(raw.astype('int16'), 20):
+        buffer.push(chunk)
+    thread.stop()
+    reader = MemmapReader(path)
+    assert reader.info['sample_rate'] == 100
+    assert reader.info['scale'] is None
+    assert reader.info['offset'] is None
+    expected = FIRDecimator(10, 3).process(raw * 0.5)
+    assert reader.length() == len(expected)
+    assert np.allclose(reader.fetch(), expected, rtol=1e-5, atol=1e-3)
+
+
+def test_filtered_sink_needs_floats(tmp_path):
+    path = os.path.join(str(tmp_path), 'counts.raw')
+    buffer = Buffer(1000, 3, dtype='int16', scale=0.5)
+    sink = MemmapRecorder(path, 3, 'int16', 1000, scale=buffer.scale)
+    with pytest.raises(ValueError):
+        SinkThread(buffer, sink, chain=Chain(FIRDecimator(10, 3)))
+
+
+def test_stalled_sink_counts_overruns(tmp_path):
+    path = os.path.join(str(tmp_path), 'stalled.raw')
+    buffer = Buffer(100, 2)
+    thread = SinkThread(buffer, MemmapRecorder(path, 2))
+    # Not started, the sink lags behind 250 samples.
+    buffer.push(np.ones((250, 2)))
+    thread._drain()
+    assert thread.overruns == 150
+    assert thread.sink.info['length'] == 100
@@ -0,0 +1,14 @@
+# coding: utf-8
+
+import numpy as np
+from dynplot.stats import RunningStats
+
+
+def test_empty_chunk_keeps_the_block_being_filled():
+    stats = RunningStats(window=100, num_channels=2, block=10)
+    stats.push(np.array([[1.0, -2.0], [3.0, 4.0]]))
+    stats.push(np.zeros((0, 2)))
+    stats.push(np.zeros((0, 1)), np.array([1]))
+    assert stats.count() == 2
+    assert np.array_equal(stats.min(), [1, -2])
+    assert np.array_equal(stats.max(), [3, 4])
@@ -7,7 +7,7 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.backend_bases import key_press_handler
 import matplotlib.pyplot as plt
 
-from local_toolbox import Buffer, Plotter
+from dynplot import Buffer, Plotter
 
 import threading
 import time
@@ -35,7 +35,7 @@ control_frame.pack(side=tk.TOP)
 
 plt.style.use('ggplot')
 plotter = Plotter()
-fig, axe = plotter.fig, plotter.axe
+fig, axe = plotter.fig, plotter.ax
 # fig, axes = plt.subplots(1, 1)
 # fig = Figure(figsize=(5, 4), dpi=100)
 # axe = fig.add_subplot(2, 1, 1)
@@ -53,19 +53,19 @@ button = tk.Button(master=control_frame, text='Go')
 button.grid(row=0, column=0, padx=2, pady=0)
 
 buffer = Buffer()
-buffer.push(np.random.randn(50, buffer.info['channels']))
-buffer.display()
+buffer.push(np.random.randn(50, buffer.info['num_channels']))
+buffer.print()
 
 
-plotter.prepare_plot(max_length=buffer.info['max_length'],
-                     channels=buffer.info['channels'])
+plotter.prepare_plot(max_length=buffer.info['capacity'],
+                     channels=buffer.info['num_channels'])
 plotter.plot(buffer.data)
 
 
 def run():
     for j in range(500):
         print('-', j)
-        plotter.update(np.random.randn(1, buffer.info['channels']))
+        plotter.update(np.random.randn(1, buffer.info['num_channels']))
 
 
 def foo():